@@ -9,8 +9,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
 from config.app_config import APP_CONFIG
 from config.security_config import setup_security
 from utils.ui import setup_page
+from utils.profiler import profiled_page
 from components.navigation import sidebar_navigation
 
+@profiled_page("Strona główna")
 def main():
     """
     Main function that sets up the BrainVenture application.
@@ -0,0 +1,4 @@
+"""
+Benchmark suite for the BrainVenture application.
+Run with `python -m benchmarks` or `python tests/run_tests.py --benchmarks`.
+"""
@@ -0,0 +1,14 @@
+"""
+Run the BrainVenture benchmarks: python -m benchmarks [--baseline FILE]
+"""
+
+import os
+import sys
+
+# Add the application directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Benchmarks of the BrainVenture hot paths.
+
+Each case builds synthetic data (see benchmarks/synthetic.py) of the
+requested size in a temporary directory and points the application at it,
+so results don't depend on the content shipped in data/.
+"""
+
+import os
+import json
+import random
+import tempfile
+import importlib.util
+from unittest import mock
+
+from benchmarks.runner import benchmark
+from benchmarks.synthetic import NEUROLEADER_TYPES, make_course, make_resources, make_user
+from config.app_config import APP_PATHS
+from config.content_config import load_course_structure, get_neuroleader_type_details
+from config.course_index import LessonIndex
+from utils.cache import content_cache
+from utils.event_log import ProgressEventLog
+from utils.helpers import load_user_data, save_user_data
+from utils.progress import ProgressTracker, CompletionBitmap, aggregate_completion
+from utils.resources import filter_resources
+from utils.user_store import JsonUserStore, SQLiteUserStore
+
+SEED = 42
+
+def _load_page_module(file_name):
+    """Import a Streamlit page as a module without running its main()."""
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages", file_name)
+    spec = importlib.util.spec_from_file_location(f"page_{os.path.splitext(file_name)[0]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _content_files(tmp_dir, **files):
+    """Write JSON content files and point APP_PATHS at them (with no content bundle)."""
+    paths = {"content_bundle": os.path.join(tmp_dir, "missing_bundle.bin")}
+    for key, data in files.items():
+        paths[key] = os.path.join(tmp_dir, f"{key}.json")
+        with open(paths[key], "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    return mock.patch.dict(APP_PATHS, paths)
+
+@benchmark("load_course_structure")
+def bench_load_course_structure(size):
+    """Cached course structure load (file signature check only)."""
+    with tempfile.TemporaryDirectory() as tmp_dir, _content_files(tmp_dir, course_structure_json=make_course(size)):
+        load_course_structure()
+        yield load_course_structure
+    content_cache.invalidate()
+
+@benchmark("load_course_structure_cold")
+def bench_load_course_structure_cold(size):
+    """Course structure load with an empty cache (parses the file)."""
+    def run():
+        content_cache.invalidate()
+        return load_course_structure()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, _content_files(tmp_dir, course_structure_json=make_course(size)):
+        yield run
+    content_cache.invalidate()
+
+@benchmark("get_neuroleader_type_details")
+def bench_get_neuroleader_type_details(size):
+    """Type lookups in a list of size / 10 types."""
+    types = [
+        {"id": f"typ-{i}", "name": f"Typ {i}", "icon": "🧠", "short_description": "Opis", "category": "poznawczy"}
+        for i in range(max(1, size // 10))
+    ]
+    ids = [item["id"] for item in types]
+
+    def run():
+        for type_id in ids[-10:]:
+            get_neuroleader_type_details(type_id)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, _content_files(tmp_dir, neuroleader_types_json=types):
+        yield run
+    content_cache.invalidate()
+
+def _user_store_case(store_factory, size, operation):
+    """Time load_user_data or save_user_data of a user with size completed lessons."""
+    rng = random.Random(SEED)
+    index = LessonIndex(make_course(size))
+    user = make_user("bench_user", [], rng)
+    user["progress"]["completed_lessons"] = [lesson.id for lesson in index.lessons_in(range(size))]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = store_factory(tmp_dir)
+        store.save("bench_user", user)
+        event_log = ProgressEventLog(os.path.join(tmp_dir, "events"))
+        with mock.patch("utils.helpers.get_user_store", return_value=store), \
+                mock.patch("utils.helpers.get_progress_event_log", return_value=event_log):
+            if operation == "load":
+                yield lambda: load_user_data("bench_user")
+            else:
+                yield lambda: save_user_data(user, "bench_user")
+        if hasattr(store, "close"):
+            store.close()
+
+@benchmark("load_user_data_json")
+def bench_load_user_data_json(size):
+    yield from _user_store_case(JsonUserStore, size, "load")
+
+@benchmark("save_user_data_json")
+def bench_save_user_data_json(size):
+    yield from _user_store_case(JsonUserStore, size, "save")
+
+@benchmark("load_user_data_sqlite")
+def bench_load_user_data_sqlite(size):
+    yield from _user_store_case(lambda tmp_dir: SQLiteUserStore(os.path.join(tmp_dir, "users.db")), size, "load")
+
+@benchmark("save_user_data_sqlite")
+def bench_save_user_data_sqlite(size):
+    yield from _user_store_case(lambda tmp_dir: SQLiteUserStore(os.path.join(tmp_dir, "users.db")), size, "save")
+
+@benchmark("process_test_results")
+def bench_process_test_results(size):
+    """Scoring of a test with size answers."""
+    process_test_results = _load_page_module("2_Typy_Neurolidera.py").process_test_results
+    rng = random.Random(SEED)
+    answers = {
+        f"q{i}": {"value": rng.randint(1, 5), "type": NEUROLEADER_TYPES[i % len(NEUROLEADER_TYPES)]}
+        for i in range(size)
+    }
+    yield lambda: process_test_results(answers)
+
+@benchmark("filter_resources_search")
+def bench_filter_resources_search(size):
+    """Search, category filter and sort of size resources of each kind."""
+    resources = make_resources(size, random.Random(SEED))
+
+    def run():
+        for kind, items in resources.items():
+            filter_resources(items, kind, "stres", "Neurobiologia", "Najpopularniejsze")
+
+    yield run
+
+@benchmark("filter_resources_sort")
+def bench_filter_resources_sort(size):
+    """Unfiltered listing (sort only) of size resources of each kind."""
+    resources = make_resources(size, random.Random(SEED))
+
+    def run():
+        for kind, items in resources.items():
+            filter_resources(items, kind)
+
+    yield run
+
+@benchmark("progress_tracker_build")
+def bench_progress_tracker_build(size):
+    """Tracker for a user who completed half of a course with size lessons."""
+    index = LessonIndex(make_course(size))
+    completed = [lesson.id for lesson in index.lessons_in(range(0, size, 2))]
+
+    def run():
+        tracker = ProgressTracker(index, completed)
+        for block_index in range(len(index.blocks)):
+            tracker.block_percent(block_index)
+        return tracker.overall_percent()
+
+    yield run
+
+@benchmark("aggregate_completion")
+def bench_aggregate_completion(size):
+    """Cohort completion of size users on a 200-lesson course."""
+    rng = random.Random(SEED)
+    index = LessonIndex(make_course(200))
+    bitmaps = [
+        CompletionBitmap.from_lessons(index, [lesson.id for lesson in index.lessons_in(range(rng.randint(0, 200)))])
+        for _ in range(size)
+    ]
+    yield lambda: aggregate_completion(index, bitmaps)
@@ -0,0 +1,363 @@
+"""
+Headless load tester for the BrainVenture application.
+
+Virtual users drive app.py and the pages through Streamlit's AppTest
+following scripted journeys (take the test, complete lessons, search
+resources, edit the profile). Every rerun is timed and the report gives
+p50/p95/p99 latency and throughput per page:
+
+    python -m benchmarks.load_test --users 20 --iterations 3
+    python -m benchmarks.load_test --users 20 --shared-user   # all users on one user file
+
+AppTest swaps process-wide Streamlit state on every run, so each virtual
+user runs in its own process; concurrent writes meet in the user store's
+file locks as they would between server processes.
+
+By default the run uses a temporary copy of data/, so the real user files
+are not touched; --data-dir runs on another data set (e.g. one generated by
+generate_synthetic_data.py, whose user IDs match the virtual users).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import traceback
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Page name -> script, as in each page's @profiled_page decorator
+PAGES = {
+    "Strona główna": "app.py",
+    "Dashboard": "pages/1_Dashboard.py",
+    "Typy Neurolidera": "pages/2_Typy_Neurolidera.py",
+    "Struktura Kursu": "pages/3_Struktura_Kursu.py",
+    "Profil": "pages/4_Profil.py",
+    "Zasoby": "pages/5_Zasoby.py",
+}
+
+SEARCH_TERMS = ["stres", "mózg", "lider", "zespół", "decyzje", "emocje"]
+CATEGORIES = ["Neurobiologia", "Przywództwo", "Rozwój osobisty", "Zarządzanie zespołem"]
+
+# Index of the "Ustawienia" tab on the profile page (see utils.ui.tabs)
+PROFILE_SETTINGS_TAB = 3
+
+@contextmanager
+def app_data_dir(data_dir=None):
+    """
+    Provide a data directory for a test run.
+
+    Args:
+        data_dir (str, optional): Directory to use as is. If None, a temporary
+            copy of data/ is made and removed afterwards.
+
+    Yields:
+        str: Absolute path of the data directory.
+    """
+    if data_dir:
+        yield os.path.abspath(data_dir)
+        return
+
+    tmp_dir = tempfile.mkdtemp(prefix="brainventure_")
+    try:
+        copy = os.path.join(tmp_dir, "data")
+        shutil.copytree(os.path.join(APP_DIR, "data"), copy,
+                        ignore=shutil.ignore_patterns("*.lock", "events", "logs", "synthetic"))
+        yield copy
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+class VirtualUser:
+    """
+    A simulated user with one Streamlit session per visited page.
+    """
+
+    def __init__(self, user_id, rng, timeout=60):
+        """
+        Initialize the virtual user.
+
+        Args:
+            user_id (str): User ID set in the session (see get_current_user_id).
+            rng (random.Random): Random generator for the user's choices.
+            timeout (float): Maximal duration of a rerun in seconds.
+        """
+        self.user_id = user_id
+        self.rng = rng
+        self.timeout = timeout
+        # (page, start timestamp, seconds, error message or None) of every rerun
+        self.samples = []
+
+    def open(self, page, **session_state):
+        """
+        Open a page in a new session and run it.
+
+        Args:
+            page (str): Page name, a key of PAGES.
+            **session_state: Extra session state set before the first run.
+
+        Returns:
+            AppTest: The page session.
+        """
+        from streamlit.testing.v1 import AppTest
+
+        app = AppTest.from_file(os.path.join(APP_DIR, PAGES[page]), default_timeout=self.timeout)
+        app.session_state["user"] = {"id": self.user_id, "name": self.user_id, "type": None}
+        for key, value in session_state.items():
+            app.session_state[key] = value
+        self.rerun(app, page)
+        return app
+
+    def rerun(self, app, page):
+        """
+        Run a page session and record its latency.
+
+        Args:
+            app (AppTest): Page session.
+            page (str): Page name.
+        """
+        started_at = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            app.run()
+            if app.exception:
+                error = app.exception[0].message.splitlines()[0][:200]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.samples.append((page, started_at, time.perf_counter() - start, error))
+
+    def click(self, app, page, label):
+        """
+        Click a button by its label and rerun the page.
+
+        Returns:
+            bool: False if the page has no such button.
+        """
+        button = next((button for button in app.button if button.label == label), None)
+        if button is None:
+            return False
+        button.click()
+        self.rerun(app, page)
+        return True
+
+    def browse(self):
+        """Open the home page and the dashboard."""
+        self.open("Strona główna")
+        self.open("Dashboard")
+
+    def take_test(self):
+        """Answer every question of the neuroleader test and submit it."""
+        page = "Typy Neurolidera"
+        app = self.open(page)
+        if not self.click(app, page, "Rozpocznij test"):
+            return
+        for radio in app.radio:
+            if radio.key and radio.key.startswith("radio_"):
+                radio.set_value(self.rng.choice(radio.options))
+        self.click(app, page, "Zakończ test i sprawdź wyniki")
+
+    def complete_lessons(self, count=3):
+        """Open the course from the first lesson and complete the next few lessons."""
+        page = "Struktura Kursu"
+        app = self.open(page)
+        if not self.click(app, page, "Rozpocznij od pierwszej lekcji"):
+            return
+        for _ in range(count):
+            self.click(app, page, "Oznacz jako ukończoną")
+            if not self.click(app, page, "Następna lekcja →"):
+                break
+
+    def search_resources(self):
+        """Search the resources and narrow the results to a category."""
+        page = "Zasoby"
+        app = self.open(page)
+        if app.text_input:
+            app.text_input[0].set_value(self.rng.choice(SEARCH_TERMS))
+            self.rerun(app, page)
+        category = next((box for box in app.selectbox if box.label == "Kategoria"), None)
+        if category is not None:
+            category.set_value(self.rng.choice(CATEGORIES))
+            self.rerun(app, page)
+
+    def edit_profile(self):
+        """Change the display name in the profile settings."""
+        page = "Profil"
+        app = self.open(page, active_tab=PROFILE_SETTINGS_TAB)
+        name = next((field for field in app.text_input if field.label == "Imię i nazwisko"), None)
+        if name is None:
+            return
+        name.set_value(f"{self.user_id} {self.rng.randint(1, 9999)}")
+        self.click(app, page, "Zapisz ustawienia")
+
+JOURNEYS = {
+    "browse": VirtualUser.browse,
+    "take_test": VirtualUser.take_test,
+    "complete_lessons": VirtualUser.complete_lessons,
+    "search_resources": VirtualUser.search_resources,
+    "edit_profile": VirtualUser.edit_profile,
+}
+
+def run_virtual_user(user_id, journeys, iterations, seed, timeout=60):
+    """
+    Run the journeys of one virtual user in a random order.
+
+    Args:
+        user_id (str): User ID.
+        journeys (list): Journey names, keys of JOURNEYS.
+        iterations (int): Number of passes over the journeys.
+        seed (str): Seed of the user's random choices.
+        timeout (float): Maximal duration of a rerun in seconds.
+
+    Returns:
+        list: (page, start timestamp, seconds, error) of every rerun.
+    """
+    rng = random.Random(seed)
+    user = VirtualUser(user_id, rng, timeout)
+
+    # The first run imports the application; it is not part of the measurement
+    user.open("Strona główna")
+    user.samples.clear()
+
+    for _ in range(iterations):
+        for name in rng.sample(journeys, len(journeys)):
+            try:
+                JOURNEYS[name](user)
+            except Exception:
+                # A broken journey is reported, the rest of the run continues
+                error = traceback.format_exc(limit=1).strip().splitlines()[-1]
+                user.samples.append((f"journey:{name}", time.time(), 0.0, error))
+    return user.samples
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values (list): Sorted values.
+        q (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile, or 0.0 for no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
+
+def summarize(samples, wall_time):
+    """
+    Compute latency percentiles and throughput per page.
+
+    Args:
+        samples (list): (page, start timestamp, seconds, error) tuples.
+        wall_time (float): Duration of the measured run in seconds.
+
+    Returns:
+        dict: Page -> reruns, errors, p50/p95/p99/max latency (seconds) and
+            throughput (reruns per second over the whole run).
+    """
+    by_page = {}
+    for page, _, seconds, error in samples:
+        by_page.setdefault(page, []).append((seconds, error))
+
+    report = {}
+    for page, entries in sorted(by_page.items()):
+        latencies = sorted(seconds for seconds, _ in entries)
+        errors = [error for _, error in entries if error]
+        report[page] = {
+            "reruns": len(entries),
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1],
+            "throughput": len(entries) / wall_time if wall_time else 0.0,
+        }
+    return report
+
+def run_load_test(users=10, iterations=1, journeys=None, shared_user=False, seed=42, timeout=60):
+    """
+    Run virtual users concurrently, one process each.
+
+    Args:
+        users (int): Number of concurrent virtual users.
+        iterations (int): Passes over the journeys per user.
+        journeys (list, optional): Journey names. Defaults to all of JOURNEYS.
+        shared_user (bool): Give every virtual user the same user ID.
+        seed (int): Random seed.
+        timeout (float): Maximal duration of a rerun in seconds.
+
+    Returns:
+        dict: "users", "wall_time" of the measured reruns and the per-page "pages" summary.
+    """
+    journeys = list(journeys or JOURNEYS)
+
+    with ProcessPoolExecutor(max_workers=users) as executor:
+        futures = [
+            executor.submit(
+                run_virtual_user,
+                "default_user" if shared_user else f"user_{i + 1:06d}",
+                journeys, iterations, f"{seed}-{i}", timeout,
+            )
+            for i in range(users)
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+
+    # Measured from the first recorded rerun to the end of the last one
+    wall_time = 0.0
+    if samples:
+        wall_time = max(start + seconds for _, start, seconds, _ in samples) - min(start for _, start, _, _ in samples)
+    return {"users": users, "wall_time": wall_time, "pages": summarize(samples, wall_time)}
+
+def print_report(result):
+    """Print the per-page report."""
+    print(f"{result['users']} virtual users, {result['wall_time']:.1f} s")
+    print(f"{'Page':<28} {'reruns':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'rerun/s':>8}")
+    for page, stats in result["pages"].items():
+        print(f"{page:<28} {stats['reruns']:>7} {stats['errors']:>7} {stats['p50'] * 1000:>9.1f} "
+              f"{stats['p95'] * 1000:>9.1f} {stats['p99'] * 1000:>9.1f} {stats['max'] * 1000:>9.1f} "
+              f"{stats['throughput']:>8.2f}")
+    for page, stats in result["pages"].items():
+        if stats["first_error"]:
+            print(f"⚠️ {page}: {stats['first_error']}")
+
+def main(argv=None):
+    """Command line entry point for the load tester."""
+    parser = argparse.ArgumentParser(description="Run concurrent virtual users against the BrainVenture pages.")
+    parser.add_argument("--users", type=int, default=10, help="Number of concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=1, help="Passes over the journeys per user")
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help="Comma-separated journeys to run")
+    parser.add_argument("--shared-user", action="store_true", help="Use the same user ID for every virtual user")
+    parser.add_argument("--data-dir", help="Data directory to run on (default: a temporary copy of data/)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--timeout", type=float, default=60, help="Maximal duration of a rerun in seconds")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    journeys = [name.strip() for name in args.journeys.split(",") if name.strip()]
+    unknown = [name for name in journeys if name not in JOURNEYS]
+    if unknown:
+        parser.error(f"unknown journeys: {', '.join(unknown)} (choose from {', '.join(JOURNEYS)})")
+
+    # The data directory is read when the configuration is imported by the first page run
+    os.chdir(APP_DIR)
+    with app_data_dir(args.data_dir) as data_dir:
+        os.environ["BRAINVENTURE_DATA_DIR"] = data_dir
+        result = run_load_test(args.users, args.iterations, journeys, args.shared_user, args.seed, args.timeout)
+
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(dict(result, data_dir=args.data_dir or "temporary copy of data/"), f, indent=2, ensure_ascii=False)
+    return 0
+
+if __name__ == "__main__":
+    sys.path.insert(0, APP_DIR)
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Benchmark runner for the BrainVenture application.
+
+Benchmarks are registered with the @benchmark decorator as context managers
+that prepare data for a given size and yield the function to time. Results
+are written to a JSON file that can be compared with an earlier run:
+
+    python -m benchmarks --output benchmarks/results/latest.json
+    python -m benchmarks --baseline benchmarks/results/main.json --threshold 0.25
+"""
+
+import os
+import json
+import time
+import timeit
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from contextlib import contextmanager
+
+# Number of items (lessons, users, resources, answers...) at each data scale
+SCALES = {
+    "small": 100,
+    "medium": 1_000,
+    "large": 10_000,
+}
+
+# Allowed slowdown of the median time before a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "latest.json")
+
+# Registered benchmarks: name -> context manager factory taking the size
+_benchmarks = {}
+
+def benchmark(name):
+    """
+    Decorator registering a benchmark.
+
+    The decorated generator function takes the number of items of the data
+    scale, prepares its data, yields a function without arguments to time and
+    cleans up after the yield.
+
+    Args:
+        name (str): Benchmark name.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(func):
+        _benchmarks[name] = contextmanager(func)
+        return func
+    return decorator
+
+def get_benchmarks():
+    """
+    Get the registered benchmarks, importing the benchmark cases.
+
+    Returns:
+        dict: Benchmark name -> context manager factory.
+    """
+    import benchmarks.cases  # noqa: F401 - registers the cases
+    return dict(_benchmarks)
+
+def time_function(func, repeat=5, min_time=0.2):
+    """
+    Time a function.
+
+    The number of calls per run is chosen so a run takes at least min_time.
+
+    Args:
+        func (callable): Function without arguments.
+        repeat (int): Number of timed runs.
+        min_time (float): Minimal duration of a run in seconds.
+
+    Returns:
+        dict: Seconds per call ("min", "median", "mean"), "calls" per run and "runs".
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    per_call = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.fmean(per_call),
+        "calls": number,
+        "runs": repeat,
+    }
+
+def result_key(name, scale):
+    """Format the result key of a benchmark at a scale, e.g. 'load_user_data_json[small]'."""
+    return f"{name}[{scale}]"
+
+def run_benchmarks(scales=None, only=None, repeat=5, min_time=0.2, verbose=True):
+    """
+    Run the registered benchmarks.
+
+    Args:
+        scales (list, optional): Scale names to run. Defaults to all of SCALES.
+        only (str, optional): Run only benchmarks whose name contains this text.
+        repeat (int): Number of timed runs per benchmark.
+        min_time (float): Minimal duration of a run in seconds.
+        verbose (bool): Print each result.
+
+    Returns:
+        dict: Results keyed by result_key().
+    """
+    results = {}
+    for name, case in sorted(get_benchmarks().items()):
+        if only and only not in name:
+            continue
+        for scale in scales or SCALES:
+            with case(SCALES[scale]) as func:
+                timing = time_function(func, repeat, min_time)
+            timing["size"] = SCALES[scale]
+            results[result_key(name, scale)] = timing
+            if verbose:
+                print(f"{result_key(name, scale):<45} {timing['median'] * 1000:>12.4f} ms")
+    return results
+
+def _git_commit():
+    """Get the current git commit, or None outside a repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_results(results, output_path):
+    """
+    Write benchmark results with run metadata to a JSON file.
+
+    Args:
+        results (dict): Results from run_benchmarks().
+        output_path (str): Output file path.
+
+    Returns:
+        dict: The written document.
+    """
+    document = {
+        "created_at": datetime.now().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    return document
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare median times of two benchmark runs.
+
+    Args:
+        baseline (dict): Earlier results document (or its "results").
+        current (dict): New results document (or its "results").
+        threshold (float): Allowed relative slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        list: (key, baseline median, current median, ratio, regressed) of
+            every benchmark present in both runs, slowest ratio first;
+            regressed is True when the ratio exceeds 1 + threshold.
+    """
+    baseline = baseline.get("results", baseline)
+    current = current.get("results", current)
+    rows = []
+    for key in baseline.keys() & current.keys():
+        before = baseline[key]["median"]
+        after = current[key]["median"]
+        ratio = after / before if before else float("inf")
+        rows.append((key, before, after, ratio, ratio > 1 + threshold))
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+def main(argv=None):
+    """Command line entry point for the benchmarks."""
+    parser = argparse.ArgumentParser(description="Run the BrainVenture benchmarks.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Path of the results JSON file")
+    parser.add_argument("--baseline", help="Results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before failing, e.g. 0.25 for 25%%")
+    parser.add_argument("--scales", default=",".join(SCALES), help="Comma-separated scales to run")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per benchmark")
+    args = parser.parse_args(argv)
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)} (choose from {', '.join(SCALES)})")
+
+    started = time.perf_counter()
+    results = run_benchmarks(scales, args.only, args.repeat)
+    document = write_results(results, args.output)
+    print(f"✅ {len(results)} results written to {args.output} in {time.perf_counter() - started:.1f} s")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare_results(baseline, document, args.threshold)
+    regressions = [row for row in rows if row[4]]
+    for key, before, after, ratio, regressed in rows:
+        marker = "❌" if regressed else "  "
+        print(f"{marker} {key:<45} {before * 1000:>10.4f} ms -> {after * 1000:>10.4f} ms ({ratio:.2f}x)")
+
+    if regressions:
+        print(f"❌ {len(regressions)} benchmarks slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    print(f"✅ No regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
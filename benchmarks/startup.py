@@ -0,0 +1,201 @@
+"""
+Startup and import-time budget report for the BrainVenture pages.
+
+Each page is started in a fresh interpreter with -X importtime: the child
+process imports the AppTest harness, then times a cold first run of the page
+(module imports plus first render) and a warm second run. Imports made by
+the page are attributed from the importtime output, so the report ranks
+pages by cold-start cost and lists the heaviest modules each one pulls in:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --output startup.json --top 10
+
+Pages whose cold start exceeds STARTUP_BUDGETS make the command (and
+tests/test_startup.py) fail.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+from benchmarks.load_test import APP_DIR, PAGES, app_data_dir
+
+# Cold-start budget (first run, in seconds) per page, with a default for pages not listed
+STARTUP_BUDGETS = {
+    "default": 2.5,
+    "Typy Neurolidera": 3.0,
+    "Struktura Kursu": 3.0,
+    "Profil": 3.0,
+}
+
+# Multiplies all budgets, e.g. on slow CI machines
+BUDGET_SCALE = float(os.environ.get("BRAINVENTURE_STARTUP_BUDGET_SCALE", "1.0"))
+
+# Written to stderr by the child process around the cold page run
+PAGE_MARKER = "--- brainventure page run ---"
+PAGE_END_MARKER = "--- brainventure page run end ---"
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+def parse_importtime(lines):
+    """
+    Parse -X importtime output.
+
+    Args:
+        lines (iterable): stderr lines.
+
+    Returns:
+        list: (module, self seconds, cumulative seconds, depth) in output order;
+            depth 0 marks modules imported directly rather than by another
+            module in the list.
+    """
+    entries = []
+    for line in lines:
+        match = _IMPORT_LINE.match(line.rstrip("\n"))
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us) / 1e6, int(cumulative_us) / 1e6, (len(indent) - 1) // 2))
+    return entries
+
+def budget_for(page):
+    """
+    Get the cold-start budget of a page.
+
+    Args:
+        page (str): Page name.
+
+    Returns:
+        float: Budget in seconds.
+    """
+    return STARTUP_BUDGETS.get(page, STARTUP_BUDGETS["default"]) * BUDGET_SCALE
+
+def _run_child(page):
+    """Child process: run a page twice with AppTest and print the timings as JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(APP_DIR, PAGES[page]), default_timeout=120)
+    sys.stderr.write(PAGE_MARKER + "\n")
+    sys.stderr.flush()
+
+    start = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - start
+    sys.stderr.write(PAGE_END_MARKER + "\n")
+    sys.stderr.flush()
+    start = time.perf_counter()
+    app.run()
+    second_run = time.perf_counter() - start
+
+    print(json.dumps({
+        "first_run": first_run,
+        "second_run": second_run,
+        "exceptions": [exception.message.splitlines()[0][:200] for exception in app.exception],
+    }))
+
+def measure_page(page, data_dir, top=5):
+    """
+    Measure the cold start of a page in a fresh interpreter.
+
+    Args:
+        page (str): Page name, a key of PAGES.
+        data_dir (str): Data directory for the run (BRAINVENTURE_DATA_DIR).
+        top (int): Number of heaviest imported modules to report.
+
+    Returns:
+        dict: "first_run" (cold start), "second_run" (warm rerun) and
+            "import_time" in seconds, "heaviest_imports" as (module,
+            cumulative seconds), "exceptions", "budget" and "over_budget".
+
+    Raises:
+        RuntimeError: If the child process fails.
+    """
+    # Without the background warm-up, whose imports would be attributed to the page
+    env = dict(os.environ, BRAINVENTURE_DATA_DIR=data_dir, PYTHONPATH=APP_DIR, BRAINVENTURE_WARMUP="0")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--child", page],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, encoding="utf-8",
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Measuring {page} failed:\n{completed.stderr[-2000:]}")
+
+    stderr = completed.stderr.splitlines()
+    page_imports = []
+    if PAGE_MARKER in stderr and PAGE_END_MARKER in stderr:
+        page_imports = parse_importtime(stderr[stderr.index(PAGE_MARKER) + 1:stderr.index(PAGE_END_MARKER)])
+    direct = [(module, cumulative) for module, _, cumulative, depth in page_imports if depth == 0]
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    budget = budget_for(page)
+    return dict(
+        timings,
+        import_time=sum(cumulative for _, cumulative in direct),
+        heaviest_imports=sorted(direct, key=lambda item: item[1], reverse=True)[:top],
+        budget=budget,
+        over_budget=timings["first_run"] > budget,
+    )
+
+def measure_pages(pages=None, data_dir=None, top=5):
+    """
+    Measure the cold start of several pages.
+
+    Args:
+        pages (list, optional): Page names. Defaults to all of PAGES.
+        data_dir (str, optional): Data directory. Defaults to a temporary copy of data/.
+        top (int): Number of heaviest imported modules to report per page.
+
+    Returns:
+        dict: Page -> measure_page() result, slowest cold start first.
+    """
+    with app_data_dir(data_dir) as run_data_dir:
+        results = {page: measure_page(page, run_data_dir, top) for page in (pages or PAGES)}
+    return dict(sorted(results.items(), key=lambda item: item[1]["first_run"], reverse=True))
+
+def print_report(results):
+    """Print the ranked startup report."""
+    print(f"{'Page':<20} {'cold ms':>9} {'imports ms':>11} {'warm ms':>9} {'budget ms':>10}")
+    for page, result in results.items():
+        marker = "❌" if result["over_budget"] else "  "
+        print(f"{marker}{page:<18} {result['first_run'] * 1000:>9.0f} {result['import_time'] * 1000:>11.0f} "
+              f"{result['second_run'] * 1000:>9.0f} {result['budget'] * 1000:>10.0f}")
+        for module, seconds in result["heaviest_imports"]:
+            print(f"      {module:<36} {seconds * 1000:>8.1f} ms")
+
+def main(argv=None):
+    """Command line entry point for the startup report."""
+    parser = argparse.ArgumentParser(description="Measure the cold start of the BrainVenture pages.")
+    parser.add_argument("--pages", default=",".join(PAGES), help="Comma-separated page names")
+    parser.add_argument("--data-dir", help="Data directory to run on (default: a temporary copy of data/)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list per page")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _run_child(args.child)
+        return 0
+
+    pages = [page.strip() for page in args.pages.split(",") if page.strip()]
+    unknown = [page for page in pages if page not in PAGES]
+    if unknown:
+        parser.error(f"unknown pages: {', '.join(unknown)} (choose from {', '.join(PAGES)})")
+
+    results = measure_pages(pages, args.data_dir, args.top)
+    print_report(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    over = [page for page, result in results.items() if result["over_budget"]]
+    if over:
+        print(f"❌ Cold start over budget: {', '.join(over)}")
+        return 1
+    print("✅ All pages within their cold-start budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.path.insert(0, APP_DIR)
+    sys.exit(main())
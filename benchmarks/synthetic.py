@@ -0,0 +1,315 @@
+"""
+Synthetic data generator for scale testing.
+
+Generates a data directory with the same layout and schema as data/: a
+course structure with thousands of lessons, blog resources with tens of
+thousands of items and user documents with progress and test histories.
+Everything is derived from a seed, so the same arguments give the same data.
+Run the app on it with BRAINVENTURE_DATA_DIR:
+
+    python generate_synthetic_data.py --output-dir data/synthetic --users 100000
+    BRAINVENTURE_DATA_DIR=data/synthetic streamlit run app.py
+"""
+
+import os
+import random
+import shutil
+import argparse
+from datetime import datetime, timedelta
+
+from config.course_index import make_lesson_id
+from config.app_config import STORAGE_CONFIG
+from utils.error_handler import safe_save_json
+from utils.user_store import JsonUserStore, SQLiteUserStore
+
+NEUROLEADER_TYPES = ["neuroanalityk", "neuroreaktor", "neurobalanser", "neuroempata", "neuroinnowator", "neuroinspirator"]
+CATEGORIES = ["Neurobiologia", "Przywództwo", "Rozwój osobisty", "Zarządzanie zespołem"]
+WORDS = [
+    "mózg", "stres", "lider", "zespół", "decyzje", "emocje", "motywacja", "nawyki", "uwaga", "zmiana",
+    "dopamina", "empatia", "komunikacja", "odporność", "feedback", "koncentracja", "zaufanie", "energia",
+]
+BLOCK_EMOJIS = ["🔥", "🧠", "🌍", "💪", "🚀", "🎯", "🌱", "⚡"]
+FIRST_NAMES = ["Anna", "Jan", "Ewa", "Piotr", "Maria", "Tomasz", "Katarzyna", "Marek", "Agnieszka", "Paweł"]
+LAST_NAMES = ["Kowalski", "Nowak", "Wiśniewski", "Wójcik", "Kamiński", "Lewandowski", "Zieliński", "Szymański"]
+
+DEFAULT_SEED = 42
+
+# Generated dates are relative to this day, so the data doesn't depend on when it is generated
+EPOCH = datetime(2025, 1, 1)
+
+# Bundled data directory that the unscaled content is copied from
+SOURCE_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Content files that are not scaled and are copied from the source data directory
+COPIED_CONTENT = ["neuroleader_types.json", "neuroleader_type_test.json", "test_questions.json", "neuroleader_types"]
+
+def _text(rng, words):
+    """Random Polish-looking text of the given number of words."""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def make_course(lessons, lessons_per_module=10, modules_per_block=5):
+    """
+    Build a course structure.
+
+    Args:
+        lessons (int): Total number of lessons.
+        lessons_per_module (int): Lessons in each module (the last one may have fewer).
+        modules_per_block (int): Modules in each block.
+
+    Returns:
+        list: Blocks in the course_structure.json schema.
+    """
+    course = []
+    created = 0
+    while created < lessons:
+        block = {"emoji": BLOCK_EMOJIS[len(course) % len(BLOCK_EMOJIS)], "title": f"Blok {len(course) + 1}", "modules": []}
+        while created < lessons and len(block["modules"]) < modules_per_block:
+            count = min(lessons_per_module, lessons - created)
+            block["modules"].append({
+                "title": f"Moduł {len(course) + 1}.{len(block['modules']) + 1}",
+                "lessons": [{"title": f"Lekcja {created + i + 1}"} for i in range(count)],
+            })
+            created += count
+        course.append(block)
+    return course
+
+def course_lesson_ids(course):
+    """
+    List the lesson IDs of a course in order.
+
+    Args:
+        course (list): Course structure.
+
+    Returns:
+        list: Lesson IDs such as 'b1_m1_l1'.
+    """
+    return [
+        make_lesson_id(block_index, module_index, position)
+        for block_index, block in enumerate(course)
+        for module_index, module in enumerate(block["modules"])
+        for position in range(len(module["lessons"]))
+    ]
+
+def make_resources(count, rng):
+    """
+    Build blog resources.
+
+    Args:
+        count (int): Number of items of each kind (articles, books, research, tools).
+        rng (random.Random): Random generator.
+
+    Returns:
+        dict: Resources in the blog_resources.json schema.
+    """
+    def date():
+        return (EPOCH - timedelta(days=rng.randint(0, 3650))).strftime("%Y-%m-%d")
+
+    def common(kind, i):
+        return {
+            "id": f"{kind}-{i + 1}",
+            "title": f"{_text(rng, 3).capitalize()} ({i + 1})",
+            "summary": _text(rng, 20),
+            "category": rng.choice(CATEGORIES),
+            "tags": rng.sample(WORDS, rng.randint(2, 5)),
+        }
+
+    def person():
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    return {
+        "articles": [dict(
+            common("article", i),
+            content=_text(rng, 200),
+            image="placeholder.jpg",
+            author=person(),
+            published_date=date(),
+            read_time=rng.randint(3, 20),
+            # Heavy-tailed popularity, like real view counts
+            views=int(rng.paretovariate(1.2) * 100),
+            featured=rng.random() < 0.01,
+        ) for i in range(count)],
+        "books": [dict(
+            common("book", i),
+            author=person(),
+            cover_image="placeholder.jpg",
+            published_year=rng.randint(1990, 2025),
+            publisher=f"Wydawnictwo {rng.choice(LAST_NAMES)}",
+            rating=round(rng.uniform(2.5, 5.0), 1),
+            isbn=f"978-{rng.randint(0, 9)}-{rng.randint(10, 99)}-{rng.randint(100000, 999999)}-{rng.randint(0, 9)}",
+        ) for i in range(count)],
+        "research": [dict(
+            common("research", i),
+            authors=[person() for _ in range(rng.randint(1, 5))],
+            institution=f"Uniwersytet {rng.choice(['Warszawski', 'Jagielloński', 'Wrocławski', 'Gdański'])}",
+            published_date=date(),
+            doi=f"10.{rng.randint(1000, 9999)}/neuro.{i + 1}",
+            url=f"https://example.org/research/{i + 1}",
+        ) for i in range(count)],
+        "tools": [dict(
+            common("tool", i),
+            description=_text(rng, 25),
+            image="placeholder.jpg",
+            url=f"https://example.com/tools/{i + 1}",
+            price=rng.choice(["Free", "Free / Premium", "Premium"]),
+            rating=round(rng.uniform(2.5, 5.0), 1),
+        ) for i in range(count)],
+    }
+
+def make_user(user_id, lesson_ids, rng):
+    """
+    Build a user document with progress and test history.
+
+    Most users stop after a few lessons and few finish the course; lessons
+    are mostly completed in order, with an occasional one skipped.
+
+    Args:
+        user_id (str): User ID.
+        lesson_ids (list): Lesson IDs of the course in order.
+        rng (random.Random): Random generator.
+
+    Returns:
+        dict: User document in the user store schema.
+    """
+    created_at = EPOCH + timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86399))
+    reached = min(len(lesson_ids), int(rng.expovariate(1 / max(1, len(lesson_ids) * 0.15))))
+    completed = [lesson_id for lesson_id in lesson_ids[:reached] if rng.random() > 0.05]
+
+    activity = created_at
+    tests_taken = []
+    for _ in range(rng.choice([0, 0, 1, 1, 1, 2, 3])):
+        activity += timedelta(days=rng.randint(0, 30))
+        tests_taken.append({
+            "test_type": "neuroleader_type",
+            "result": rng.choice(NEUROLEADER_TYPES),
+            "date": activity.strftime("%d-%m-%Y"),
+        })
+    if completed:
+        activity += timedelta(days=rng.randint(0, 90))
+
+    achievements = []
+    if tests_taken:
+        achievements.append({
+            "id": "samoświadomy-lider",
+            "name": "Samoświadomy Lider",
+            "description": "Wykonałeś swój pierwszy test neuroleaderski i poznałeś swój typ!",
+            "icon": "🔍",
+            "earned_at": tests_taken[0]["date"],
+        })
+
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "user_id": user_id,
+        "created_at": created_at.isoformat(),
+        "updated_at": activity.isoformat(),
+        "profile": {
+            "display_name": f"{first_name} {last_name}",
+            "email": f"{user_id}@example.com",
+            "bio": "",
+            "avatar": None,
+        },
+        "progress": {
+            "completed_lessons": completed,
+            "last_activity": activity.isoformat() if completed or tests_taken else None,
+            "tests_taken": tests_taken,
+            "neuroleader_type": tests_taken[-1]["result"] if tests_taken else None,
+        },
+        "preferences": {
+            "theme": rng.choice(["light", "light", "dark"]),
+            "notifications_enabled": rng.random() < 0.7,
+            "email_updates": rng.random() < 0.3,
+        },
+        "achievements": achievements,
+    }
+
+def generate_dataset(output_dir, lessons=3000, resources=20000, users=100000, store="json",
+                     seed=DEFAULT_SEED, source_dir=SOURCE_DATA_DIR, progress=None):
+    """
+    Generate a data directory for scale testing.
+
+    Args:
+        output_dir (str): Directory to create (same layout as data/).
+        lessons (int): Number of course lessons.
+        resources (int): Total number of blog resources, split evenly between the four kinds.
+        users (int): Number of users.
+        store (str): User store backend to fill, "json" or "sqlite".
+        seed (int): Random seed.
+        source_dir (str): Data directory to copy the unscaled content (types, tests) from.
+        progress (callable, optional): Called with the number of users written so far.
+
+    Returns:
+        dict: Counts of generated lessons, resources and users, and the output paths.
+    """
+    content_dir = os.path.join(output_dir, "content")
+    os.makedirs(content_dir, exist_ok=True)
+
+    for name in COPIED_CONTENT:
+        source = os.path.join(source_dir, "content", name)
+        target = os.path.join(content_dir, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, target, dirs_exist_ok=True)
+        elif os.path.exists(source):
+            shutil.copyfile(source, target)
+
+    # Separate generators keep each part reproducible when another part's size changes
+    course = make_course(lessons)
+    safe_save_json(course, os.path.join(content_dir, "course_structure.json"))
+    blog = make_resources(max(1, resources // 4), random.Random(f"{seed}-resources"))
+    safe_save_json(blog, os.path.join(content_dir, "blog_resources.json"))
+
+    lesson_ids = course_lesson_ids(course)
+    rng = random.Random(f"{seed}-users")
+    if store == "sqlite":
+        user_store = SQLiteUserStore(os.path.join(output_dir, "brainventure.db"))
+    elif store == "json":
+        user_store = JsonUserStore(os.path.join(output_dir, "user_files"))
+    else:
+        raise ValueError(f"Unknown user store backend: {store}")
+
+    # One fsync per user file would dominate the run time
+    fsync_policy = STORAGE_CONFIG["fsync_policy"]
+    STORAGE_CONFIG["fsync_policy"] = "never"
+    try:
+        for i in range(users):
+            user_id = f"user_{i + 1:06d}"
+            user_store.save(user_id, make_user(user_id, lesson_ids, rng))
+            if progress is not None and (i + 1) % 10000 == 0:
+                progress(i + 1)
+    finally:
+        STORAGE_CONFIG["fsync_policy"] = fsync_policy
+        if hasattr(user_store, "close"):
+            user_store.close()
+
+    return {
+        "lessons": len(lesson_ids),
+        "resources": sum(len(items) for items in blog.values()),
+        "users": users,
+        "output_dir": output_dir,
+        "store": store,
+    }
+
+def main(argv=None):
+    """Command line entry point for the synthetic data generator."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic BrainVenture data set for scale testing.")
+    parser.add_argument("--output-dir", default="data/synthetic", help="Directory to write (same layout as data/)")
+    parser.add_argument("--lessons", type=int, default=3000, help="Number of course lessons")
+    parser.add_argument("--resources", type=int, default=20000, help="Total number of blog resources")
+    parser.add_argument("--users", type=int, default=100000, help="Number of users")
+    parser.add_argument("--store", choices=["json", "sqlite"], default="json", help="User store backend to fill")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed")
+    args = parser.parse_args(argv)
+
+    if os.path.abspath(args.output_dir) == SOURCE_DATA_DIR:
+        print("❌ Refusing to overwrite the application data directory, choose another --output-dir")
+        return 1
+
+    summary = generate_dataset(
+        args.output_dir, args.lessons, args.resources, args.users, args.store, args.seed,
+        progress=lambda count: print(f"   {count} users written"),
+    )
+    print(f"✅ Generated {summary['lessons']} lessons, {summary['resources']} resources and "
+          f"{summary['users']} users ({summary['store']}) in {summary['output_dir']}")
+    env = f"BRAINVENTURE_DATA_DIR={summary['output_dir']}"
+    if summary["store"] == "sqlite":
+        env += " BRAINVENTURE_USER_STORE=sqlite"
+    print(f"   Run the app on it with: {env} streamlit run app.py")
+    return 0
@@ -0,0 +1,18 @@
+"""
+Build the BrainVenture content bundle.
+
+Validates all files under data/content and packs them into a single
+snapshot that the application loads at startup. Run after editing content:
+    python build_content_bundle.py
+"""
+
+import os
+import sys
+
+# Add the application directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
+
+from config.content_bundle import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,11 @@ import streamlit as st
 import os
 from config.app_config import APP_CONFIG, FEATURE_FLAGS
 from utils.ui import avatar
+from utils.progress import get_progress_tracker
+from utils.profiler import profiled
+from utils.user_session import DEFAULT_USER_ID
 
+@profiled("sidebar_navigation")
 def sidebar_navigation():
     """
     Display the navigation sidebar.
@@ -15,14 +19,16 @@ def sidebar_navigation():
         # User profile section
         if "user" not in st.session_state:
             st.session_state["user"] = {
-                "id": "default_user",  # In a real app, this would be from authentication
+                "id": DEFAULT_USER_ID,  # In a real app, this would be from authentication
                 "name": "Demo User",
-                "progress": 30,  # Example progress percentage
                 "type": "neuroempata"  # Example neuroleader type
             }
         
         user = st.session_state["user"]
         
+        # Course progress is served by the shared progress tracker
+        user["progress"] = get_progress_tracker(user["id"]).overall_percent()
+        
         # User profile summary
         st.markdown("### Twój Profil")
         col1, col2 = st.columns([1, 2])
@@ -7,15 +7,18 @@ import os
 import json
 import random  # Add this import
 from datetime import datetime, timedelta  # Combine the datetime imports
-import pandas as pd
 
 from utils.ui import avatar, progress_bar, card, badge
-from utils.helpers import (
-    calculate_progress, load_user_data, save_user_data,
-    format_date
-)
+from utils.helpers import load_user_data, save_user_data, format_date
 from utils.validators import validate_form_data, validate_file_upload
-from config.content_config import load_course_structure
+from config.course_index import get_lesson_index
+from utils.progress import get_progress_tracker
+from utils.event_log import (
+    get_progress_event_log, EVENT_LESSON_COMPLETED, EVENT_TEST_TAKEN, EVENT_ACHIEVEMENT_EARNED
+)
+from utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 def user_profile_header(user_data):
     """
@@ -63,62 +66,31 @@ def user_progress_summary(user_data):
     """
     st.markdown("## Twój Postęp")
     
-    # Load course structure to calculate progress
-    course_structure = load_course_structure()
-    
-    # Count total lessons
-    total_lessons = 0
-    for block in course_structure:
-        for module in block.get("modules", []):
-            total_lessons += len(module.get("lessons", []))
-    
-    # Get completed lessons
-    completed_lessons = user_data.get("progress", {}).get("completed_lessons", [])
-    completed_count = len(completed_lessons)
-    
-    # Calculate progress percentage
-    progress_percentage = calculate_progress(completed_count, total_lessons)
+    # Get the user's progress counters
+    user_id = user_data.get("user_id", "default_user")
+    progress = get_progress_tracker(user_id, user_data)
+    lesson_index = progress.lesson_index
     
     # Display progress bar
     progress_bar(
-        value=completed_count, 
-        max_value=total_lessons, 
-        text=f"Ogólny postęp w kursie: {progress_percentage}%"
+        value=progress.completed_count, 
+        max_value=progress.total_count, 
+        text=f"Ogólny postęp w kursie: {progress.overall_percent()}%"
     )
     
     # Display block-level progress
     st.markdown("### Postęp w blokach tematycznych")
     
-    for block_index, block in enumerate(course_structure):
-        block_title = block.get("title", f"Blok {block_index + 1}")
-        block_emoji = block.get("emoji", "📚")
-        
-        # Count lessons in this block
-        block_total_lessons = 0
-        block_completed_lessons = 0
-        
-        for module_index, module in enumerate(block.get("modules", [])):
-            module_lessons = module.get("lessons", [])
-            block_total_lessons += len(module_lessons)
-            
-            # Count completed lessons in this module
-            for lesson_index, lesson in enumerate(module_lessons):
-                lesson_id = f"b{block_index+1}_m{module_index+1}_l{lesson_index+1}"
-                if lesson_id in completed_lessons:
-                    block_completed_lessons += 1
-        
-        # Calculate block progress
-        if block_total_lessons > 0:
-            block_progress = calculate_progress(block_completed_lessons, block_total_lessons)
-        else:
-            block_progress = 0
+    for block in lesson_index.blocks:
+        block_completed_lessons, block_total_lessons = progress.block_counts(block.index)
+        block_progress = progress.block_percent(block.index)
         
         # Display block progress
         col1, col2 = st.columns([1, 4])
         with col1:
-            st.markdown(f"### {block_emoji}")
+            st.markdown(f"### {block.emoji}")
         with col2:
-            st.markdown(f"**{block_title}**")
+            st.markdown(f"**{block.title}**")
             st.progress(block_progress / 100, text=f"{block_completed_lessons}/{block_total_lessons} lekcji ({block_progress}%)")
 
 def user_achievements(user_data):
@@ -202,12 +174,14 @@ def user_profile_settings(user_data, user_id):
         
         # Theme selection
         st.markdown("### Wygląd")
+        current_theme = user_data.get("preferences", {}).get("theme", "jasny")
+        # New user documents store the theme under its English name
+        current_theme = {"light": "jasny", "dark": "ciemny", "system": "systemowy"}.get(current_theme, current_theme)
+        theme_values = ["jasny", "ciemny", "systemowy"]
         theme = st.selectbox(
             "Motyw",
             options=["Jasny", "Ciemny", "Systemowy"],
-            index=["jasny", "ciemny", "systemowy"].index(
-                user_data.get("preferences", {}).get("theme", "jasny")
-            )
+            index=theme_values.index(current_theme) if current_theme in theme_values else 0
         )
         
         # Submit button
@@ -278,34 +252,65 @@ def user_activity_log(user_data):
     """
     st.markdown("## Historia aktywności")
     
-    # In a real app, this would come from a database or activity log
-    # For MVP, we'll simulate activity based on completed lessons
+    # Recent activity comes from the progress event log with real timestamps;
+    # older entries (already compacted into the user document) are simulated
     activities = []
+    lesson_index = get_lesson_index()
+    user_id = user_data.get("user_id", "default_user")
+    logged_lessons = set()
+    logged_achievements = set()
+    logged_test = False
+    
+    for event in get_progress_event_log().read(user_id):
+        data = event["data"]
+        timestamp = datetime.fromisoformat(event["at"])
+        
+        if event["type"] == EVENT_LESSON_COMPLETED:
+            lesson = lesson_index.get(data["lesson_id"])
+            if lesson:
+                logged_lessons.add(lesson.id)
+                activities.append({
+                    "type": "lesson_completed",
+                    "description": f"Ukończono lekcję {lesson.position + 1} w module {lesson.module_index + 1} bloku {lesson.block_index + 1}",
+                    "timestamp": timestamp,
+                    "icon": "📚"
+                })
+        elif event["type"] == EVENT_TEST_TAKEN:
+            logged_test = True
+            activities.append({
+                "type": "test_completed",
+                "description": f"Wykonano test typologii neuroleaderów. Wynik: {str(data.get('result')).capitalize()}",
+                "timestamp": timestamp,
+                "icon": "🧩"
+            })
+        elif event["type"] == EVENT_ACHIEVEMENT_EARNED:
+            logged_achievements.add(data.get("id"))
+            activities.append({
+                "type": "achievement_earned",
+                "description": f"Zdobyto osiągnięcie: {data.get('name')}",
+                "timestamp": timestamp,
+                "icon": data.get("icon", "🏆")
+            })
     
-    # Add completed lessons to activity log
+    # Add completed lessons not present in the event log
     completed_lessons = user_data.get("progress", {}).get("completed_lessons", [])
     for lesson_id in completed_lessons:
-        # Parse lesson ID (format: b1_m1_l1)
-        parts = lesson_id.split("_")
-        if len(parts) == 3:
-            block_num = int(parts[0][1:])
-            module_num = int(parts[1][1:])
-            lesson_num = int(parts[2][1:])
-            
+        lesson = lesson_index.get(lesson_id)
+        if lesson and lesson_id not in logged_lessons:
             # Create a random timestamp for the activity (for demo purposes)
             days_ago = random.randint(0, 30)
             activity_time = datetime.now() - timedelta(days=days_ago)
             
             activities.append({
                 "type": "lesson_completed",
-                "description": f"Ukończono lekcję {lesson_num} w module {module_num} bloku {block_num}",
+                "description": f"Ukończono lekcję {lesson.position + 1} w module {lesson.module_index + 1} bloku {lesson.block_index + 1}",
                 "timestamp": activity_time,
                 "icon": "📚"
             })
     
     # Add test completion if available
     neuroleader_type = user_data.get("progress", {}).get("neuroleader_type")
-    if neuroleader_type:
+    if neuroleader_type and not logged_test:
         days_ago = random.randint(0, 15)
         activity_time = datetime.now() - timedelta(days=days_ago)
         
@@ -316,9 +321,11 @@ def user_activity_log(user_data):
             "icon": "🧩"
         })
     
-    # Add random achievements
+    # Add achievements not present in the event log
     achievements = user_data.get("achievements", [])
     for achievement in achievements:
+        if achievement.get("id") in logged_achievements:
+            continue
         earned_at = datetime.strptime(achievement.get("earned_at", format_date(datetime.now())), "%d-%m-%Y")
         
         activities.append({
@@ -3,12 +3,15 @@ Config package initialization file.
 Import all configuration modules here for easy access.
 """
 
-from config.app_config import APP_CONFIG, FEATURE_FLAGS, APP_PATHS
+from config.app_config import APP_CONFIG, FEATURE_FLAGS, APP_PATHS, STORAGE_CONFIG
 from config.content_config import (
     load_course_structure,
     load_neuroleader_types, 
     load_neuroleader_test,
     get_neuroleader_type_details,
+    get_neuroleader_registry,
+    NeuroleaderTypeRegistry,
     CONTENT_CONFIG
 )
+from config.course_index import LessonIndex, get_lesson_index, make_lesson_id
 from config.security_config import setup_security, check_authentication, prevent_content_sharing
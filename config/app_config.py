@@ -2,6 +2,8 @@
 Application configuration settings.
 """
 
+import os
+
 APP_CONFIG = {
     "app_name": "BrainVenture: Kurs Neuroprzywództwa",
     "app_icon": "🧠",
@@ -31,12 +33,32 @@ FEATURE_FLAGS = {
     "enable_advanced_reporting": False,  # Not in MVP
 }
 
+# Root of the content and user data; point it at a generated data set
+# (see generate_synthetic_data.py) to run the app at a larger scale
+DATA_DIR = os.environ.get("BRAINVENTURE_DATA_DIR", "data")
+
 APP_PATHS = {
-    "content_dir": "data/content",
-    "user_files_dir": "data/user_files",
+    "content_dir": f"{DATA_DIR}/content",
+    "user_files_dir": f"{DATA_DIR}/user_files",
     "static_dir": "static",
     "images_dir": "static/images",
-    "neuroleader_types_json": "data/content/neuroleader_types.json",
-    "neuroleader_test_json": "data/content/neuroleader_type_test.json",
-    "course_structure_json": "data/content/course_structure.json",
+    "neuroleader_types_json": f"{DATA_DIR}/content/neuroleader_types.json",
+    "neuroleader_test_json": f"{DATA_DIR}/content/neuroleader_type_test.json",
+    "course_structure_json": f"{DATA_DIR}/content/course_structure.json",
+    "test_questions_json": f"{DATA_DIR}/content/test_questions.json",
+    "blog_resources_json": f"{DATA_DIR}/content/blog_resources.json",
+    "content_bundle": f"{DATA_DIR}/content_bundle.bin",
+}
+
+STORAGE_CONFIG = {
+    # "json" keeps one file per user (local development), "sqlite" uses a shared database
+    "user_store_backend": os.environ.get("BRAINVENTURE_USER_STORE", "json"),
+    "sqlite_path": os.environ.get("BRAINVENTURE_SQLITE_PATH", f"{DATA_DIR}/brainventure.db"),
+    # Append-only progress event logs, folded into the user document on load
+    "event_log_dir": f"{DATA_DIR}/user_files/events",
+    "event_compaction_threshold": 50,
+    "event_log_retain": 20,
+    # When JSON writes are flushed to disk: "always", "batch" (at most once per interval) or "never"
+    "fsync_policy": os.environ.get("BRAINVENTURE_FSYNC_POLICY", "always"),
+    "fsync_batch_interval": 1.0,
 }
@@ -0,0 +1,327 @@
+"""
+Compiled content bundle for the BrainVenture application.
+
+All files under data/content are validated and packed into a single
+versioned snapshot, so the application loads its content with one read.
+
+Build the bundle after editing content:
+    python build_content_bundle.py
+"""
+
+import os
+import json
+import time
+import pickle
+import struct
+import hashlib
+import argparse
+from datetime import datetime
+
+from config.app_config import APP_PATHS
+from utils.cache import content_cache
+from utils.error_handler import ContentError
+
+BUNDLE_MAGIC = b"BVBUNDLE"
+BUNDLE_FORMAT_VERSION = 1
+
+# Magic, format version and SHA-256 digest of the payload
+_HEADER = struct.Struct("!8sH32s")
+
+# Bundle keys and the JSON files they are built from
+BUNDLE_SOURCES = {
+    "course_structure": APP_PATHS["course_structure_json"],
+    "neuroleader_types": APP_PATHS["neuroleader_types_json"],
+    "neuroleader_test": APP_PATHS["neuroleader_test_json"],
+    "test_questions": APP_PATHS["test_questions_json"],
+    "blog_resources": APP_PATHS["blog_resources_json"],
+}
+
+MARKDOWN_DIR = os.path.join(APP_PATHS["content_dir"], "neuroleader_types")
+
+# Seconds between checks of the source files against a loaded bundle
+SOURCE_CHECK_INTERVAL = 2.0
+
+def _file_signature(file_path):
+    """Return the (mtime, size) signature of a file."""
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _validate_course_structure(course_structure, errors):
+    """Validate the course structure."""
+    if not isinstance(course_structure, list):
+        errors.append("course_structure: expected a list of blocks")
+        return
+    for b, block in enumerate(course_structure):
+        if "title" not in block:
+            errors.append(f"course_structure: block {b + 1} has no title")
+        for m, module in enumerate(block.get("modules", [])):
+            if "title" not in module:
+                errors.append(f"course_structure: block {b + 1} module {m + 1} has no title")
+            for l, lesson in enumerate(module.get("lessons", [])):
+                if "title" not in lesson:
+                    errors.append(
+                        f"course_structure: lesson b{b + 1}_m{m + 1}_l{l + 1} has no title"
+                    )
+
+def _validate_neuroleader_types(types, markdown, errors):
+    """Validate neuroleader types and their markdown files."""
+    if not isinstance(types, list):
+        errors.append("neuroleader_types: expected a list of types")
+        return
+    seen = set()
+    for i, t in enumerate(types):
+        type_id = t.get("id")
+        if not type_id:
+            errors.append(f"neuroleader_types: type {i + 1} has no id")
+            continue
+        if type_id in seen:
+            errors.append(f"neuroleader_types: duplicate id '{type_id}'")
+        seen.add(type_id)
+        if "markdown_file" in t and t["markdown_file"] not in markdown:
+            errors.append(f"neuroleader_types: missing markdown file '{t['markdown_file']}'")
+
+def _validate_neuroleader_test(test, types, errors):
+    """Validate the neuroleader test questions against the known types."""
+    questions = test.get("questions") if isinstance(test, dict) else None
+    if not isinstance(questions, list):
+        errors.append("neuroleader_test: expected a 'questions' list")
+        return
+    type_ids = {t.get("id") for t in types} if isinstance(types, list) else set()
+    for i, question in enumerate(questions):
+        if "text" not in question:
+            errors.append(f"neuroleader_test: question {i + 1} has no text")
+        if question.get("type") not in type_ids:
+            errors.append(f"neuroleader_test: question {i + 1} has unknown type '{question.get('type')}'")
+
+def _validate_test_questions(questions, errors):
+    """Validate the self-assessment questionnaire."""
+    if not isinstance(questions, list):
+        errors.append("test_questions: expected a list of questions")
+        return
+    for i, question in enumerate(questions):
+        if "text" not in question or not question.get("options"):
+            errors.append(f"test_questions: question {i + 1} needs text and options")
+
+def _validate_blog_resources(resources, errors):
+    """Validate blog resources."""
+    if not isinstance(resources, dict):
+        errors.append("blog_resources: expected a dictionary of resource lists")
+        return
+    for section, items in resources.items():
+        for i, item in enumerate(items):
+            if "id" not in item or "title" not in item:
+                errors.append(f"blog_resources: {section} item {i + 1} needs id and title")
+
+def validate_content(content):
+    """
+    Validate collected content.
+
+    Args:
+        content (dict): Content keyed by bundle key, with markdown under "markdown".
+
+    Raises:
+        ContentError: If any content file is invalid.
+    """
+    errors = []
+    _validate_course_structure(content["course_structure"], errors)
+    _validate_neuroleader_types(content["neuroleader_types"], content["markdown"], errors)
+    _validate_neuroleader_test(content["neuroleader_test"], content["neuroleader_types"], errors)
+    _validate_test_questions(content["test_questions"], errors)
+    _validate_blog_resources(content["blog_resources"], errors)
+
+    if errors:
+        raise ContentError("Invalid content:\n" + "\n".join(errors), error_code="CONTENT_INVALID")
+
+def collect_content():
+    """
+    Read every content file.
+
+    Returns:
+        tuple: (content dict, source signatures keyed by path)
+
+    Raises:
+        ContentError: If a file cannot be read or parsed.
+    """
+    content = {}
+    sources = {}
+
+    for key, path in BUNDLE_SOURCES.items():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content[key] = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ContentError(f"Cannot read {path}: {e}", error_code="CONTENT_READ")
+        sources[path] = _file_signature(path)
+
+    markdown = {}
+    for file_name in sorted(os.listdir(MARKDOWN_DIR)):
+        if not file_name.endswith(".md"):
+            continue
+        path = os.path.join(MARKDOWN_DIR, file_name)
+        with open(path, "r", encoding="utf-8") as f:
+            markdown[file_name] = f.read()
+        sources[path] = _file_signature(path)
+    content["markdown"] = markdown
+
+    return content, sources
+
+def build_content_bundle(output_path=None):
+    """
+    Validate all content and write it as a single bundle file.
+
+    Args:
+        output_path (str, optional): Bundle path. Defaults to APP_PATHS["content_bundle"].
+
+    Returns:
+        dict: Summary with the output path, content hash and size in bytes.
+
+    Raises:
+        ContentError: If the content is invalid.
+    """
+    output_path = output_path or APP_PATHS["content_bundle"]
+    content, sources = collect_content()
+    validate_content(content)
+
+    payload = pickle.dumps({
+        "built_at": datetime.now().isoformat(),
+        "sources": sources,
+        "content": content,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+    digest = hashlib.sha256(payload).digest()
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so readers never see a partial bundle
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, digest))
+        f.write(payload)
+    os.replace(tmp_path, output_path)
+
+    return {
+        "path": output_path,
+        "hash": digest.hex(),
+        "size": _HEADER.size + len(payload),
+        "files": len(sources),
+    }
+
+def _read_bundle(bundle_path):
+    """
+    Read and verify a bundle file.
+
+    Returns:
+        dict: The bundle, or None if it is invalid.
+    """
+    with open(bundle_path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        print(f"Content bundle {bundle_path} is truncated, ignoring it")
+        return None
+
+    magic, version, digest = _HEADER.unpack_from(data)
+    payload = data[_HEADER.size:]
+    if magic != BUNDLE_MAGIC or version != BUNDLE_FORMAT_VERSION:
+        print(f"Content bundle {bundle_path} has an unsupported format, ignoring it")
+        return None
+    if hashlib.sha256(payload).digest() != digest:
+        print(f"Content bundle {bundle_path} failed its integrity check, ignoring it")
+        return None
+
+    return pickle.loads(payload)
+
+# Source files already reported as newer than the bundle, with their signature
+_reported_stale = {}
+
+# Bundle path -> (bundle, time of the last source check, result)
+_source_checks = {}
+
+def _is_current(bundle):
+    """
+    Check that no source file changed since the bundle was built.
+
+    Args:
+        bundle (dict): Loaded bundle.
+
+    Returns:
+        bool: False if a source file's mtime or size differs from the bundled one.
+    """
+    for path, signature in bundle["sources"].items():
+        try:
+            current = _file_signature(path)
+        except OSError:
+            continue
+        if current != tuple(signature):
+            if _reported_stale.get(path) != current:
+                _reported_stale[path] = current
+                print(f"Content bundle is older than {path}, ignoring it (rebuild with 'python build_content_bundle.py')")
+            return False
+    return True
+
+def load_content_bundle(bundle_path=None):
+    """
+    Load the content bundle through the shared content cache.
+
+    The source files are re-checked at most once per SOURCE_CHECK_INTERVAL
+    (and whenever the bundle file itself changes), so a bundle that is older
+    than any of them is skipped shortly after the edit until it is rebuilt.
+
+    Args:
+        bundle_path (str, optional): Bundle path. Defaults to APP_PATHS["content_bundle"].
+
+    Returns:
+        dict: The bundle (shared, must not be modified), or None if no valid,
+            up-to-date bundle exists.
+    """
+    bundle_path = bundle_path or APP_PATHS["content_bundle"]
+    try:
+        bundle = content_cache.get(bundle_path, _read_bundle)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading content bundle: {e}")
+        return None
+    if bundle is None:
+        return None
+    
+    now = time.monotonic()
+    checked = _source_checks.get(bundle_path)
+    if checked is not None and checked[0] is bundle and now - checked[1] < SOURCE_CHECK_INTERVAL:
+        current = checked[2]
+    else:
+        current = _is_current(bundle)
+        _source_checks[bundle_path] = (bundle, now, current)
+    return bundle if current else None
+
+def get_bundled_content(key):
+    """
+    Get a content item from the bundle.
+
+    Args:
+        key (str): Bundle key, e.g. "course_structure" or "markdown".
+
+    Returns:
+        The bundled content, or None if no bundle is available.
+    """
+    bundle = load_content_bundle()
+    if bundle is None:
+        return None
+    return bundle["content"].get(key)
+
+def main(argv=None):
+    """Command line entry point for building the content bundle."""
+    parser = argparse.ArgumentParser(description="Build the BrainVenture content bundle.")
+    parser.add_argument("--output", help="Output path for the bundle file")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = build_content_bundle(args.output)
+    except ContentError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"✅ Content bundle written to {summary['path']}")
+    print(f"   {summary['files']} files, {summary['size']} bytes, sha256 {summary['hash'][:16]}")
+    return 0
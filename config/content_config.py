@@ -4,42 +4,192 @@ Defines settings related to the educational content.
 """
 
 import os
-import json
+import time
+import threading
+from types import MappingProxyType
 from config.app_config import APP_PATHS
+from utils.cache import load_json_cached, load_text_cached
+from config.content_bundle import get_bundled_content, SOURCE_CHECK_INTERVAL
+from utils.profiler import profiled
 
+@profiled("content load")
 def load_course_structure():
     """
-    Load and return the course structure from the JSON file.
+    Load and return the course structure from the content bundle or JSON file.
+    The parsed file is cached per process and must not be modified.
     """
+    bundled = get_bundled_content("course_structure")
+    if bundled is not None:
+        return bundled
+    
     try:
-        with open(os.path.join(APP_PATHS["course_structure_json"]), "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json_cached(APP_PATHS["course_structure_json"])
     except Exception as e:
         print(f"Error loading course structure: {e}")
         return []
 
+@profiled("content load")
 def load_neuroleader_types():
     """
-    Load and return all neuroleader types from the JSON file.
+    Load and return all neuroleader types from the content bundle or JSON file.
+    The parsed file is cached per process and must not be modified.
     """
+    bundled = get_bundled_content("neuroleader_types")
+    if bundled is not None:
+        return bundled
+    
     try:
-        with open(os.path.join(APP_PATHS["neuroleader_types_json"]), "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json_cached(APP_PATHS["neuroleader_types_json"])
     except Exception as e:
         print(f"Error loading neuroleader types: {e}")
         return []
 
+@profiled("content load")
 def load_neuroleader_test():
     """
-    Load and return the neuroleader test from the JSON file.
+    Load and return the neuroleader test from the content bundle or JSON file.
+    The parsed file is cached per process and must not be modified.
     """
+    bundled = get_bundled_content("neuroleader_test")
+    if bundled is not None:
+        return bundled
+    
     try:
-        with open(os.path.join(APP_PATHS["neuroleader_test_json"]), "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json_cached(APP_PATHS["neuroleader_test_json"])
     except Exception as e:
         print(f"Error loading neuroleader test: {e}")
         return {}
 
+class NeuroleaderTypeRegistry:
+    """
+    Read-only index of neuroleader types keyed by type ID.
+
+    Each record is an immutable mapping with the type's markdown description
+    preloaded under "markdown_content", so lookups never touch the disk.
+    is_current() tells whether the types list or the markdown descriptions
+    changed since.
+    """
+
+    def __init__(self, types):
+        """
+        Build the registry.
+        
+        Args:
+            types (list): Neuroleader type dictionaries as loaded from JSON.
+        """
+        bundled = get_bundled_content("markdown")
+        records = {}
+        markdown = []
+        for t in types:
+            type_id = t.get("id")
+            if not type_id:
+                continue
+            record = dict(t)
+            if "markdown_file" in record:
+                record["markdown_content"] = _load_type_markdown(type_id, record["markdown_file"], bundled)
+                markdown.append((type_id, record["markdown_file"], record["markdown_content"]))
+            records[type_id] = MappingProxyType(record)
+        
+        self._source = types
+        self._bundled_markdown = bundled
+        self._records = records
+        self._ordered = tuple(records.values())
+        self._markdown = tuple(markdown)
+        self._markdown_checked = time.monotonic()
+    
+    def is_current(self, types):
+        """
+        Check whether the registry still reflects its sources.
+        
+        Bundled markdown is compared by the identity of the bundle's markdown
+        dictionary (the bundle checks its own sources). Markdown files outside
+        the bundle are re-checked at most once per SOURCE_CHECK_INTERVAL
+        through the content cache, which returns the same object until a file
+        changes on disk.
+        
+        Args:
+            types (list): Neuroleader types as currently loaded.
+            
+        Returns:
+            bool: False if the types list or any markdown description changed.
+        """
+        if types is not self._source:
+            return False
+        bundled = get_bundled_content("markdown")
+        if bundled is not self._bundled_markdown:
+            return False
+        if bundled is not None:
+            return True
+        
+        now = time.monotonic()
+        if now - self._markdown_checked < SOURCE_CHECK_INTERVAL:
+            return True
+        current = all(
+            _load_type_markdown(type_id, markdown_file, None) is content
+            for type_id, markdown_file, content in self._markdown
+        )
+        self._markdown_checked = now
+        return current
+    
+    def get(self, type_id):
+        """
+        Get a neuroleader type record.
+        
+        Args:
+            type_id (str): The ID of the neuroleader type.
+            
+        Returns:
+            Mapping: The type record, or None if the ID is unknown.
+        """
+        return self._records.get(type_id)
+    
+    def all(self):
+        """
+        Get all neuroleader type records in their original order.
+        
+        Returns:
+            tuple: Type records.
+        """
+        return self._ordered
+    
+    def __contains__(self, type_id):
+        return type_id in self._records
+    
+    def __len__(self):
+        return len(self._records)
+
+def _load_type_markdown(type_id, markdown_file, bundled):
+    """Load the markdown description of a neuroleader type, from the bundled markdown if given."""
+    if bundled is not None and markdown_file in bundled:
+        return bundled[markdown_file]
+    
+    markdown_path = os.path.join(APP_PATHS["content_dir"], "neuroleader_types", markdown_file)
+    try:
+        return load_text_cached(markdown_path)
+    except Exception as e:
+        print(f"Error loading markdown for {type_id}: {e}")
+        return "Content not available"
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_neuroleader_registry():
+    """
+    Get the shared neuroleader type registry.
+    The registry is rebuilt only when the types list, the bundle or (checked
+    at most once per SOURCE_CHECK_INTERVAL) a type's markdown file changes.
+    
+    Returns:
+        NeuroleaderTypeRegistry: The registry.
+    """
+    global _registry
+    
+    types = load_neuroleader_types()
+    with _registry_lock:
+        if _registry is None or not _registry.is_current(types):
+            _registry = NeuroleaderTypeRegistry(types)
+        return _registry
+
 def get_neuroleader_type_details(type_id):
     """
     Get detailed information about a specific neuroleader type.
@@ -48,25 +198,11 @@ def get_neuroleader_type_details(type_id):
         type_id (str): The ID of the neuroleader type.
         
     Returns:
-        dict: Detailed information about the neuroleader type.
+        Mapping: Read-only information about the neuroleader type, including
+        "markdown_content" when a markdown file is defined, or None if not found.
     """
     try:
-        types = load_neuroleader_types()
-        for t in types:
-            if t.get("id") == type_id:
-                # If there's a markdown file, load its content
-                if "markdown_file" in t:
-                    markdown_path = os.path.join(
-                        APP_PATHS["content_dir"], "neuroleader_types", t["markdown_file"]
-                    )
-                    try:
-                        with open(markdown_path, "r", encoding="utf-8") as f:
-                            t["markdown_content"] = f.read()
-                    except Exception as e:
-                        print(f"Error loading markdown for {type_id}: {e}")
-                        t["markdown_content"] = "Content not available"
-                return t
-        return None
+        return get_neuroleader_registry().get(type_id)
     except Exception as e:
         print(f"Error getting neuroleader type details: {e}")
         return None
@@ -0,0 +1,215 @@
+"""
+Lesson index for the BrainVenture course structure.
+
+The nested course structure (blocks → modules → lessons) is flattened once
+into an ordered lesson array, so pages can look lessons up by ID, navigate
+between them and count lessons per block or module without walking the tree.
+"""
+
+import threading
+from collections import namedtuple
+
+from config.content_config import load_course_structure
+
+# Indices are zero-based; lesson IDs use one-based numbers (e.g. "b1_m1_l1")
+Lesson = namedtuple(
+    "Lesson",
+    ["id", "ordinal", "block_index", "module_index", "position", "title", "block_title", "module_title"],
+)
+Module = namedtuple("Module", ["block_index", "index", "title", "lessons"])
+Block = namedtuple("Block", ["index", "title", "emoji", "lessons", "modules"])
+
+def make_lesson_id(block_index, module_index, position):
+    """
+    Build a lesson ID from zero-based positions.
+
+    Args:
+        block_index (int): Block index.
+        module_index (int): Module index within the block.
+        position (int): Lesson position within the module.
+
+    Returns:
+        str: Lesson ID in format 'b1_m1_l1'.
+    """
+    return f"b{block_index + 1}_m{module_index + 1}_l{position + 1}"
+
+class LessonIndex:
+    """
+    Precomputed index of all lessons in the course.
+
+    Lessons are stored in course order; each block and module records the
+    range of lesson ordinals it spans.
+    """
+
+    def __init__(self, course_structure):
+        """
+        Build the index.
+
+        Args:
+            course_structure (list): Course blocks as loaded from JSON.
+        """
+        lessons = []
+        blocks = []
+
+        for block_index, block in enumerate(course_structure):
+            block_title = block.get("title", f"Blok {block_index + 1}")
+            block_start = len(lessons)
+            modules = []
+
+            for module_index, module in enumerate(block.get("modules", [])):
+                module_title = module.get("title", f"Moduł {module_index + 1}")
+                module_start = len(lessons)
+
+                for position, lesson in enumerate(module.get("lessons", [])):
+                    lessons.append(Lesson(
+                        id=make_lesson_id(block_index, module_index, position),
+                        ordinal=len(lessons),
+                        block_index=block_index,
+                        module_index=module_index,
+                        position=position,
+                        title=lesson.get("title", f"Lekcja {position + 1}"),
+                        block_title=block_title,
+                        module_title=module_title,
+                    ))
+
+                modules.append(Module(block_index, module_index, module_title, range(module_start, len(lessons))))
+
+            blocks.append(Block(
+                block_index,
+                block_title,
+                block.get("emoji", "📚"),
+                range(block_start, len(lessons)),
+                tuple(modules),
+            ))
+
+        self.lessons = tuple(lessons)
+        self.blocks = tuple(blocks)
+        self._by_id = {lesson.id: lesson for lesson in lessons}
+
+    def __len__(self):
+        return len(self.lessons)
+
+    def __contains__(self, lesson_id):
+        return lesson_id in self._by_id
+
+    def get(self, lesson_id):
+        """
+        Get a lesson by ID.
+
+        Args:
+            lesson_id (str): Lesson ID in format 'b1_m1_l1'.
+
+        Returns:
+            Lesson: The lesson, or None if the ID is unknown.
+        """
+        return self._by_id.get(lesson_id)
+
+    def ordinal(self, lesson_id):
+        """
+        Get the position of a lesson in course order.
+
+        Args:
+            lesson_id (str): Lesson ID.
+
+        Returns:
+            int: Zero-based ordinal, or None if the ID is unknown.
+        """
+        lesson = self._by_id.get(lesson_id)
+        return lesson.ordinal if lesson else None
+
+    def first(self):
+        """
+        Get the first lesson of the course.
+
+        Returns:
+            Lesson: The first lesson, or None if the course is empty.
+        """
+        return self.lessons[0] if self.lessons else None
+
+    def previous(self, lesson_id):
+        """
+        Get the lesson before the given one, crossing module and block boundaries.
+
+        Args:
+            lesson_id (str): Lesson ID.
+
+        Returns:
+            Lesson: The previous lesson, or None at the start of the course.
+        """
+        lesson = self._by_id.get(lesson_id)
+        if lesson is None or lesson.ordinal == 0:
+            return None
+        return self.lessons[lesson.ordinal - 1]
+
+    def next(self, lesson_id):
+        """
+        Get the lesson after the given one, crossing module and block boundaries.
+
+        Args:
+            lesson_id (str): Lesson ID.
+
+        Returns:
+            Lesson: The next lesson, or None at the end of the course.
+        """
+        lesson = self._by_id.get(lesson_id)
+        if lesson is None or lesson.ordinal + 1 >= len(self.lessons):
+            return None
+        return self.lessons[lesson.ordinal + 1]
+
+    def block_range(self, block_index):
+        """
+        Get the lesson ordinals of a block.
+
+        Args:
+            block_index (int): Zero-based block index.
+
+        Returns:
+            range: Lesson ordinals in the block.
+        """
+        return self.blocks[block_index].lessons
+
+    def module_range(self, block_index, module_index):
+        """
+        Get the lesson ordinals of a module.
+
+        Args:
+            block_index (int): Zero-based block index.
+            module_index (int): Zero-based module index within the block.
+
+        Returns:
+            range: Lesson ordinals in the module.
+        """
+        return self.blocks[block_index].modules[module_index].lessons
+
+    def lessons_in(self, ordinals):
+        """
+        Get the lessons for a range of ordinals.
+
+        Args:
+            ordinals (range): Ordinals as returned by block_range or module_range.
+
+        Returns:
+            tuple: Lessons in course order.
+        """
+        return self.lessons[ordinals.start:ordinals.stop]
+
+_index = None
+_index_source = None
+_index_lock = threading.Lock()
+
+def get_lesson_index():
+    """
+    Get the shared lesson index.
+    The index is rebuilt only when the course structure changes.
+
+    Returns:
+        LessonIndex: The lesson index.
+    """
+    global _index, _index_source
+
+    course_structure = load_course_structure()
+    with _index_lock:
+        if _index is None or _index_source is not course_structure:
+            _index = LessonIndex(course_structure)
+            _index_source = course_structure
+        return _index
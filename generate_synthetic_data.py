@@ -0,0 +1,19 @@
+"""
+Generate a synthetic BrainVenture data set for scale testing.
+
+Writes a data directory with the layout of data/ (thousands of lessons, tens
+of thousands of resources, 100k users by default), reproducible from a seed:
+    python generate_synthetic_data.py --output-dir data/synthetic --seed 42
+    BRAINVENTURE_DATA_DIR=data/synthetic streamlit run app.py
+"""
+
+import os
+import sys
+
+# Add the application directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
+
+from benchmarks.synthetic import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Migrate BrainVenture user data from JSON files to SQLite.
+
+Imports every data/user_files/<user_id>.json document into the SQLite user
+store. Afterwards set BRAINVENTURE_USER_STORE=sqlite to use the database:
+    python migrate_user_data.py [--source DIR] [--database PATH]
+"""
+
+import os
+import sys
+import argparse
+
+# Add the application directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__))))
+
+from utils.user_store import migrate_json_to_sqlite
+
+def main(argv=None):
+    """Command line entry point for the migration."""
+    parser = argparse.ArgumentParser(description="Import JSON user files into the SQLite user store.")
+    parser.add_argument("--source", help="Directory with JSON user files (default: data/user_files)")
+    parser.add_argument("--database", help="SQLite database path (default: STORAGE_CONFIG['sqlite_path'])")
+    args = parser.parse_args(argv)
+
+    migrated, failed = migrate_json_to_sqlite(args.source, args.database)
+
+    print(f"✅ Migrated {migrated} users")
+    if failed:
+        print(f"❌ Failed to migrate {len(failed)} users: {', '.join(failed)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,11 +12,15 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from config.app_config import APP_CONFIG, FEATURE_FLAGS
-from config.content_config import load_course_structure, load_neuroleader_types
+from config.content_config import get_neuroleader_registry
 from components.navigation import sidebar_navigation, page_header
 from utils.ui import setup_page, card
+from utils.profiler import profiled_page
 from utils.helpers import load_user_data
+from utils.progress import get_progress_tracker
+from utils.user_session import get_current_user_id
 
+@profiled_page("Dashboard")
 def main():
     """
     Main function for the Dashboard page.
@@ -39,7 +43,7 @@ def main():
     )
     
     # Load user data
-    user_id = "default_user"  # In a real app, this would come from authentication
+    user_id = get_current_user_id()
     user_data = load_user_data(user_id)
     
     # Welcome message
@@ -79,15 +83,17 @@ def main():
     # User progress overview
     st.subheader("Twoje Postępy")
     
-    # Calculate progress
-    completed_lessons = user_data.get("progress", {}).get("completed_lessons", [])
-    progress_percentage = 30  # For MVP, hardcoded at 30%
+    # Get progress from the shared progress tracker
+    progress = get_progress_tracker(user_id, user_data)
+    progress_percentage = progress.overall_percent()
     
     st.progress(progress_percentage / 100, text=f"Ukończono {progress_percentage}% kursu")
     
     # Latest activity and next recommended lesson
     st.markdown("**Ostatnia aktywność:** Lekcja: Co to jest neuroprzywództwo?")
-    st.markdown("**Następna lekcja:** Mózg lidera – struktura i funkcje")
+    next_lesson = progress.next_lesson()
+    if next_lesson:
+        st.markdown(f"**Następna lekcja:** {next_lesson.title}")
     
     # Show continue button
     if st.button("Kontynuuj Naukę", use_container_width=True):
@@ -123,7 +129,7 @@ def main():
     st.subheader("Typy Neuroleaderów")
     
     # Load neuroleader types
-    neuroleader_types = load_neuroleader_types()
+    neuroleader_types = get_neuroleader_registry().all()
     
     # Display types in a grid
     cols = st.columns(3)
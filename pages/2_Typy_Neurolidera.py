@@ -7,19 +7,25 @@ import os
 import sys
 import json
 import random
-import numpy as np
 from datetime import datetime
-import plotly.graph_objects as go
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from config.app_config import APP_CONFIG
-from config.content_config import load_neuroleader_types, load_neuroleader_test, get_neuroleader_type_details
+from config.content_config import load_neuroleader_test, get_neuroleader_type_details, get_neuroleader_registry
 from components.navigation import sidebar_navigation, page_header
 from utils.ui import setup_page, card
-from utils.helpers import load_user_data, save_user_data, award_achievement
+from utils.profiler import profiled_page, profile_phase
+from utils.helpers import award_achievement, record_progress_event, user_data_transaction
+from utils.event_log import EVENT_TEST_TAKEN
+from utils.user_session import get_current_user_id
+from utils.metrics import get_metrics_registry
 from utils.validators import validate_test_answers
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+go = lazy_import("plotly.graph_objects")
 
 def display_neuroleader_type(type_id):
     """
@@ -148,7 +154,7 @@ def display_neuroleader_types_overview():
     """, unsafe_allow_html=True)
     
     # Load all neuroleader types
-    neuroleader_types = load_neuroleader_types()
+    neuroleader_types = get_neuroleader_registry().all()
       # Styles are now loaded from external CSS file
       # Create a grid layout with streamlit columns instead of CSS grid for better control
     rows = [st.columns(3) for _ in range((len(neuroleader_types) + 2) // 3)]
@@ -311,34 +317,30 @@ def run_neuroleader_test():
                 st.session_state.test_answers,
                 len(questions)
             )
+            get_metrics_registry().increment(
+                "test_submissions_total", test_type="neuroleader_type", result="valid" if valid else "incomplete"
+            )
             
             if valid:
                 # Process answers and determine the type
                 result_type = process_test_results(st.session_state.test_answers)
                 
-                # Save result to user data
-                user_id = "default_user"  # In a real app, this would come from authentication
-                user_data = load_user_data(user_id)
-                
-                if "progress" not in user_data:
-                    user_data["progress"] = {}
-                
-                user_data["progress"]["neuroleader_type"] = result_type
-                user_data["progress"]["tests_taken"] = user_data["progress"].get("tests_taken", []) + [{
-                    "test_type": "neuroleader_type",
-                    "result": result_type,
-                    "date": datetime.now().strftime("%d-%m-%Y")
-                }]
-                
-                save_user_data(user_data, user_id)
-                
-                # Award achievement
-                award_achievement(
-                    user_id,
-                    "Samoświadomy Lider",
-                    "Wykonałeś swój pierwszy test neuroleaderski i poznałeś swój typ!",
-                    "🔍"
-                )
+                # Record the result as progress events (no full rewrite of the user document)
+                user_id = get_current_user_id()
+                with user_data_transaction(user_id):
+                    record_progress_event(user_id, EVENT_TEST_TAKEN, {
+                        "test_type": "neuroleader_type",
+                        "result": result_type,
+                        "date": datetime.now().strftime("%d-%m-%Y")
+                    })
+                    
+                    # Award achievement
+                    award_achievement(
+                        user_id,
+                        "Samoświadomy Lider",
+                        "Wykonałeś swój pierwszy test neuroleaderski i poznałeś swój typ!",
+                        "🔍"
+                    )
                 
                 # Show result
                 st.session_state["test_result"] = result_type
@@ -450,49 +452,48 @@ def show_test_result(result_type):
     </div>
     """, unsafe_allow_html=True)
       # Create sample data for radar chart
-    import pandas as pd
-    
     # Create fake scores for demonstration
     categories = ['Analityczność', 'Reaktywność', 'Balans', 'Empatia', 'Innowacyjność', 'Inspirowanie']
     
-    # Generate random values but ensure the user's type has highest score
-    values = np.random.randint(30, 70, size=6)
-    
-    # Find index of user's type and ensure it's the highest
-    type_indices = {
-        "neuroanalityk": 0,
-        "neuroreaktor": 1,
-        "neurobalanser": 2,
-        "neuroempata": 3,
-        "neuroinnowator": 4,
-        "neuroinspirator": 5
-    }
-    
-    dominant_idx = type_indices.get(result_type, 0)
-    values[dominant_idx] = max(values) + 20  # Ensure it's clearly dominant
-    
-    # Create a radar chart
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        name='Twój profil',
-        line_color='#4CAF50',
-        fillcolor='rgba(76, 175, 80, 0.3)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100]
-            )
-        ),
-        showlegend=False,
-        height=400
-    )
+    with profile_phase("chart"):
+        # Generate random values but ensure the user's type has highest score
+        values = np.random.randint(30, 70, size=6)
+    
+        # Find index of user's type and ensure it's the highest
+        type_indices = {
+            "neuroanalityk": 0,
+            "neuroreaktor": 1,
+            "neurobalanser": 2,
+            "neuroempata": 3,
+            "neuroinnowator": 4,
+            "neuroinspirator": 5
+        }
+    
+        dominant_idx = type_indices.get(result_type, 0)
+        values[dominant_idx] = max(values) + 20  # Ensure it's clearly dominant
+    
+        # Create a radar chart
+        fig = go.Figure()
+    
+        fig.add_trace(go.Scatterpolar(
+            r=values,
+            theta=categories,
+            fill='toself',
+            name='Twój profil',
+            line_color='#4CAF50',
+            fillcolor='rgba(76, 175, 80, 0.3)'
+        ))
+    
+        fig.update_layout(
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    range=[0, 100]
+                )
+            ),
+            showlegend=False,
+            height=400
+        )
     
     st.plotly_chart(fig, use_container_width=True)
       # Action buttons at the bottom
@@ -534,6 +535,7 @@ def show_test_result(result_type):
     </div>
     """, unsafe_allow_html=True)
     
+@profiled_page("Typy Neurolidera")
 def main():
     """
     Main function for the Neuroleader Types page.
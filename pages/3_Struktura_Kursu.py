@@ -6,16 +6,22 @@ import streamlit as st
 import os
 import sys
 import json
-import pandas as pd
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from config.app_config import APP_CONFIG
-from config.content_config import load_course_structure
+from config.course_index import get_lesson_index
 from components.navigation import sidebar_navigation, page_header, breadcrumbs
 from utils.ui import setup_page, card, progress_bar
-from utils.helpers import load_user_data, save_user_data, award_achievement, calculate_progress
+from utils.profiler import profiled_page
+from utils.helpers import load_user_data, award_achievement, record_progress_event, user_data_transaction
+from utils.event_log import EVENT_LESSON_COMPLETED
+from utils.progress import get_progress_tracker, record_lesson_completed
+from utils.user_session import get_current_user_id
+from utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 def display_course_structure():
     """
@@ -27,67 +33,44 @@ def display_course_structure():
     Każdy blok koncentruje się na innym aspekcie neuroprzywództwa.
     """)
     
-    # Load course structure
-    course_structure = load_course_structure()
+    # Load the lesson index built from the course structure
+    lesson_index = get_lesson_index()
     
     # Load user data to check completed lessons
-    user_id = "default_user"  # In a real app, this would come from authentication
+    user_id = get_current_user_id()
     user_data = load_user_data(user_id)
-    completed_lessons = user_data.get("progress", {}).get("completed_lessons", [])
+    progress = get_progress_tracker(user_id, user_data)
     
     # Display course blocks
-    for block_index, block in enumerate(course_structure):
-        block_title = block.get("title", f"Blok {block_index + 1}")
-        block_emoji = block.get("emoji", "📚")
-        
-        # Count total and completed lessons in this block
-        block_total_lessons = 0
-        block_completed_lessons = 0
-        
-        for module_index, module in enumerate(block.get("modules", [])):
-            block_total_lessons += len(module.get("lessons", []))
-            
-            # Count completed lessons in this module
-            for lesson_index, _ in enumerate(module.get("lessons", [])):
-                lesson_id = f"b{block_index+1}_m{module_index+1}_l{lesson_index+1}"
-                if lesson_id in completed_lessons:
-                    block_completed_lessons += 1
-        
-        # Calculate block progress
-        if block_total_lessons > 0:
-            block_progress = calculate_progress(block_completed_lessons, block_total_lessons)
-        else:
-            block_progress = 0
+    for block in lesson_index.blocks:
+        # Get completed and total lessons in this block
+        block_completed_lessons, block_total_lessons = progress.block_counts(block.index)
+        block_progress = progress.block_percent(block.index)
         
         # Create an expandable section for each block
-        with st.expander(f"{block_emoji} {block_title} ({block_progress}%)", expanded=block_index == 0):
+        with st.expander(f"{block.emoji} {block.title} ({block_progress}%)", expanded=block.index == 0):
             # Display block description
-            st.markdown(f"### {block_emoji} {block_title}")
+            st.markdown(f"### {block.emoji} {block.title}")
             
             # Display progress bar for the block
             st.progress(block_progress / 100, text=f"{block_completed_lessons}/{block_total_lessons} lekcji ukończonych")
             
             # Display modules in this block
-            for module_index, module in enumerate(block.get("modules", [])):
-                module_title = module.get("title", f"Moduł {module_index + 1}")
-                
-                st.markdown(f"#### {module_title}")
+            for module in block.modules:
+                st.markdown(f"#### {module.title}")
                 
                 # Create a table for lessons
                 lessons_data = []
-                for lesson_index, lesson in enumerate(module.get("lessons", [])):
-                    lesson_title = lesson.get("title", f"Lekcja {lesson_index + 1}")
-                    lesson_id = f"b{block_index+1}_m{module_index+1}_l{lesson_index+1}"
-                    
+                for lesson in lesson_index.lessons_in(module.lessons):
                     # Check if lesson is completed
-                    is_completed = lesson_id in completed_lessons
+                    is_completed = progress.is_completed(lesson.id)
                     status = "✅" if is_completed else "⬜"
                     
                     # Add lesson to table
                     lessons_data.append({
                         "status": status,
-                        "lesson": lesson_title,
-                        "id": lesson_id
+                        "lesson": lesson.title,
+                        "id": lesson.id
                     })
                 
                 # Display lessons as a table
@@ -108,16 +91,19 @@ def display_lesson_content(lesson_id, lesson_title):
     # In a real app, this would load actual lesson content from a database or files
     # For the MVP, we'll simulate some content
     
-    # Display breadcrumb navigation
-    parts = lesson_id.split("_")
-    block_num = int(parts[0][1:])
-    module_num = int(parts[1][1:])
-    lesson_num = int(parts[2][1:])
+    # Look the lesson up in the course index
+    lesson_index = get_lesson_index()
+    lesson = lesson_index.get(lesson_id)
+    
+    if lesson is None:
+        st.error(f"Nie znaleziono lekcji: {lesson_id}")
+        return
     
+    # Display breadcrumb navigation
     breadcrumbs([
         ("Struktura Kursu", None),
-        (f"Blok {block_num}", None),
-        (f"Moduł {module_num}", None),
+        (lesson.block_title, None),
+        (lesson.module_title, None),
         (lesson_title, None)
     ])
     
@@ -157,55 +143,48 @@ def display_lesson_content(lesson_id, lesson_title):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if lesson_num > 1:
-            prev_lesson_id = f"b{block_num}_m{module_num}_l{lesson_num-1}"
+        prev_lesson = lesson_index.previous(lesson_id)
+        if prev_lesson:
             if st.button("← Poprzednia lekcja", use_container_width=True):
-                st.session_state["lesson_id"] = prev_lesson_id
-                st.session_state["lesson_title"] = f"Lekcja {lesson_num-1}"
+                st.session_state["lesson_id"] = prev_lesson.id
+                st.session_state["lesson_title"] = prev_lesson.title
                 st.rerun()
     
     with col2:
         if st.button("Oznacz jako ukończoną", use_container_width=True):
             # In a real app, this would update the lesson status in the database
-            user_id = "default_user"  # In a real app, this would come from authentication
-            user_data = load_user_data(user_id)
-            
-            if "progress" not in user_data:
-                user_data["progress"] = {}
-            
-            if "completed_lessons" not in user_data["progress"]:
-                user_data["progress"]["completed_lessons"] = []
+            user_id = get_current_user_id()
+            with user_data_transaction(user_id) as user_data:
+                completed = record_lesson_completed(user_data, lesson_id, user_id)
+                if completed:
+                    record_progress_event(user_id, EVENT_LESSON_COMPLETED, {"lesson_id": lesson_id})
+                    
+                    # Award achievement for first completed lesson
+                    if len(user_data["progress"]["completed_lessons"]) == 1:
+                        award_achievement(
+                            user_id,
+                            "Pierwszy Krok",
+                            "Ukończyłeś swoją pierwszą lekcję!",
+                            "📚"
+                        )
             
-            if lesson_id not in user_data["progress"]["completed_lessons"]:
-                user_data["progress"]["completed_lessons"].append(lesson_id)
-                save_user_data(user_data, user_id)
-                
-                # Award achievement for first completed lesson
-                if len(user_data["progress"]["completed_lessons"]) == 1:
-                    award_achievement(
-                        user_id,
-                        "Pierwszy Krok",
-                        "Ukończyłeś swoją pierwszą lekcję!",
-                        "📚"
-                    )
-                
+            if completed:
                 st.success("Lekcja oznaczona jako ukończona!")
                 st.rerun()
     
     with col3:
-        next_lesson_id = f"b{block_num}_m{module_num}_l{lesson_num+1}"
-        if st.button("Następna lekcja →", use_container_width=True):
-            st.session_state["lesson_id"] = next_lesson_id
-            st.session_state["lesson_title"] = f"Lekcja {lesson_num+1}"
-            st.rerun()
+        next_lesson = lesson_index.next(lesson_id)
+        if next_lesson:
+            if st.button("Następna lekcja →", use_container_width=True):
+                st.session_state["lesson_id"] = next_lesson.id
+                st.session_state["lesson_title"] = next_lesson.title
+                st.rerun()
 
+@profiled_page("Struktura Kursu")
 def main():
     """
     Main function for the Course Structure page.
     """
-    # Ensure pandas is imported
-    import pandas as pd
-    
     # Setup page
     setup_page(
         page_title=f"Struktura Kursu | {APP_CONFIG['app_name']}",
@@ -239,10 +218,11 @@ def main():
         
         # Add button to start the first lesson
         st.markdown("### Rozpocznij kurs")
-        if st.button("Rozpocznij od pierwszej lekcji", use_container_width=True):
+        first_lesson = get_lesson_index().first()
+        if first_lesson and st.button("Rozpocznij od pierwszej lekcji", use_container_width=True):
             st.session_state["show_lesson"] = True
-            st.session_state["lesson_id"] = "b1_m1_l1"
-            st.session_state["lesson_title"] = "Co to jest neuroprzywództwo?"
+            st.session_state["lesson_id"] = first_lesson.id
+            st.session_state["lesson_title"] = first_lesson.title
             st.rerun()
 
 if __name__ == "__main__":
@@ -6,7 +6,6 @@ import streamlit as st
 import os
 import sys
 import json
-import pandas as pd
 from datetime import datetime
 
 # Add parent directory to path for module imports
@@ -19,8 +18,11 @@ from components.user_profile import (
     edit_user_profile_form, user_activity_timeline
 )
 from utils.ui import setup_page, card, tabs
+from utils.profiler import profiled_page
 from utils.helpers import load_user_data, save_user_data
+from utils.user_session import get_current_user_id
 
+@profiled_page("Profil")
 def main():
     """Main function for the User Profile page."""
     # Setup page configuration
@@ -37,7 +39,7 @@ def main():
     st.title("🧑‍💼 Twój Profil")
     
     # Load user data
-    user_data = load_user_data()
+    user_data = load_user_data(get_current_user_id())
     
     # Display user profile header with avatar and basic info
     user_profile_header(user_data)
@@ -188,7 +190,7 @@ def display_settings_tab(user_data):
     st.header("Ustawienia Profilu")
     
     # Display edit profile form
-    updated_profile = edit_user_profile_form(user_data)
+    updated_profile = edit_user_profile_form(user_data, get_current_user_id())
     
     if updated_profile:
         # Update user data
@@ -196,7 +198,7 @@ def display_settings_tab(user_data):
         user_data["updated_at"] = datetime.now().isoformat()
         
         # Save updated user data
-        save_user_data(user_data)
+        save_user_data(user_data, get_current_user_id())
         st.success("Profil zaktualizowany pomyślnie!")
         
     # Notification settings
@@ -224,7 +226,7 @@ def display_settings_tab(user_data):
         user_data["updated_at"] = datetime.now().isoformat()
         
         # Save updated user data
-        save_user_data(user_data)
+        save_user_data(user_data, get_current_user_id())
         st.success("Ustawienia powiadomień zaktualizowane!")
     
     # Display data export option
@@ -5,18 +5,22 @@ Resources/Blog page for the BrainVenture application.
 import streamlit as st
 import os
 import sys
-import json
 from datetime import datetime
 import random
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config.app_config import APP_CONFIG, FEATURE_FLAGS
+from config.app_config import APP_CONFIG, FEATURE_FLAGS, APP_PATHS
+from config.content_bundle import get_bundled_content
 from components.navigation import sidebar_navigation
 from utils.ui import setup_page, card, tag_badge, tabs
+from utils.profiler import profiled_page, profiled
 from utils.helpers import format_date, load_file, slugify
+from utils.cache import load_json_cached
+from utils.resources import filter_resources
 
+@profiled_page("Zasoby")
 def main():
     """Main function for the Resources/Blog page."""
     # Setup page configuration
@@ -64,23 +68,28 @@ def main():
     elif selected_tab == "Narzędzia":
         display_tools(search_term, category, sort_by)
 
+@profiled("content load")
 def load_blog_data():
     """
-    Load blog/resource data from JSON file or create placeholder data.
+    Load blog/resource data from the content bundle, JSON file or create placeholder data.
     
     In a production app, this would load from a database or CMS.
     
     Returns:
         dict: Blog/resource data.
     """
+    # Prefer the prebuilt content bundle when available
+    bundled = get_bundled_content("blog_resources")
+    if bundled is not None:
+        return bundled
+    
     # Path to the blog data file
-    blog_data_path = os.path.join("data", "content", "blog_resources.json")
+    blog_data_path = APP_PATHS["blog_resources_json"]
     
     # Check if the file exists
     if os.path.exists(blog_data_path):
         try:
-            with open(blog_data_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            return load_json_cached(blog_data_path)
         except Exception as e:
             st.error(f"Error loading blog data: {str(e)}")
     
@@ -343,24 +352,7 @@ def display_articles(search_term="", category="Wszystkie", sort_by="Najnowsze"):
     """
     # Load blog data
     blog_data = load_blog_data()
-    articles = blog_data.get("articles", [])
-    
-    # Apply filters
-    if search_term:
-        articles = [a for a in articles if search_term.lower() in a.get("title", "").lower() or 
-                    search_term.lower() in a.get("summary", "").lower() or
-                    any(search_term.lower() in tag.lower() for tag in a.get("tags", []))]
-    
-    if category != "Wszystkie":
-        articles = [a for a in articles if a.get("category") == category]
-    
-    # Sort articles
-    if sort_by == "Najnowsze":
-        articles = sorted(articles, key=lambda x: x.get("published_date", ""), reverse=True)
-    elif sort_by == "Najpopularniejsze":
-        articles = sorted(articles, key=lambda x: x.get("views", 0), reverse=True)
-    elif sort_by == "Alfabetycznie":
-        articles = sorted(articles, key=lambda x: x.get("title", ""))
+    articles = filter_resources(blog_data.get("articles", []), "articles", search_term, category, sort_by)
     
     # Check if any articles match the filters
     if not articles:
@@ -405,25 +397,7 @@ def display_books(search_term="", category="Wszystkie", sort_by="Najnowsze"):
     """
     # Load blog data
     blog_data = load_blog_data()
-    books = blog_data.get("books", [])
-    
-    # Apply filters
-    if search_term:
-        books = [b for b in books if search_term.lower() in b.get("title", "").lower() or 
-                search_term.lower() in b.get("author", "").lower() or 
-                search_term.lower() in b.get("summary", "").lower() or
-                any(search_term.lower() in tag.lower() for tag in b.get("tags", []))]
-    
-    if category != "Wszystkie":
-        books = [b for b in books if b.get("category") == category]
-    
-    # Sort books
-    if sort_by == "Najnowsze":
-        books = sorted(books, key=lambda x: x.get("published_year", 0), reverse=True)
-    elif sort_by == "Najpopularniejsze":
-        books = sorted(books, key=lambda x: x.get("rating", 0), reverse=True)
-    elif sort_by == "Alfabetycznie":
-        books = sorted(books, key=lambda x: x.get("title", ""))
+    books = filter_resources(blog_data.get("books", []), "books", search_term, category, sort_by)
     
     # Check if any books match the filters
     if not books:
@@ -458,26 +432,7 @@ def display_research(search_term="", category="Wszystkie", sort_by="Najnowsze"):
     """
     # Load blog data
     blog_data = load_blog_data()
-    research_papers = blog_data.get("research", [])
-    
-    # Apply filters
-    if search_term:
-        research_papers = [r for r in research_papers if search_term.lower() in r.get("title", "").lower() or 
-                          search_term.lower() in " ".join(r.get("authors", [])).lower() or
-                          search_term.lower() in r.get("summary", "").lower() or
-                          any(search_term.lower() in tag.lower() for tag in r.get("tags", []))]
-    
-    if category != "Wszystkie":
-        research_papers = [r for r in research_papers if r.get("category") == category]
-    
-    # Sort research
-    if sort_by == "Najnowsze":
-        research_papers = sorted(research_papers, key=lambda x: x.get("published_date", ""), reverse=True)
-    elif sort_by == "Najpopularniejsze":
-        # For research, we don't have views, so we sort by recency as fallback
-        research_papers = sorted(research_papers, key=lambda x: x.get("published_date", ""), reverse=True)
-    elif sort_by == "Alfabetycznie":
-        research_papers = sorted(research_papers, key=lambda x: x.get("title", ""))
+    research_papers = filter_resources(blog_data.get("research", []), "research", search_term, category, sort_by)
     
     # Check if any research papers match the filters
     if not research_papers:
@@ -517,25 +472,7 @@ def display_tools(search_term="", category="Wszystkie", sort_by="Najnowsze"):
     """
     # Load blog data
     blog_data = load_blog_data()
-    tools = blog_data.get("tools", [])
-    
-    # Apply filters
-    if search_term:
-        tools = [t for t in tools if search_term.lower() in t.get("title", "").lower() or 
-                search_term.lower() in t.get("description", "").lower() or
-                any(search_term.lower() in tag.lower() for tag in t.get("tags", []))]
-    
-    if category != "Wszystkie":
-        tools = [t for t in tools if t.get("category") == category]
-    
-    # Sort tools
-    if sort_by == "Najnowsze":
-        # For tools, we don't have a date, so we sort by rating as fallback
-        tools = sorted(tools, key=lambda x: x.get("rating", 0), reverse=True)
-    elif sort_by == "Najpopularniejsze":
-        tools = sorted(tools, key=lambda x: x.get("rating", 0), reverse=True)
-    elif sort_by == "Alfabetycznie":
-        tools = sorted(tools, key=lambda x: x.get("title", ""))
+    tools = filter_resources(blog_data.get("tools", []), "tools", search_term, category, sort_by)
     
     # Check if any tools match the filters
     if not tools:
@@ -48,9 +48,16 @@ def main():
     except:
         print(f"ℹ️ Please open your browser to http://localhost:{port}")
     
+    # Metrics are collected in the Streamlit process, which also serves them
+    env = dict(os.environ)
+    env.setdefault("BRAINVENTURE_METRICS", "1")
+    env.setdefault("BRAINVENTURE_METRICS_PORT", "9464")
+    if env["BRAINVENTURE_METRICS"] == "1":
+        print(f"📊 Metrics available at http://127.0.0.1:{env['BRAINVENTURE_METRICS_PORT']}/metrics")
+
     # Run Streamlit
     try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", app_path])
+        subprocess.run([sys.executable, "-m", "streamlit", "run", app_path], env=env)
     except KeyboardInterrupt:
         print("\n👋 BrainVenture application stopped.")
     except Exception as e:
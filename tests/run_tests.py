@@ -1,5 +1,9 @@
 """
 Run all tests for the BrainVenture application.
+
+With --benchmarks, runs the benchmark suite instead; the remaining arguments
+are passed to it (see benchmarks/runner.py), e.g.:
+    python tests/run_tests.py --benchmarks --scales small --baseline benchmarks/results/main.json
 """
 
 import unittest
@@ -10,6 +14,10 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 if __name__ == "__main__":
+    if "--benchmarks" in sys.argv[1:]:
+        from benchmarks.runner import main
+        sys.exit(main([arg for arg in sys.argv[1:] if arg != "--benchmarks"]))
+    
     # Find all test files in the tests directory
     test_dir = os.path.dirname(os.path.abspath(__file__))
     
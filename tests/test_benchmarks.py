@@ -0,0 +1,35 @@
+"""
+Unit tests for the benchmark runner.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.runner import compare_results, time_function
+
+class TestBenchmarkComparison(unittest.TestCase):
+    """Test the benchmark runner helpers."""
+
+    def test_compare_results(self):
+        """Benchmarks in both runs are compared by median, slowest first."""
+        baseline = {"results": {"a[small]": {"median": 1.0}, "b[small]": {"median": 2.0}, "old[small]": {"median": 1.0}}}
+        current = {"results": {"a[small]": {"median": 1.5}, "b[small]": {"median": 1.0}, "new[small]": {"median": 1.0}}}
+        rows = compare_results(baseline, current)
+        self.assertEqual([row[0] for row in rows], ["a[small]", "b[small]"])
+        self.assertAlmostEqual(rows[0][3], 1.5)
+        self.assertEqual([row[4] for row in rows], [True, False])
+        self.assertFalse(compare_results(baseline, current, threshold=0.6)[0][4])
+
+    def test_time_function(self):
+        """Timing results are per call."""
+        timing = time_function(lambda: None, repeat=2, min_time=0.001)
+        self.assertEqual(timing["runs"], 2)
+        self.assertGreater(timing["calls"], 1)
+        self.assertLessEqual(timing["min"], timing["median"])
+
+if __name__ == "__main__":
+    unittest.main()
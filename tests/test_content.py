@@ -0,0 +1,252 @@
+"""
+Unit tests for content loading and caching.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.cache import FileCache
+from config.app_config import APP_PATHS
+from config.course_index import LessonIndex, get_lesson_index
+from config import content_bundle
+from config.content_bundle import build_content_bundle, load_content_bundle, validate_content
+from utils.error_handler import ContentError
+from config.content_config import (
+    load_neuroleader_types, get_neuroleader_type_details,
+    get_neuroleader_registry, NeuroleaderTypeRegistry
+)
+
+class TestFileCache(unittest.TestCase):
+    """Test the mtime-invalidated file cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "data.json")
+        self.write({"version": 1})
+        self.cache = FileCache()
+        self.loads = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, data):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def loader(self, path):
+        self.loads += 1
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_parses_once(self):
+        """Repeated reads of an unchanged file hit the cache."""
+        first = self.cache.get(self.path, self.loader)
+        second = self.cache.get(self.path, self.loader)
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_reparses_on_change(self):
+        """A changed file is parsed again."""
+        self.cache.get(self.path, self.loader)
+        self.write({"version": 2, "extra": True})
+        # Make sure the mtime differs even on coarse-grained filesystems
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        data = self.cache.get(self.path, self.loader)
+        self.assertEqual(data["version"], 2)
+        self.assertEqual(self.loads, 2)
+
+    def test_serves_last_good_value(self):
+        """A broken file keeps serving the previous value without re-parsing."""
+        self.cache.get(self.path, self.loader)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"version": ')
+        self.assertEqual(self.cache.get(self.path, self.loader), {"version": 1})
+        self.assertEqual(self.cache.get(self.path, self.loader), {"version": 1})
+        self.assertTrue(self.cache.is_stale(self.path))
+        self.assertEqual(self.loads, 2)
+
+    def test_missing_file_raises(self):
+        """Missing files raise instead of caching a value."""
+        with self.assertRaises(OSError):
+            self.cache.get(os.path.join(self.tmp_dir.name, "missing.json"), self.loader)
+
+class TestContentCaching(unittest.TestCase):
+    """Test that content loaders share cached data."""
+
+    def test_loaders_return_cached_data(self):
+        """Loading types twice returns the same parsed object."""
+        self.assertIs(load_neuroleader_types(), load_neuroleader_types())
+
+    def test_type_details_do_not_modify_cache(self):
+        """Type details are not written back into the cached types list."""
+        types = load_neuroleader_types()
+        if not types:
+            self.skipTest("No neuroleader types available")
+        details = get_neuroleader_type_details(types[0]["id"])
+        self.assertIn("markdown_content", details)
+        self.assertNotIn("markdown_content", types[0])
+
+class TestNeuroleaderTypeRegistry(unittest.TestCase):
+    """Test the indexed neuroleader type registry."""
+
+    def test_lookup_by_id(self):
+        """Records are found by ID and unknown IDs return None."""
+        registry = NeuroleaderTypeRegistry([{"id": "a", "name": "A"}, {"id": "b", "name": "B"}])
+        self.assertEqual(registry.get("b")["name"], "B")
+        self.assertIsNone(registry.get("missing"))
+        self.assertEqual([r["id"] for r in registry.all()], ["a", "b"])
+
+    def test_records_are_immutable(self):
+        """Records cannot be modified by callers."""
+        registry = NeuroleaderTypeRegistry([{"id": "a", "name": "A"}])
+        with self.assertRaises(TypeError):
+            registry.get("a")["name"] = "Changed"
+
+    def test_markdown_change_is_detected(self):
+        """Editing a type's markdown file makes the registry out of date at the next check."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "neuroleader_types"))
+            markdown_path = os.path.join(tmp_dir, "neuroleader_types", "a.md")
+            with open(markdown_path, "w", encoding="utf-8") as f:
+                f.write("# A")
+            types = [{"id": "a", "name": "A", "markdown_file": "a.md"}]
+            paths = {"content_dir": tmp_dir, "content_bundle": os.path.join(tmp_dir, "missing.bin")}
+            with mock.patch.dict(APP_PATHS, paths):
+                now = [1000.0]
+                with mock.patch("config.content_config.time.monotonic", lambda: now[0]):
+                    registry = NeuroleaderTypeRegistry(types)
+                    self.assertTrue(registry.is_current(types))
+                    with open(markdown_path, "w", encoding="utf-8") as f:
+                        f.write("# A, updated")
+                    # Markdown files are not re-checked within the interval
+                    self.assertTrue(registry.is_current(types))
+                    now[0] += content_bundle.SOURCE_CHECK_INTERVAL
+                    self.assertFalse(registry.is_current(types))
+                self.assertEqual(NeuroleaderTypeRegistry(types).get("a")["markdown_content"], "# A, updated")
+
+    def test_shared_registry_is_reused(self):
+        """The shared registry is built once while the types file is unchanged."""
+        self.assertIs(get_neuroleader_registry(), get_neuroleader_registry())
+
+class TestContentBundle(unittest.TestCase):
+    """Test building and loading the content bundle."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bundle_path = os.path.join(self.tmp_dir.name, "content.bin")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_build_and_load(self):
+        """A built bundle contains all content files."""
+        summary = build_content_bundle(self.bundle_path)
+        self.assertEqual(len(summary["hash"]), 64)
+        bundle = load_content_bundle(self.bundle_path)
+        self.assertIsNotNone(bundle)
+        content = bundle["content"]
+        for key in ("course_structure", "neuroleader_types", "neuroleader_test",
+                    "test_questions", "blog_resources", "markdown"):
+            self.assertIn(key, content)
+        self.assertEqual(len(content["markdown"]), 6)
+
+    def test_corrupted_bundle_is_ignored(self):
+        """A bundle failing its integrity check is not used."""
+        build_content_bundle(self.bundle_path)
+        with open(self.bundle_path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+        self.assertIsNone(load_content_bundle(self.bundle_path))
+
+    def test_bundle_older_than_sources_is_ignored(self):
+        """A source edited after the bundle was loaded makes it stale at the next check."""
+        now = [1000.0]
+        with mock.patch.object(content_bundle.time, "monotonic", lambda: now[0]):
+            build_content_bundle(self.bundle_path)
+            self.assertIsNotNone(load_content_bundle(self.bundle_path))
+
+            source = APP_PATHS["course_structure_json"]
+            stat = os.stat(source)
+            try:
+                os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+                # Sources are not re-checked within the interval
+                self.assertIsNotNone(load_content_bundle(self.bundle_path))
+                now[0] += content_bundle.SOURCE_CHECK_INTERVAL
+                self.assertIsNone(load_content_bundle(self.bundle_path))
+            finally:
+                os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            now[0] += content_bundle.SOURCE_CHECK_INTERVAL
+            self.assertIsNotNone(load_content_bundle(self.bundle_path))
+
+    def test_missing_bundle(self):
+        """A missing bundle returns None."""
+        self.assertIsNone(load_content_bundle(os.path.join(self.tmp_dir.name, "missing.bin")))
+
+    def test_validation_rejects_bad_content(self):
+        """Questions referring to unknown types fail validation."""
+        content = {
+            "course_structure": [{"title": "Blok", "modules": []}],
+            "neuroleader_types": [{"id": "a"}],
+            "neuroleader_test": {"questions": [{"text": "Q", "type": "unknown"}]},
+            "test_questions": [],
+            "blog_resources": {},
+            "markdown": {},
+        }
+        with self.assertRaises(ContentError):
+            validate_content(content)
+
+class TestLessonIndex(unittest.TestCase):
+    """Test the precomputed lesson index."""
+
+    def setUp(self):
+        self.index = LessonIndex([
+            {"title": "Blok A", "modules": [
+                {"title": "Moduł A1", "lessons": [{"title": "L1"}, {"title": "L2"}]},
+                {"title": "Moduł A2", "lessons": [{"title": "L3"}]},
+            ]},
+            {"title": "Blok B", "modules": [
+                {"title": "Moduł B1", "lessons": [{"title": "L4"}]},
+            ]},
+        ])
+
+    def test_lookup_by_id(self):
+        """Lessons are found by their positional IDs."""
+        lesson = self.index.get("b1_m2_l1")
+        self.assertEqual(lesson.title, "L3")
+        self.assertEqual(lesson.ordinal, 2)
+        self.assertEqual(lesson.module_title, "Moduł A2")
+        self.assertIsNone(self.index.get("b9_m1_l1"))
+
+    def test_navigation_crosses_boundaries(self):
+        """Previous/next move across module and block boundaries."""
+        self.assertEqual(self.index.next("b1_m1_l2").id, "b1_m2_l1")
+        self.assertEqual(self.index.next("b1_m2_l1").id, "b2_m1_l1")
+        self.assertEqual(self.index.previous("b2_m1_l1").id, "b1_m2_l1")
+        self.assertIsNone(self.index.previous("b1_m1_l1"))
+        self.assertIsNone(self.index.next("b2_m1_l1"))
+
+    def test_ranges(self):
+        """Blocks and modules span contiguous ordinal ranges."""
+        self.assertEqual(self.index.block_range(0), range(0, 3))
+        self.assertEqual(self.index.module_range(0, 1), range(2, 3))
+        self.assertEqual([l.title for l in self.index.lessons_in(self.index.block_range(1))], ["L4"])
+
+    def test_course_index(self):
+        """The bundled course has an index covering every lesson."""
+        index = get_lesson_index()
+        self.assertIs(index, get_lesson_index())
+        self.assertEqual(len(index), sum(len(b.lessons) for b in index.blocks))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for lazy imports and the background warm-up.
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import utils.lazy_import as lazy_import_module
+from utils.lazy_import import LazyModule, lazy_import, is_loaded, warm_up
+
+class TestLazyImport(unittest.TestCase):
+    """Test the lazy module proxy."""
+
+    def test_imports_on_first_use(self):
+        """The module is imported on the first attribute access only."""
+        with mock.patch("importlib.import_module", wraps=__import__("importlib").import_module) as import_module:
+            module = LazyModule("colorsys")
+            self.assertFalse(module.__dict__["_module"])
+            import_module.assert_not_called()
+            self.assertEqual(module.rgb_to_hsv(0, 0, 0), (0.0, 0.0, 0.0))
+            module.hsv_to_rgb(0, 0, 0)
+            import_module.assert_called_once_with("colorsys")
+        self.assertTrue(is_loaded(module))
+
+    def test_loaded_module_returned_directly(self):
+        """Modules already in sys.modules are not wrapped."""
+        self.assertIs(lazy_import("os"), os)
+        self.assertTrue(is_loaded(os))
+
+    def test_module_being_imported_is_proxied(self):
+        """A partially imported module (e.g. by the warm-up thread) is not returned as is."""
+        module = mock.Mock(spec=["__spec__"])
+        module.__spec__._initializing = True
+        with mock.patch.dict(sys.modules, {"brainventure_partial_module": module}):
+            proxy = lazy_import("brainventure_partial_module")
+            self.assertIsInstance(proxy, LazyModule)
+            self.assertFalse(is_loaded(proxy))
+
+    def test_missing_module(self):
+        """A missing module fails on use, not on lazy_import()."""
+        module = lazy_import("brainventure_missing_module")
+        self.assertFalse(is_loaded(module))
+        with self.assertRaises(ImportError):
+            module.anything
+
+class TestWarmUp(unittest.TestCase):
+    """Test the background warm-up."""
+
+    def setUp(self):
+        patcher = mock.patch.object(lazy_import_module, "_warm_up_thread", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_starts_once(self):
+        """Only the first call starts a thread, which imports the pending modules."""
+        sys.modules.pop("colorsys", None)
+        thread = warm_up(("colorsys", "os"))
+        self.assertIsNotNone(thread)
+        thread.join(5)
+        self.assertIn("colorsys", sys.modules)
+        self.assertIsNone(warm_up(("colorsys",)))
+
+    def test_skips_loaded_and_disabled(self):
+        """No thread is started when disabled or when everything is loaded."""
+        self.assertIsNone(warm_up(("os",)))
+        with mock.patch.object(lazy_import_module, "WARMUP_ENABLED", False):
+            self.assertIsNone(warm_up(("brainventure_missing_module",)))
+
+    def test_failed_import_does_not_raise(self):
+        """Modules that fail to import are skipped."""
+        thread = warm_up(("brainventure_missing_module",))
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+if __name__ == "__main__":
+    unittest.main()
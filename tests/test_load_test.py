@@ -0,0 +1,47 @@
+"""
+Unit tests for the load test report.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.load_test import percentile, summarize
+from utils.user_session import get_current_user_id, DEFAULT_USER_ID
+
+class TestLoadTestReport(unittest.TestCase):
+    """Test latency percentiles and the per-page summary."""
+
+    def test_percentile(self):
+        """Percentiles use the nearest rank."""
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 95), 95.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_summarize(self):
+        """Reruns are grouped by page with their errors and throughput."""
+        samples = [
+            ("Profil", 0.0, 0.2, None),
+            ("Profil", 1.0, 0.4, "ValueError"),
+            ("Zasoby", 2.0, 0.1, None),
+        ]
+        report = summarize(samples, wall_time=2.0)
+        self.assertEqual(report["Profil"]["reruns"], 2)
+        self.assertEqual(report["Profil"]["errors"], 1)
+        self.assertEqual(report["Profil"]["first_error"], "ValueError")
+        self.assertEqual(report["Profil"]["p50"], 0.2)
+        self.assertEqual(report["Profil"]["max"], 0.4)
+        self.assertEqual(report["Zasoby"]["throughput"], 0.5)
+
+    def test_default_user_outside_session(self):
+        """Without a Streamlit session the default user is used."""
+        self.assertEqual(get_current_user_id(), DEFAULT_USER_ID)
+
+if __name__ == "__main__":
+    unittest.main()
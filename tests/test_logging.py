@@ -0,0 +1,241 @@
+"""
+Unit tests for the logging pipeline.
+"""
+
+import unittest
+import sys
+import os
+import gzip
+import json
+import logging
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import logger as logger_module
+from utils.logger import (
+    get_logger, RateLimiter, RotatingLogFileHandler, wait_for_log_compression,
+    JsonFormatter, ActivitySinkHandler, query_user_activity, PipelineQueueHandler
+)
+from unittest import mock
+from utils.error_handler import ErrorAggregator
+
+class TestLoggerRegistry(unittest.TestCase):
+    """Test the logger registry."""
+
+    def test_same_instance(self):
+        """Loggers are created once per name."""
+        self.assertIs(get_logger("tests.registry"), get_logger("tests.registry"))
+        self.assertIsNot(get_logger("tests.registry"), get_logger("tests.other"))
+
+    def test_single_queue_handler(self):
+        """Each named logger has exactly one handler, the shared queue handler."""
+        get_logger("tests.handlers")
+        logger_module.Logger("tests.handlers")
+        handlers = logging.getLogger("tests.handlers").handlers
+        self.assertEqual(len(handlers), 1)
+        self.assertIsInstance(handlers[0], logging.handlers.QueueHandler)
+        self.assertIs(handlers[0], logger_module.configure_logging())
+
+class TestRateLimiter(unittest.TestCase):
+    """Test rate limited logging."""
+
+    def test_window(self):
+        """At most limit messages per second pass; the drop count is reported once."""
+        now = [0.0]
+        limiter = RateLimiter(clock=lambda: now[0])
+        self.assertEqual([limiter.allow("k", 2) for _ in range(4)], [(True, 0), (True, 0), (False, 0), (False, 0)])
+        self.assertEqual(limiter.allow("other", 2), (True, 0))
+        now[0] = 1.5
+        self.assertEqual(limiter.allow("k", 2), (True, 2))
+        self.assertEqual(limiter.allow("k", 2), (True, 0))
+
+    def test_logger_rate_limit(self):
+        """Rate limited calls from one call site are dropped, with a summary line."""
+        logger = get_logger("tests.rate_limit")
+        now = [0.0]
+        with mock.patch("utils.logger._rate_limiter", RateLimiter(clock=lambda: now[0])):
+            with mock.patch.object(logger.logger, "log") as log:
+                for i in range(6):
+                    if i == 5:
+                        now[0] = 2.0
+                    logger.info(f"loaded {i}", rate_limit=1)
+
+        messages = [call.args[1] for call in log.call_args_list]
+        self.assertEqual(messages[0], "loaded 0")
+        self.assertTrue(messages[1].startswith("Suppressed 4 messages from"))
+        self.assertEqual(messages[2], "loaded 5")
+
+class TestRotatingLogFileHandler(unittest.TestCase):
+    """Test log rotation and background compression."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _handler(self, **kwargs):
+        handler = RotatingLogFileHandler(self.tmp_dir.name, prefix="test", **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.addCleanup(handler.close)
+        return handler
+
+    def _record(self, message):
+        return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+    def test_size_rollover(self):
+        """Files over max_bytes are rolled over, compressed and pruned."""
+        handler = self._handler(max_bytes=100, backup_count=2)
+        for i in range(4):
+            handler.emit(self._record(f"{i}" * 150))
+        wait_for_log_compression()
+
+        names = sorted(os.listdir(self.tmp_dir.name))
+        self.assertEqual(len([name for name in names if name.endswith(".log.gz")]), 2)
+        self.assertIn(f"test_{handler.day}.log", names)
+        with gzip.open(os.path.join(self.tmp_dir.name, f"test_{handler.day}.3.log.gz"), "rt") as f:
+            self.assertEqual(f.read(), "2" * 150 + "\n")
+
+    def test_daily_rollover(self):
+        """A new day starts a new file and compresses the previous one."""
+        handler = self._handler()
+        handler.emit(self._record("yesterday"))
+        handler.day = "20000101"
+        handler.emit(self._record("today"))
+        wait_for_log_compression()
+
+        self.assertIn("test_20000101.1.log.gz", os.listdir(self.tmp_dir.name))
+        with open(handler.baseFilename, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "today\n")
+
+    def test_leftover_files_compressed_on_start(self):
+        """Uncompressed files of earlier runs are compressed and count towards retention."""
+        for name, age in (("test_20000101.log.gz", 3), ("test_20000102.log", 2), ("test_20000103.2.log", 1)):
+            path = os.path.join(self.tmp_dir.name, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(name)
+            stamp = time.time() - age * 86400
+            os.utime(path, (stamp, stamp))
+
+        handler = self._handler(backup_count=2)
+        wait_for_log_compression()
+
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), [
+            "test_20000102.log.gz", "test_20000103.2.log.gz", os.path.basename(handler.baseFilename),
+        ])
+        with gzip.open(os.path.join(self.tmp_dir.name, "test_20000102.log.gz"), "rt") as f:
+            self.assertEqual(f.read(), "test_20000102.log")
+
+class TestStructuredLogging(unittest.TestCase):
+    """Test the JSON formatter and the user activity sink."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "activity.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _activity_record(self, user_id, action, details=None):
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, f"User Activity: {action}", None, None)
+        record.user_activity = {"user_id": user_id, "action": action, "timestamp": f"2025-01-01T00:00:0{len(user_id)}"}
+        if details:
+            record.user_activity["details"] = details
+        return record
+
+    def test_json_formatter(self):
+        """Structured extra data is kept in the JSON line."""
+        entry = json.loads(JsonFormatter().format(self._activity_record("u1", "login")))
+        self.assertEqual(entry["message"], "User Activity: login")
+        self.assertEqual(entry["user_activity"]["user_id"], "u1")
+
+    def test_activity_sink_batches(self):
+        """Activity is written once a batch is full and can be queried."""
+        handler = ActivitySinkHandler(self.db_path, batch_size=2, flush_interval=60)
+        try:
+            handler.handle(self._activity_record("u1", "login"))
+            handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, "plain", None, None))
+            self.assertEqual(query_user_activity(db_path=self.db_path), [])
+
+            handler.handle(self._activity_record("u22", "test_taken", {"result": "neuroempata"}))
+            rows = query_user_activity(db_path=self.db_path)
+            self.assertEqual([row["user_id"] for row in rows], ["u22", "u1"])
+            self.assertEqual(rows[0]["details"], {"result": "neuroempata"})
+            self.assertEqual(len(query_user_activity(action="login", db_path=self.db_path)), 1)
+        finally:
+            handler.close()
+
+class TestErrorAggregator(unittest.TestCase):
+    """Test the deduplicating error log."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp_dir.name, "errors.log")
+        self.aggregator = ErrorAggregator(self.log_file, flush_interval=0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _read_log(self):
+        with open(self.log_file, encoding="utf-8") as f:
+            return f.read()
+
+    def test_repeated_errors_are_summarized(self):
+        """Errors from one location are written once with a count."""
+        for i in range(50):
+            self.aggregator.record("JSONDecodeError", f"Failed to parse file {i}")
+        self.aggregator.record("FileLoadError", "Failed to load", 'File "loader.py", line 7, in load\n')
+
+        self.assertEqual(self.aggregator.flush(), 2)
+        log = self._read_log()
+        self.assertIn("(x50 since last report, 50 total", log)
+        self.assertIn("Failed to parse file 49", log)
+        self.assertIn("FileLoadError at loader.py:7", log)
+        self.assertEqual(self.aggregator.flush(), 0)
+
+    def test_errors_about_different_files_kept_apart(self):
+        """Errors from one location with different keys get their own summaries."""
+        for name in ("a.json", "b.json", "a.json"):
+            self.aggregator.record("JSONDecodeError", f"Failed to parse {name}", key=name)
+
+        self.assertEqual(self.aggregator.flush(), 2)
+        log = self._read_log()
+        self.assertIn("Failed to parse a.json", log)
+        self.assertIn("Failed to parse b.json", log)
+        self.assertIn("[b.json] (x1 since last report", log)
+
+    def test_stack_trace_written_once(self):
+        """Later reports of the same error omit the stack trace."""
+        trace = 'Traceback:\n  File "loader.py", line 7, in load\n'
+        self.aggregator.record("FileLoadError", "Failed to load", trace)
+        self.aggregator.flush()
+        self.aggregator.record("FileLoadError", "Failed to load", trace)
+        self.aggregator.flush()
+        self.assertEqual(self._read_log().count("Stack trace:"), 1)
+
+class TestQueuedExceptions(unittest.TestCase):
+    """Test exceptions passed through the logging queue."""
+
+    def _queued_record(self):
+        try:
+            raise ValueError("broken")
+        except ValueError:
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "Failed for %s", ("u1",), sys.exc_info())
+        return PipelineQueueHandler(None).prepare(record)
+
+    def test_json_exception_field(self):
+        """The traceback goes to "exception", not into the message."""
+        entry = json.loads(JsonFormatter().format(self._queued_record()))
+        self.assertEqual(entry["message"], "Failed for u1")
+        self.assertIn("ValueError: broken", entry["exception"])
+
+    def test_text_format_keeps_traceback(self):
+        """The text format still appends the traceback after the message."""
+        text = logging.Formatter("%(message)s").format(self._queued_record())
+        self.assertTrue(text.startswith("Failed for u1\nTraceback"))
+
+if __name__ == "__main__":
+    unittest.main()
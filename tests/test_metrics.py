@@ -0,0 +1,134 @@
+"""
+Unit tests for the metrics registry.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import urllib.request
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.metrics import (
+    MetricsRegistry, Histogram, timed, render_prometheus, start_metrics_server,
+    start_metrics_server_from_env
+)
+from utils.cache import FileCache
+from utils.error_handler import handle_error, UserDataError
+
+registry = MetricsRegistry(enabled=True)
+
+@handle_error
+def failing_operation():
+    """Raise a handled error."""
+    raise UserDataError("broken")
+
+@timed
+def plain_operation(value):
+    """Return the value."""
+    return value
+
+class TestMetrics(unittest.TestCase):
+    """Test metric recording."""
+
+    def setUp(self):
+        registry.reset()
+        registry.enabled = True
+        for target in ("utils.error_handler.metrics", "utils.metrics._registry", "utils.cache.metrics"):
+            patcher = mock.patch(target, registry)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def counters(self):
+        return {(name, tuple(sorted(labels.items()))): value for name, labels, value in registry.snapshot()["counters"]}
+
+    def test_histogram_buckets(self):
+        """Values land in the first bucket whose bound is not below them."""
+        histogram = Histogram(bounds=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.snapshot()["buckets"], [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+
+    def test_handle_error_records_calls_and_exceptions(self):
+        """handle_error records calls, latency and handled exceptions."""
+        with mock.patch("utils.error_handler.display_error"):
+            self.assertIsNone(failing_operation())
+            failing_operation()
+
+        name = "test_metrics.failing_operation"
+        counters = self.counters()
+        self.assertEqual(counters[("function_calls_total", (("function", name),))], 2)
+        self.assertEqual(counters[("function_exceptions_total", (("exception", "UserDataError"), ("function", name)))], 2)
+        histograms = {labels["function"]: data for _, labels, data in registry.snapshot()["histograms"]}
+        self.assertEqual(histograms[name]["count"], 2)
+        self.assertEqual(failing_operation.__name__, "failing_operation")
+
+    def test_disabled(self):
+        """Nothing is recorded while metrics are disabled."""
+        registry.enabled = False
+        self.assertEqual(plain_operation(3), 3)
+        self.assertEqual(registry.snapshot(), {"counters": [], "histograms": []})
+
+    def test_cache_hits_and_misses(self):
+        """The file cache counts hits, misses and content loads."""
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("content")
+        self.addCleanup(os.remove, f.name)
+
+        cache = FileCache(name="test")
+        for _ in range(3):
+            cache.get(f.name, lambda path: "parsed")
+
+        counters = self.counters()
+        self.assertEqual(counters[("cache_misses_total", (("cache", "test"),))], 1)
+        self.assertEqual(counters[("cache_hits_total", (("cache", "test"),))], 2)
+        self.assertEqual(counters[("content_loads_total", (("cache", "test"), ("result", "ok")))], 1)
+
+    def test_render_prometheus(self):
+        """Counters and cumulative histogram buckets use the text exposition format."""
+        registry.increment("test_submissions_total", test_type="neuroleader_type")
+        registry.observe("page_rerun_seconds", 0.002, page='Typy "Neurolidera"')
+        registry.observe("page_rerun_seconds", 10.0, page='Typy "Neurolidera"')
+
+        text = render_prometheus(registry)
+        self.assertIn("# TYPE brainventure_test_submissions_total counter\n", text)
+        self.assertIn('brainventure_test_submissions_total{test_type="neuroleader_type"} 1\n', text)
+        self.assertIn("# TYPE brainventure_page_rerun_seconds histogram\n", text)
+        self.assertIn('brainventure_page_rerun_seconds_bucket{page="Typy \\"Neurolidera\\"",le="0.001"} 0\n', text)
+        self.assertIn('brainventure_page_rerun_seconds_bucket{page="Typy \\"Neurolidera\\"",le="0.0025"} 1\n', text)
+        self.assertIn('brainventure_page_rerun_seconds_bucket{page="Typy \\"Neurolidera\\"",le="5.0"} 1\n', text)
+        self.assertIn('brainventure_page_rerun_seconds_bucket{page="Typy \\"Neurolidera\\"",le="+Inf"} 2\n', text)
+        self.assertIn('brainventure_page_rerun_seconds_count{page="Typy \\"Neurolidera\\""} 2\n', text)
+
+    def test_metrics_server(self):
+        """The HTTP server serves the shared registry on /metrics."""
+        registry.increment("user_store_reads_total", result="found")
+        with mock.patch("utils.metrics._server", None):
+            server = start_metrics_server(0)
+            self.addCleanup(server.server_close)
+            self.addCleanup(server.shutdown)
+            self.assertIs(start_metrics_server(0), server)
+
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+                body = response.read().decode("utf-8")
+        self.assertIn('brainventure_user_store_reads_total{result="found"} 1', body)
+
+    def test_metrics_server_bind_failure_not_retried(self):
+        """After a failed bind the server is not started again on later reruns."""
+        with mock.patch("utils.metrics._server", None), mock.patch("utils.metrics._server_failed", False), \
+                mock.patch("utils.metrics.ThreadingHTTPServer", side_effect=OSError("Address already in use")) as server_class, \
+                mock.patch.dict(os.environ, {"BRAINVENTURE_METRICS_PORT": "9464"}), \
+                mock.patch("builtins.print"):
+            self.assertIsNone(start_metrics_server_from_env())
+            self.assertIsNone(start_metrics_server_from_env())
+            self.assertIsNone(start_metrics_server(9464))
+        self.assertEqual(server_class.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Unit tests for the rerun profiler.
+"""
+
+import unittest
+import sys
+import os
+import cProfile
+import pstats
+import tempfile
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import profiler as profiler_module
+from utils.profiler import (
+    RerunProfiler, Phase, profile_phase, profiled, collapsed_stacks, save_profile_capture
+)
+
+@profiled("content load")
+def load_content():
+    """Return a constant."""
+    return 42
+
+class TestRerunProfiler(unittest.TestCase):
+    """Test phase recording and totals."""
+
+    def tearDown(self):
+        profiler_module._local.profiler = None
+
+    def test_phases_recorded_only_when_active(self):
+        """Phase markers record nothing without an active profiler."""
+        self.assertEqual(load_content(), 42)
+
+        profiler = profiler_module._local.profiler = RerunProfiler("Test")
+        with profile_phase("sidebar_navigation"):
+            load_content()
+        load_content()
+
+        self.assertEqual(
+            [(phase.name, phase.depth) for phase in profiler.phases],
+            [("content load", 1), ("sidebar_navigation", 0), ("content load", 0)],
+        )
+
+    def test_totals_exclude_nested_time(self):
+        """Nested phases are not counted twice; the rest is rendering time."""
+        profiler = RerunProfiler("Test")
+        profiler.phases = [
+            Phase("content load", 0.02, 0.03, 1),
+            Phase("sidebar_navigation", 0.01, 0.05, 0),
+            Phase("content load", 0.07, 0.01, 0),
+        ]
+        profiler.total = 0.1
+        totals = {name: (round(seconds, 3), calls) for name, seconds, calls in profiler.totals()}
+        self.assertEqual(totals, {
+            "sidebar_navigation": (0.02, 1),
+            "content load": (0.04, 2),
+            "rendering": (0.04, 1),
+        })
+
+def busy_leaf():
+    """Burn a little CPU."""
+    return sum(i * i for i in range(20000))
+
+def busy_root():
+    """Call the leaf."""
+    return busy_leaf()
+
+class TestProfileCapture(unittest.TestCase):
+    """Test cProfile captures."""
+
+    def _profile(self):
+        profile = cProfile.Profile()
+        profile.enable()
+        busy_root()
+        profile.disable()
+        return profile
+
+    def test_collapsed_stacks(self):
+        """Own time is attributed to the stack of the most expensive callers."""
+        lines = collapsed_stacks(pstats.Stats(self._profile()))
+        stacks = [line.rsplit(" ", 1)[0] for line in lines]
+        self.assertTrue(any(stack.endswith("test_profiler.py:busy_root;test_profiler.py:busy_leaf") for stack in stacks))
+        self.assertTrue(all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines))
+
+    def test_keeps_last_captures(self):
+        """Only the newest captures are kept."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with mock.patch.dict(profiler_module.PROFILE_CAPTURE, {"dir": tmp_dir, "keep": 2}):
+                paths = [save_profile_capture(self._profile(), "Struktura Kursu") for _ in range(3)]
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)),
+                sorted(os.path.basename(path[:-5]) + suffix for path in paths[1:] for suffix in (".prof", ".collapsed.txt")),
+            )
+
+class TestConcurrentCapture(unittest.TestCase):
+    """Test that concurrent reruns don't start a second cProfile profiler."""
+
+    def test_capture_skipped_while_another_is_active(self):
+        """A rerun skips the capture while another one holds the capture lock."""
+        page_main = profiler_module.profiled_page("Test")(lambda: "rendered")
+        with mock.patch.object(profiler_module, "is_debug_mode", return_value=False), \
+                mock.patch.object(profiler_module, "is_capture_requested", return_value=True), \
+                mock.patch.object(profiler_module, "warm_up"), \
+                mock.patch.object(profiler_module, "save_profile_capture") as save_capture:
+            with profiler_module._capture_lock:
+                self.assertEqual(page_main(), "rendered")
+            save_capture.assert_not_called()
+
+            self.assertEqual(page_main(), "rendered")
+            save_capture.assert_called_once()
+        self.assertFalse(profiler_module._capture_lock.locked())
+
+class TestQueryParameterSwitches(unittest.TestCase):
+    """Test that visitors can only enable debug and capture modes in development."""
+
+    def _streamlit(self, **query_params):
+        fake_st = mock.Mock()
+        fake_st.query_params = query_params
+        fake_st.session_state = {}
+        return fake_st
+
+    def test_ignored_outside_dev_mode(self):
+        """?debug=1 and ?profile=1 do nothing without BRAINVENTURE_DEV=1."""
+        fake_st = self._streamlit(debug="1", profile="1")
+        with mock.patch.object(profiler_module, "st", fake_st), \
+                mock.patch.object(profiler_module, "DEV_MODE", False), \
+                mock.patch.dict(profiler_module.PROFILE_CAPTURE, {"enabled": False}):
+            self.assertFalse(profiler_module.is_debug_mode())
+            self.assertFalse(profiler_module.is_capture_requested())
+        self.assertNotIn("debug_mode", fake_st.session_state)
+
+    def test_enabled_in_dev_mode(self):
+        """In development the query parameters switch the modes on."""
+        fake_st = self._streamlit(debug="1", profile="1")
+        with mock.patch.object(profiler_module, "st", fake_st), \
+                mock.patch.object(profiler_module, "DEV_MODE", True):
+            self.assertTrue(profiler_module.is_debug_mode())
+            self.assertTrue(profiler_module.is_capture_requested())
+        self.assertTrue(fake_st.session_state["debug_mode"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for course progress tracking.
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config.course_index import LessonIndex
+from utils import progress as progress_module
+from utils.progress import ProgressTracker, CompletionBitmap, aggregate_completion, get_progress_tracker
+
+COURSE = [
+    {"title": "Blok A", "modules": [
+        {"title": "Moduł A1", "lessons": [{"title": "L1"}, {"title": "L2"}]},
+        {"title": "Moduł A2", "lessons": [{"title": "L3"}, {"title": "L4"}]},
+    ]},
+    {"title": "Blok B", "modules": [
+        {"title": "Moduł B1", "lessons": [{"title": "L5"}, {"title": "L6"}, {"title": "L7"}, {"title": "L8"}]},
+    ]},
+]
+
+class TestProgressTracker(unittest.TestCase):
+    """Test incremental progress counters."""
+
+    def setUp(self):
+        self.index = LessonIndex(COURSE)
+
+    def test_initial_counts(self):
+        """Counters reflect the completed lessons passed at build time."""
+        tracker = ProgressTracker(self.index, ["b1_m1_l1", "b2_m1_l2", "unknown"])
+        self.assertEqual(tracker.completed_count, 2)
+        self.assertEqual(tracker.block_counts(0), (1, 4))
+        self.assertEqual(tracker.module_counts(0, 1), (0, 2))
+        self.assertEqual(tracker.overall_percent(), 25)
+
+    def test_mark_completed_is_incremental(self):
+        """Marking a lesson updates counters once."""
+        tracker = ProgressTracker(self.index)
+        self.assertTrue(tracker.mark_completed("b1_m2_l1"))
+        self.assertFalse(tracker.mark_completed("b1_m2_l1"))
+        self.assertEqual(tracker.module_counts(0, 1), (1, 2))
+        self.assertEqual(tracker.block_percent(0), 25)
+        self.assertEqual(tracker.block_percent(1), 0)
+
+    def test_next_lesson(self):
+        """The next lesson is the first one not yet completed."""
+        tracker = ProgressTracker(self.index, ["b1_m1_l2"])
+        self.assertEqual(tracker.next_lesson().id, "b1_m1_l1")
+        tracker.mark_completed("b1_m1_l1")
+        self.assertEqual(tracker.next_lesson().id, "b1_m2_l1")
+        for lesson in self.index.lessons:
+            tracker.mark_completed(lesson.id)
+        self.assertIsNone(tracker.next_lesson())
+
+    def test_tracker_cache_is_bounded(self):
+        """Only the most recently used users keep a cached tracker."""
+        with mock.patch.object(progress_module, "TRACKER_CACHE_LIMIT", 2), \
+                mock.patch.object(progress_module, "_trackers", progress_module.OrderedDict()), \
+                mock.patch.object(progress_module, "get_lesson_index", return_value=self.index):
+            for user_id in ("u1", "u2", "u3"):
+                get_progress_tracker(user_id, {"progress": {"completed_lessons": []}})
+            get_progress_tracker("u2")
+            self.assertEqual(list(progress_module._trackers), ["u3", "u2"])
+
+class TestCompletionBitmap(unittest.TestCase):
+    """Test the completed lessons bitmap."""
+
+    def setUp(self):
+        self.index = LessonIndex(COURSE)
+
+    def test_legacy_round_trip(self):
+        """The legacy list converts to a bitmap and back in course order."""
+        bitmap = CompletionBitmap.from_lessons(self.index, ["b2_m1_l1", "b1_m1_l2", "unknown"])
+        self.assertIn("b1_m1_l2", bitmap)
+        self.assertNotIn("b1_m1_l1", bitmap)
+        self.assertEqual(bitmap.to_lessons(), ["b1_m1_l2", "b2_m1_l1"])
+
+    def test_bytes_round_trip(self):
+        """The serialized bitmap uses one byte per eight lessons."""
+        bitmap = CompletionBitmap.from_lessons(self.index, ["b1_m1_l1", "b2_m1_l4"])
+        data = bitmap.to_bytes()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(CompletionBitmap.from_bytes(self.index, data).to_lessons(), ["b1_m1_l1", "b2_m1_l4"])
+
+    def test_range_counts(self):
+        """Counts over block and module ranges are popcounts of bit slices."""
+        bitmap = CompletionBitmap.from_lessons(self.index, ["b1_m2_l1", "b1_m2_l2", "b2_m1_l3"])
+        self.assertEqual(bitmap.count(), 3)
+        self.assertEqual(bitmap.count(self.index.block_range(0)), 2)
+        self.assertEqual(bitmap.count(self.index.module_range(0, 0)), 0)
+        self.assertEqual(bitmap.count(self.index.block_range(1)), 1)
+
+    def test_aggregate_completion(self):
+        """Cohort aggregation counts completions per lesson and block."""
+        bitmaps = [
+            CompletionBitmap.from_lessons(self.index, ["b1_m1_l1", "b1_m1_l2"]),
+            CompletionBitmap.from_lessons(self.index, ["b1_m1_l1"]).bits,
+        ]
+        summary = aggregate_completion(self.index, bitmaps)
+        self.assertEqual(summary["users"], 2)
+        self.assertEqual(summary["lesson_counts"][:3], [2, 1, 0])
+        self.assertEqual(summary["block_percent"], [37.5, 0])
+
+if __name__ == "__main__":
+    unittest.main()
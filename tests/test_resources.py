@@ -0,0 +1,51 @@
+"""
+Unit tests for resource filtering.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.resources import filter_resources
+
+ARTICLES = [
+    {"id": "a1", "title": "Mózg lidera", "summary": "Struktura", "category": "Neurobiologia",
+     "tags": ["mózg"], "published_date": "2025-05-01", "views": 10},
+    {"id": "a2", "title": "Zarządzanie stresem", "summary": "Techniki", "category": "Przywództwo",
+     "tags": ["stres"], "published_date": "2025-05-15", "views": 30},
+    {"id": "a3", "title": "Amygdala", "summary": "Reakcja na STRES", "category": "Neurobiologia",
+     "tags": [], "published_date": "2025-04-01", "views": 20},
+]
+
+RESEARCH = [
+    {"id": "r1", "title": "Badanie", "authors": ["Anna Kowalska", "Jan Nowak"], "tags": [], "published_date": "2024-01-01"},
+    {"id": "r2", "title": "Analiza", "authors": ["Ewa Zielińska"], "tags": [], "published_date": "2023-01-01"},
+]
+
+class TestFilterResources(unittest.TestCase):
+    """Test the Resources page filters."""
+
+    def ids(self, items):
+        return [item["id"] for item in items]
+
+    def test_sort_orders(self):
+        """Each sorting method orders articles by its key."""
+        self.assertEqual(self.ids(filter_resources(ARTICLES, "articles")), ["a2", "a1", "a3"])
+        self.assertEqual(self.ids(filter_resources(ARTICLES, "articles", sort_by="Najpopularniejsze")), ["a2", "a3", "a1"])
+        self.assertEqual(self.ids(filter_resources(ARTICLES, "articles", sort_by="Alfabetycznie")), ["a3", "a1", "a2"])
+
+    def test_search_and_category(self):
+        """Search is case-insensitive over text fields and tags, then the category is applied."""
+        self.assertEqual(self.ids(filter_resources(ARTICLES, "articles", "stres")), ["a2", "a3"])
+        self.assertEqual(self.ids(filter_resources(ARTICLES, "articles", "stres", "Neurobiologia")), ["a3"])
+        self.assertEqual(filter_resources(ARTICLES, "articles", "brak"), [])
+
+    def test_search_list_fields(self):
+        """Research authors are searched as text."""
+        self.assertEqual(self.ids(filter_resources(RESEARCH, "research", "nowak")), ["r1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Unit tests for the page cold-start report and budgets.
+"""
+
+import unittest
+import sys
+import os
+import importlib.util
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.load_test import PAGES
+from benchmarks.startup import parse_importtime, budget_for, measure_pages, STARTUP_BUDGETS
+
+APP_DEPENDENCIES = ("streamlit", "pandas", "numpy", "plotly")
+
+class TestImportTimeParsing(unittest.TestCase):
+    """Test parsing of -X importtime output."""
+
+    def test_parse_importtime(self):
+        """Entries keep their nesting depth; other lines are ignored."""
+        lines = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     numpy._core",
+            "import time:      1500 |       1620 |   numpy",
+            "import time:        80 |         80 | pandas",
+            "Traceback (most recent call last):",
+        ]
+        entries = parse_importtime(lines)
+        self.assertEqual([entry[0] for entry in entries], ["numpy._core", "numpy", "pandas"])
+        self.assertEqual([entry[3] for entry in entries], [2, 1, 0])
+        self.assertAlmostEqual(entries[1][2], 0.00162)
+
+    def test_budget_for(self):
+        """Pages without their own budget use the default."""
+        self.assertEqual(budget_for("Nieznana strona"), STARTUP_BUDGETS["default"])
+
+@unittest.skipUnless(all(importlib.util.find_spec(name) for name in APP_DEPENDENCIES),
+                     "application dependencies not installed")
+class TestStartupBudgets(unittest.TestCase):
+    """Test that every page starts within its cold-start budget."""
+
+    def test_pages_within_budget(self):
+        """Cold first run of each page in a fresh interpreter stays within budget."""
+        results = measure_pages()
+        self.assertEqual(set(results), set(PAGES))
+        for page, result in results.items():
+            with self.subTest(page=page):
+                self.assertLessEqual(result["first_run"], result["budget"],
+                                     f"{page} imports: {result['heaviest_imports']}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,425 @@
+"""
+Unit tests for user data storage.
+"""
+
+import unittest
+import sys
+import os
+import copy
+import json
+import tempfile
+import threading
+from unittest import mock
+
+from streamlit.runtime.scriptrunner import RerunException
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.user_store import UserStore, JsonUserStore, SQLiteUserStore, migrate_json_to_sqlite
+from utils.helpers import (
+    load_user_data, save_user_data, award_achievement, user_data_transaction, record_progress_event
+)
+from utils import error_handler, user_session
+from utils.user_session import get_user_session
+from utils.error_handler import safe_save_json, safe_load_json, safe_load_json_with_status
+from utils.event_log import ProgressEventLog, apply_events, EVENT_LESSON_COMPLETED, EVENT_TEST_TAKEN
+
+SAMPLE_USER = {
+    "user_id": "u1",
+    "created_at": "2025-05-26T22:13:38",
+    "updated_at": "2025-05-27T00:20:25",
+    "profile": {"display_name": "Anna", "email": "anna@example.com", "bio": "", "avatar": None},
+    "progress": {
+        "completed_lessons": ["b1_m1_l1", "b1_m1_l2"],
+        "last_activity": None,
+        "tests_taken": [{"test_type": "neuroleader_type", "result": "neuroempata", "date": "26-05-2025"}],
+        "neuroleader_type": "neuroempata",
+    },
+    "preferences": {"theme": "light", "notifications_enabled": True, "email_updates": False},
+    "achievements": [{
+        "id": "pierwszy-krok", "name": "Pierwszy Krok", "description": "Opis",
+        "icon": "📚", "earned_at": "26-05-2025",
+    }],
+    "settings": {"notifications": {"new_content": True}},
+}
+
+class TestSQLiteUserStore(unittest.TestCase):
+    """Test the SQLite user store."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = SQLiteUserStore(os.path.join(self.tmp_dir.name, "users.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """A saved document loads back unchanged, including unknown keys."""
+        self.assertTrue(self.store.save("u1", SAMPLE_USER))
+        self.assertEqual(self.store.load("u1"), SAMPLE_USER)
+        self.assertEqual(self.store.list_users(), ["u1"])
+
+    def test_missing_user(self):
+        """Loading an unknown user returns None."""
+        self.assertIsNone(self.store.load("nobody"))
+
+    def test_list_updates(self):
+        """Appended and removed list entries are persisted."""
+        user = copy.deepcopy(SAMPLE_USER)
+        self.store.save("u1", user)
+        user["progress"]["completed_lessons"].append("b1_m1_l3")
+        user["progress"]["tests_taken"] = []
+        self.store.save("u1", user)
+        loaded = self.store.load("u1")
+        self.assertEqual(loaded["progress"]["completed_lessons"], ["b1_m1_l1", "b1_m1_l2", "b1_m1_l3"])
+        self.assertEqual(loaded["progress"]["tests_taken"], [])
+
+    def test_wal_mode(self):
+        """The database runs in WAL mode."""
+        mode = self.store._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+class TestMigration(unittest.TestCase):
+    """Test migrating JSON user files to SQLite."""
+
+    def test_migrate_json_files(self):
+        """All JSON users are imported into the database."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            user_files_dir = os.path.join(tmp_dir, "user_files")
+            JsonUserStore(user_files_dir).save("u1", SAMPLE_USER)
+            db_path = os.path.join(tmp_dir, "users.db")
+
+            migrated, failed = migrate_json_to_sqlite(user_files_dir, db_path)
+
+            self.assertEqual((migrated, failed), (1, []))
+            store = SQLiteUserStore(db_path)
+            self.assertEqual(store.load("u1"), SAMPLE_USER)
+            store.close()
+
+class CountingStore(UserStore):
+    """In-memory user store that counts reads and writes."""
+
+    def __init__(self, documents=None):
+        self.documents = documents or {}
+        self.loads = 0
+        self.saves = 0
+
+    def load(self, user_id):
+        self.loads += 1
+        return copy.deepcopy(self.documents.get(user_id))
+
+    def save(self, user_id, user_data):
+        self.saves += 1
+        self.documents[user_id] = copy.deepcopy(user_data)
+        return True
+
+class TestUserDataTransaction(unittest.TestCase):
+    """Test deferred user data writes."""
+
+    def setUp(self):
+        self.store = CountingStore({"u1": copy.deepcopy(SAMPLE_USER)})
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.event_log = ProgressEventLog(os.path.join(tmp_dir.name, "events"), compaction_threshold=3, retain_events=1)
+        for target, value in (("get_user_store", self.store), ("get_progress_event_log", self.event_log)):
+            patcher = mock.patch(f"utils.helpers.{target}", return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _session(self):
+        """Start a session cache, as a Streamlit session has one across reruns."""
+        session = get_user_session()
+        self.addCleanup(setattr, user_session._local, "session", None)
+        return session
+
+    def test_single_write(self):
+        """Nested saves inside a transaction write the document once."""
+        with user_data_transaction("u1") as user_data:
+            user_data["progress"]["completed_lessons"].append("b1_m1_l3")
+            save_user_data(user_data, "u1")
+            award_achievement("u1", "Nowe Osiągnięcie", "Opis", "🏅")
+            self.assertEqual(self.store.saves, 0)
+
+        # One load for the transaction, one for the version check of the write
+        self.assertEqual(self.store.loads, 2)
+        self.assertEqual(self.store.saves, 1)
+        saved = self.store.documents["u1"]
+        self.assertIn("b1_m1_l3", saved["progress"]["completed_lessons"])
+        self.assertEqual(len(saved["achievements"]), 2)
+
+    def test_flush_on_rerun(self):
+        """Changes are written if the block ends with st.rerun()."""
+        with self.assertRaises(RerunException):
+            with user_data_transaction("u1") as user_data:
+                user_data["profile"]["bio"] = "Bio"
+                save_user_data(user_data, "u1")
+                raise RerunException(None)
+
+        self.assertEqual(self.store.saves, 1)
+        self.assertEqual(self.store.documents["u1"]["profile"]["bio"], "Bio")
+
+    def test_discard_on_error(self):
+        """Changes are dropped, not written, if the block fails."""
+        session = self._session()
+        with self.assertRaises(RuntimeError):
+            with user_data_transaction("u1") as user_data:
+                user_data["profile"]["bio"] = "Bio"
+                save_user_data(user_data, "u1")
+                raise RuntimeError("failed")
+
+        self.assertEqual(self.store.saves, 0)
+        self.assertNotIn("u1", session.documents)
+        self.assertNotEqual(load_user_data("u1")["profile"]["bio"], "Bio")
+
+    def test_cached_document_revalidated(self):
+        """A session reuses its document until another session changes the stored one."""
+        store = JsonUserStore(self.tmp_dir)
+        store.save("u1", copy.deepcopy(SAMPLE_USER))
+        self._session()
+        with mock.patch("utils.helpers.get_user_store", return_value=store):
+            user_data = load_user_data("u1")
+            self.assertIs(load_user_data("u1"), user_data)
+
+            # Another session appends an event, then saves the document
+            self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b2_m1_l1"})
+            reloaded = load_user_data("u1")
+            self.assertIsNot(reloaded, user_data)
+            self.assertIn("b2_m1_l1", reloaded["progress"]["completed_lessons"])
+
+            other = copy.deepcopy(reloaded)
+            other["profile"]["bio"] = "Other session"
+            other["updated_at"] = "2030-01-01T00:00:00"
+            store.save("u1", other)
+            self.assertEqual(load_user_data("u1")["profile"]["bio"], "Other session")
+
+    def test_no_cache_outside_transaction(self):
+        """Outside a Streamlit session every call goes to the store."""
+        load_user_data("u1")
+        load_user_data("u1")
+        self.assertEqual(self.store.loads, 2)
+
+    def test_events_folded_on_load(self):
+        """Recorded events are appended to the log and folded into loaded data."""
+        record_progress_event("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l3"})
+        record_progress_event("u1", EVENT_TEST_TAKEN, {"test_type": "neuroleader_type", "result": "neuroreaktor"})
+        self.assertEqual(self.store.saves, 0)
+
+        user_data = load_user_data("u1")
+        self.assertEqual(user_data["event_seq"], 2)
+        self.assertEqual(user_data["progress"]["completed_lessons"][-1], "b1_m1_l3")
+        self.assertEqual(user_data["progress"]["neuroleader_type"], "neuroreaktor")
+        self.assertEqual(len(user_data["progress"]["tests_taken"]), 2)
+
+    def test_compaction(self):
+        """Past the threshold the snapshot is saved and folded events are dropped."""
+        for position in range(4):
+            record_progress_event("u1", EVENT_LESSON_COMPLETED, {"lesson_id": f"b2_m1_l{position + 1}"})
+
+        self.assertEqual(self.store.saves, 1)
+        self.assertEqual(self.store.documents["u1"]["event_seq"], 4)
+        self.assertEqual([event["seq"] for event in self.event_log.read("u1")], [4])
+
+        # Folded events kept for the timeline are not applied twice
+        user_data = load_user_data("u1")
+        self.assertEqual(len(user_data["progress"]["completed_lessons"]), 6)
+        record_progress_event("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b3_m1_l1"})
+        self.assertEqual(self.event_log.read("u1")[-1]["seq"], 5)
+
+    def test_save_folds_events_from_other_sessions(self):
+        """Events appended after the document was loaded are folded in before writing."""
+        user_data = load_user_data("u1")
+        self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b2_m1_l1"})
+        user_data["profile"]["bio"] = "Bio"
+        self.assertTrue(save_user_data(user_data, "u1"))
+
+        saved = self.store.documents["u1"]
+        self.assertEqual(saved["event_seq"], 1)
+        self.assertIn("b2_m1_l1", saved["progress"]["completed_lessons"])
+        self.assertEqual(saved["profile"]["bio"], "Bio")
+
+    def test_save_refuses_to_overwrite_newer_snapshot(self):
+        """A document loaded before another session's compaction is not written over its snapshot."""
+        user_data = load_user_data("u1")
+        for position in range(4):
+            record_progress_event("u1", EVENT_LESSON_COMPLETED, {"lesson_id": f"b2_m1_l{position + 1}"})
+        snapshot = copy.deepcopy(self.store.documents["u1"])
+
+        user_data["profile"]["bio"] = "Bio"
+        self.assertFalse(save_user_data(user_data, "u1"))
+        self.assertEqual(self.store.documents["u1"], snapshot)
+        self.assertEqual(len(load_user_data("u1")["progress"]["completed_lessons"]), 6)
+
+class TestProgressEventLog(unittest.TestCase):
+    """Test the append-only progress event log."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.event_log = ProgressEventLog(self.tmp_dir.name, compaction_threshold=10, retain_events=0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_skip_malformed_line(self):
+        """A partially written last line is ignored."""
+        self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l1"})
+        with open(os.path.join(self.tmp_dir.name, "u1.jsonl"), "a", encoding="utf-8") as f:
+            f.write('{"seq": 2, "ty')
+        self.assertEqual(len(self.event_log.read("u1")), 1)
+
+    def test_two_logs_share_sequence(self):
+        """Logs writing the same user (e.g. two processes) never reuse a sequence number."""
+        other_log = ProgressEventLog(self.tmp_dir.name, compaction_threshold=10, retain_events=0)
+        self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l1"})
+        other_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l2"})
+        self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l3"})
+        events = self.event_log.read("u1")
+        self.assertEqual([event["seq"] for event in events], [1, 2, 3])
+
+        user_data = {"progress": {"completed_lessons": []}}
+        apply_events(user_data, events)
+        self.assertEqual(user_data["progress"]["completed_lessons"], ["b1_m1_l1", "b1_m1_l2", "b1_m1_l3"])
+
+    def test_append_after_partial_line(self):
+        """An append after a crashed one starts on a new line."""
+        self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l1"})
+        with open(os.path.join(self.tmp_dir.name, "u1.jsonl"), "a", encoding="utf-8") as f:
+            f.write('{"seq": 2, "ty')
+        self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l2"})
+        self.assertEqual([event["seq"] for event in self.event_log.read("u1")], [1, 2])
+
+    def test_compact_keeps_last_sequence(self):
+        """A fully folded log keeps its last event so numbering continues."""
+        for position in range(3):
+            self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": f"b1_m1_l{position + 1}"})
+        self.event_log.compact("u1", 3)
+        self.assertEqual(self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": "b1_m1_l4"})["seq"], 4)
+
+    def test_fold_respects_snapshot_seq(self):
+        """Events contained in the snapshot are not applied again."""
+        for lesson_id in ("b1_m1_l1", "b1_m1_l2"):
+            self.event_log.append("u1", EVENT_TEST_TAKEN, {"test_type": "other", "result": lesson_id})
+        user_data = {"event_seq": 1, "progress": {"tests_taken": []}}
+        self.assertEqual(apply_events(user_data, self.event_log.read("u1")), 1)
+        self.assertEqual(user_data["progress"]["tests_taken"], [{"test_type": "other", "result": "b1_m1_l2"}])
+
+    def test_compact_keeps_pending_events(self):
+        """Compaction only removes events folded into the snapshot."""
+        for position in range(3):
+            self.event_log.append("u1", EVENT_LESSON_COMPLETED, {"lesson_id": f"b1_m1_l{position + 1}"})
+        self.assertEqual(self.event_log.compact("u1", 2), 2)
+        self.assertEqual([event["seq"] for event in self.event_log.read("u1")], [3])
+
+class TestSafeSaveJson(unittest.TestCase):
+    """Test atomic JSON writes."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "user.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_failed_write_keeps_previous_file(self):
+        """A document that can't be serialized leaves the old file intact."""
+        self.assertTrue(safe_save_json({"a": 1}, self.path))
+        self.assertFalse(safe_save_json({"a": object()}, self.path))
+        self.assertEqual(safe_load_json(self.path), {"a": 1})
+        self.assertFalse([name for name in os.listdir(self.tmp_dir.name) if name.endswith(".tmp")])
+
+    def test_no_lock_file_per_document(self):
+        """Writers share a fixed set of lock files per directory."""
+        for user_id in range(50):
+            safe_save_json({"a": user_id}, os.path.join(self.tmp_dir.name, f"user_{user_id}.json"))
+        lock_files = [name for name in os.listdir(self.tmp_dir.name) if name.endswith(".lock")]
+        self.assertGreater(len(lock_files), 1)
+        self.assertLessEqual(len(lock_files), error_handler.LOCK_STRIPES)
+        with error_handler.locked_file(self.path), error_handler.locked_file(self.path):
+            pass
+
+    def test_files_on_other_stripes_not_blocked(self):
+        """Holding one file's lock doesn't block writers of a file on another stripe."""
+        other = next(
+            path for path in (os.path.join(self.tmp_dir.name, f"other_{i}.json") for i in range(100))
+            if error_handler._lock_path(path) != error_handler._lock_path(self.path)
+        )
+        saved = []
+        with error_handler.locked_file(self.path):
+            writer = threading.Thread(target=lambda: saved.append(safe_save_json({"a": 1}, other)))
+            writer.start()
+            writer.join(timeout=5)
+            self.assertEqual(saved, [True])
+
+    @unittest.skipUnless(os.name == "posix", "POSIX file modes")
+    def test_rewrite_keeps_file_mode(self):
+        """Rewritten files keep their mode; new files get the umask default."""
+        safe_save_json({"a": 1}, self.path)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o666 & ~error_handler._UMASK)
+        os.chmod(self.path, 0o640)
+        safe_save_json({"a": 2}, self.path)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+    def test_load_falls_back_to_last_good_version(self):
+        """A malformed file returns its last good version, marked stale, with backoff."""
+        safe_save_json({"a": 1}, self.path)
+        self.assertEqual(safe_load_json_with_status(self.path), ({"a": 1}, False))
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"a": ')
+        with mock.patch("utils.error_handler.log_error_to_file") as log_error:
+            self.assertEqual(safe_load_json_with_status(self.path), ({"a": 1}, True))
+            self.assertEqual(safe_load_json(self.path), {"a": 1})
+        # The second call is served from the fallback without parsing again
+        self.assertEqual(log_error.call_count, 1)
+
+        safe_save_json({"a": 2}, self.path)
+        self.assertEqual(safe_load_json_with_status(self.path), ({"a": 2}, False))
+
+    def test_fallback_cache_is_bounded(self):
+        """Only the most recently loaded paths keep a fallback."""
+        with mock.patch.object(error_handler, "JSON_FALLBACK_LIMIT", 2), \
+                mock.patch.object(error_handler, "_last_good_json", error_handler.OrderedDict()):
+            paths = [os.path.join(self.tmp_dir.name, f"user_{i}.json") for i in range(3)]
+            for i, path in enumerate(paths):
+                safe_save_json({"a": i}, path)
+                safe_load_json(path)
+            self.assertEqual(list(error_handler._last_good_json),
+                             [os.path.abspath(path) for path in paths[1:]])
+
+    def test_concurrent_writers(self):
+        """Concurrent writes always leave a complete document."""
+        def write(worker):
+            for i in range(20):
+                safe_save_json({"worker": worker, "items": list(range(i * 50))}, self.path)
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertIn(json.load(f)["worker"], range(4))
+
+    def test_batch_fsync_policy(self):
+        """In batch mode writes are flushed later by sync_pending_writes."""
+        with mock.patch.dict("config.app_config.STORAGE_CONFIG", {"fsync_policy": "batch", "fsync_batch_interval": 3600}):
+            with mock.patch("utils.error_handler._last_fsync", float("inf")):
+                self.assertTrue(safe_save_json({"a": 1}, self.path))
+                self.assertIn(self.path, error_handler._pending_fsync)
+            error_handler.sync_pending_writes()
+            self.assertNotIn(self.path, error_handler._pending_fsync)
+
+    def test_batch_fsync_flushes_the_renamed_file(self):
+        """A due batch flush syncs the newly written file, not the one it replaced."""
+        safe_save_json({"a": 0}, self.path)
+        synced = []
+        with mock.patch.dict("config.app_config.STORAGE_CONFIG", {"fsync_policy": "batch", "fsync_batch_interval": 0}), \
+                mock.patch("utils.error_handler._fsync_path", side_effect=lambda path: synced.append(os.stat(path).st_ino)):
+            self.assertTrue(safe_save_json({"a": 1}, self.path))
+        self.assertIn(os.stat(self.path).st_ino, synced)
+
+if __name__ == "__main__":
+    unittest.main()
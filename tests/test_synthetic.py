@@ -0,0 +1,72 @@
+"""
+Unit tests for the synthetic data generator.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import generate_dataset
+from config.content_bundle import validate_content
+from config.course_index import LessonIndex
+from utils.user_store import JsonUserStore, SQLiteUserStore
+
+class TestSyntheticData(unittest.TestCase):
+    """Test the generated data sets."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def generate(self, name, **kwargs):
+        output_dir = os.path.join(self.tmp_dir.name, name)
+        options = dict(lessons=120, resources=40, users=25, seed=7)
+        options.update(kwargs)
+        generate_dataset(output_dir, **options)
+        return output_dir
+
+    def read(self, output_dir, file_name):
+        with open(os.path.join(output_dir, "content", file_name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_content_schema(self):
+        """Generated content passes the content bundle validation."""
+        output_dir = self.generate("data")
+        content = {
+            "course_structure": self.read(output_dir, "course_structure.json"),
+            "neuroleader_types": self.read(output_dir, "neuroleader_types.json"),
+            "neuroleader_test": self.read(output_dir, "neuroleader_type_test.json"),
+            "test_questions": self.read(output_dir, "test_questions.json"),
+            "blog_resources": self.read(output_dir, "blog_resources.json"),
+            "markdown": {name: "" for name in os.listdir(os.path.join(output_dir, "content", "neuroleader_types"))},
+        }
+        validate_content(content)
+        self.assertEqual(len(LessonIndex(content["course_structure"])), 120)
+        self.assertEqual([len(items) for items in content["blog_resources"].values()], [10, 10, 10, 10])
+
+    def test_users_are_reproducible(self):
+        """The same seed gives the same users; completed lessons exist in the course."""
+        first = JsonUserStore(os.path.join(self.generate("first"), "user_files"))
+        second = JsonUserStore(os.path.join(self.generate("second"), "user_files"))
+        self.assertEqual(len(first.list_users()), 25)
+        self.assertEqual([first.load(user_id) for user_id in first.list_users()],
+                         [second.load(user_id) for user_id in second.list_users()])
+
+        index = LessonIndex(self.read(os.path.join(self.tmp_dir.name, "first"), "course_structure.json"))
+        for user_id in first.list_users():
+            self.assertTrue(all(lesson_id in index for lesson_id in first.load(user_id)["progress"]["completed_lessons"]))
+
+    def test_sqlite_store(self):
+        """Users can be written to the SQLite store instead of JSON files."""
+        output_dir = self.generate("sqlite", store="sqlite", users=5)
+        store = SQLiteUserStore(os.path.join(output_dir, "brainventure.db"))
+        self.addCleanup(store.close)
+        self.assertEqual(store.list_users(), [f"user_{i:06d}" for i in range(1, 6)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,8 @@ from utils.helpers import (
     format_time, calculate_progress, slugify, get_reading_time, 
     format_date, parse_markdown_frontmatter, extract_keywords,
     save_user_data, load_user_data, generate_achievement,
-    award_achievement, get_user_achievements
+    award_achievement, get_user_achievements,
+    flush_user_data, user_data_transaction
 )
 from utils.validators import (
     validate_email, validate_password, validate_username,
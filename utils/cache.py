@@ -0,0 +1,175 @@
+"""
+File caching utilities for the BrainVenture application.
+
+Content files are parsed once per process and kept in memory until the file
+on disk changes (detected by modification time and size). If a changed file
+fails to parse, the previous value keeps being served until it is fixed.
+"""
+
+import os
+import json
+import threading
+
+from utils.metrics import get_metrics_registry
+
+metrics = get_metrics_registry()
+
+class FileCache:
+    """
+    Process-wide cache of parsed files, invalidated by mtime and size.
+
+    Values are shared between all sessions of the process, so callers must
+    treat them as read-only.
+    """
+
+    def __init__(self, name="content"):
+        """
+        Initialize an empty cache.
+
+        Args:
+            name (str): Cache name used as the metrics label.
+        """
+        self.name = name
+        self._entries = {}
+        # Signature and error of files that failed to parse
+        self._failures = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_path, loader):
+        """
+        Return the parsed content of a file, re-parsing only when it changed.
+
+        Args:
+            file_path (str): Path to the file.
+            loader (callable): Function taking the path and returning the parsed value.
+
+        Returns:
+            The cached or freshly loaded value.
+
+        Raises:
+            OSError: If the file cannot be accessed.
+            ValueError: If the file can't be parsed and no earlier value is cached.
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                metrics.increment("cache_hits_total", cache=self.name)
+                return entry[1]
+
+            # Don't re-parse a broken file until it changes on disk
+            failure = self._failures.get(key)
+            if failure is not None and failure[0] == signature:
+                if entry is None:
+                    raise failure[1]
+                self.hits += 1
+                metrics.increment("cache_hits_total", cache=self.name)
+                return entry[1]
+
+        # Parse outside the lock so a slow file doesn't block other paths
+        metrics.increment("cache_misses_total", cache=self.name)
+        try:
+            value = loader(key)
+        except ValueError as e:
+            metrics.increment("content_loads_total", cache=self.name, result="error")
+            # Malformed (e.g. mid-write) file: keep serving the last good value
+            with self._lock:
+                self._failures[key] = (signature, e)
+                self.misses += 1
+                entry = self._entries.get(key)
+            if entry is None:
+                raise
+            return entry[1]
+
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._failures.pop(key, None)
+            self.misses += 1
+        metrics.increment("content_loads_total", cache=self.name, result="ok")
+        return value
+
+    def is_stale(self, file_path):
+        """
+        Check whether the cached value of a file is a fallback for a broken file.
+
+        Args:
+            file_path (str): Path to the file.
+
+        Returns:
+            bool: True if the file failed to parse and an older value is served.
+        """
+        key = os.path.abspath(file_path)
+        with self._lock:
+            return key in self._failures and key in self._entries
+
+    def invalidate(self, file_path=None):
+        """
+        Drop cached entries.
+
+        Args:
+            file_path (str, optional): Path to drop. If None, clears the whole cache.
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._failures.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+                self._failures.pop(os.path.abspath(file_path), None)
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Number of entries, hits and misses.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+def _read_json(file_path):
+    """Read and parse a JSON file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _read_text(file_path):
+    """Read a text file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+# Shared cache instance for all content files
+content_cache = FileCache()
+
+def load_json_cached(file_path):
+    """
+    Load a JSON file through the shared content cache.
+
+    Args:
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        The parsed JSON data (shared, must not be modified).
+    """
+    return content_cache.get(file_path, _read_json)
+
+def load_text_cached(file_path):
+    """
+    Load a text file through the shared content cache.
+
+    Args:
+        file_path (str): Path to the text file.
+
+    Returns:
+        str: The file content.
+    """
+    return content_cache.get(file_path, _read_text)
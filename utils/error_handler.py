@@ -6,13 +6,30 @@ import streamlit as st
 import traceback
 import sys
 import os
+import re
 import json
+import time
+import atexit
+import functools
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from collections import OrderedDict
 from datetime import datetime
 import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads within the process are serialized
+    fcntl = None
+
 from utils.logger import get_logger
+from utils.metrics import get_metrics_registry, function_name, timed
 
 # Initialize logger
 logger = get_logger(__name__)
+metrics = get_metrics_registry()
 
 class BrainVentureError(Exception):
     """Base exception class for BrainVenture application."""
@@ -48,27 +65,42 @@ def handle_error(func):
     """
     Decorator to handle exceptions in function calls.
     
+    Also records calls, latency and exceptions of the function in the
+    metrics registry when metrics are enabled.
+    
     Args:
         func: The function to decorate.
         
     Returns:
         The decorated function.
     """
+    name = function_name(func)
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        # Calls, latency and exceptions are recorded only when metrics are enabled
+        start = time.perf_counter() if metrics.enabled else None
+        error = None
         try:
             return func(*args, **kwargs)
         except BrainVentureError as e:
+            error = e
             logger.error(f"BrainVenture error: {str(e)}", exc_info=True)
             display_error(str(e), is_user_friendly=True)
             return None
         except (json.JSONDecodeError, FileNotFoundError) as e:
+            error = e
             logger.error(f"Data error: {str(e)}", exc_info=True)
             display_error("Wystąpił problem z danymi aplikacji. Prosimy o zgłoszenie problemu.")
             return None
         except Exception as e:
+            error = e
             logger.critical(f"Unexpected error: {str(e)}", exc_info=True)
             display_error("Wystąpił nieoczekiwany błąd. Prosimy o zgłoszenie problemu.")
             return None
+        finally:
+            if start is not None:
+                metrics.record_call(name, time.perf_counter() - start, error)
     return wrapper
 
 def display_error(message, is_user_friendly=False, exception_details=None):
@@ -89,36 +121,160 @@ def display_error(message, is_user_friendly=False, exception_details=None):
     if exception_details:
         logger.error(f"Error displayed to user: {message}", exc_info=exception_details)
 
-def log_error_to_file(error_type, error_message, stack_trace=None):
+ERROR_LOG_FILE = os.path.join("data", "logs", "errors.log")
+# Seconds between writes of the aggregated error summaries
+ERROR_FLUSH_INTERVAL = 5.0
+# Maximum number of distinct errors kept in memory
+ERROR_MAX_FINGERPRINTS = 1000
+
+def _error_location(stack_trace):
+    """Return "file:line" of the innermost frame of a traceback or of the reporting caller."""
+    if stack_trace:
+        frames = re.findall(r'File "(.+)", line (\d+)', stack_trace)
+        if frames:
+            return ":".join(frames[-1])
+    
+    # Skip this helper, ErrorAggregator.record and log_error_to_file
+    frame = sys._getframe(3)
+    return f"{frame.f_code.co_filename}:{frame.f_lineno}"
+
+class ErrorAggregator:
+    """
+    In-memory aggregation of errors written to the error log.
+    
+    Errors are fingerprinted by type, location and an optional key (e.g. the
+    file an error is about, so one broken file doesn't hide another
+    reported from the same line). Repeated errors only update
+    a counter and the last-seen time; summaries of errors that occurred since
+    the last write are appended to the log file periodically by a background
+    thread, so an error storm costs one file write per interval.
+    """
+    
+    def __init__(self, log_file=ERROR_LOG_FILE, flush_interval=ERROR_FLUSH_INTERVAL,
+                 max_fingerprints=ERROR_MAX_FINGERPRINTS):
+        """
+        Initialize the aggregator.
+        
+        Args:
+            log_file (str): Path of the error log.
+            flush_interval (float): Seconds between writes (0 disables the background thread).
+            max_fingerprints (int): Maximum number of distinct errors kept in memory.
+        """
+        self.log_file = log_file
+        self.flush_interval = flush_interval
+        self.max_fingerprints = max_fingerprints
+        self._errors = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+    
+    def record(self, error_type, error_message, stack_trace=None, key=None):
+        """
+        Record an occurrence of an error.
+        
+        Args:
+            error_type (str): Type of error.
+            error_message (str): Error message.
+            stack_trace (str, optional): Stack trace of the error.
+            key (str, optional): Distinguishes errors of the same type and location.
+        """
+        location = _error_location(stack_trace)
+        fingerprint = (error_type, location, key)
+        now = datetime.now().isoformat()
+        
+        with self._lock:
+            entry = self._errors.get(fingerprint)
+            if entry is None:
+                if len(self._errors) >= self.max_fingerprints:
+                    self._evict()
+                entry = self._errors[fingerprint] = {
+                    "error_type": error_type,
+                    "location": location,
+                    "key": key,
+                    "message": error_message,
+                    "stack_trace": stack_trace,
+                    "count": 0,
+                    "pending": 0,
+                    "reported": False,
+                    "first_seen": now,
+                }
+            entry["count"] += 1
+            entry["pending"] += 1
+            entry["last_seen"] = now
+            entry["last_message"] = error_message
+            
+            if self._flusher is None and self.flush_interval > 0:
+                self._flusher = threading.Thread(target=self._flush_loop, name="error-log", daemon=True)
+                self._flusher.start()
+    
+    def _evict(self):
+        """Drop the least recently seen error that has no unwritten occurrences."""
+        flushed = [key for key, entry in self._errors.items() if not entry["pending"]]
+        if flushed:
+            del self._errors[min(flushed, key=lambda key: self._errors[key]["last_seen"])]
+    
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+    
+    def flush(self):
+        """
+        Append summaries of errors seen since the last write to the error log.
+        
+        Returns:
+            int: Number of summaries written.
+        """
+        with self._lock:
+            pending = [entry for entry in self._errors.values() if entry["pending"]]
+            lines = []
+            for entry in pending:
+                where = f"{entry['location']} [{entry['key']}]" if entry["key"] else entry["location"]
+                lines.append(
+                    f"[{entry['last_seen']}] {entry['error_type']} at {where} "
+                    f"(x{entry['pending']} since last report, {entry['count']} total since {entry['first_seen']}): "
+                    f"{entry['last_message']}\n"
+                )
+                # The stack trace is written only with the first report of an error
+                if entry["stack_trace"] and not entry["reported"]:
+                    lines.append(f"Stack trace:\n{entry['stack_trace']}\n")
+                lines.append("-" * 80 + "\n")
+            snapshot = [(entry, entry["pending"]) for entry in pending]
+        
+        if not lines:
+            return 0
+        
+        try:
+            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except Exception as e:
+            logger.error(f"Failed to write to error log: {str(e)}")
+            return 0
+        
+        with self._lock:
+            for entry, written in snapshot:
+                entry["pending"] -= written
+                entry["reported"] = True
+        return len(snapshot)
+
+_error_aggregator = ErrorAggregator()
+atexit.register(_error_aggregator.flush)
+
+def log_error_to_file(error_type, error_message, stack_trace=None, key=None):
     """
     Log an error to the error log file.
     
+    Errors are deduplicated and written in periodic summaries by the
+    ErrorAggregator.
+    
     Args:
         error_type (str): Type of error.
         error_message (str): Error message.
         stack_trace (str, optional): Stack trace of the error.
+        key (str, optional): Keeps errors about different objects (e.g. files)
+            apart when they share a type and location.
     """
-    timestamp = datetime.now().isoformat()
-    error_log_dir = os.path.join("data", "logs")
-    error_log_file = os.path.join(error_log_dir, "errors.log")
-    
-    # Create logs directory if it doesn't exist
-    if not os.path.exists(error_log_dir):
-        try:
-            os.makedirs(error_log_dir)
-        except Exception as e:
-            logger.error(f"Failed to create log directory: {str(e)}")
-            return
-    
-    # Log error to file
-    try:
-        with open(error_log_file, "a") as f:
-            f.write(f"[{timestamp}] {error_type}: {error_message}\n")
-            if stack_trace:
-                f.write(f"Stack trace:\n{stack_trace}\n")
-            f.write("-" * 80 + "\n")
-    except Exception as e:
-        logger.error(f"Failed to write to error log: {str(e)}")
+    _error_aggregator.record(error_type, error_message, stack_trace, key)
 
 def get_traceback():
     """
@@ -129,37 +285,238 @@ def get_traceback():
     """
     return traceback.format_exc()
 
-def safe_load_json(file_path, default=None):
+# Backoff (in seconds) before re-parsing a file that failed to load and hasn't changed
+JSON_RETRY_BACKOFF = {"initial": 0.5, "max": 30.0}
+
+# Number of paths whose last good text is kept, least recently used evicted first
+JSON_FALLBACK_LIMIT = 256
+
+# Last successfully parsed text per path, served while the file is broken
+_last_good_json = OrderedDict()
+# Failure state per path: (file signature, consecutive failures, retry time)
+_json_failures = {}
+_json_state_lock = threading.Lock()
+
+@timed
+def safe_load_json_with_status(file_path, default=None):
     """
-    Safely load JSON file with error handling.
+    Safely load a JSON file, falling back to its last known good version.
+    
+    If the file is malformed (e.g. mid-write), the last successfully parsed
+    version of the same path is returned and marked stale. A broken file is
+    not re-parsed until it changes on disk or its backoff delay has passed.
+    Fallbacks are kept for the JSON_FALLBACK_LIMIT most recently used paths.
     
     Args:
         file_path (str): Path to the JSON file.
-        default (any, optional): Default value to return if loading fails.
+        default (any, optional): Value to return if there is no good version.
         
     Returns:
-        dict: The loaded JSON data or default value.
+        tuple: (data, stale) where stale is True if data is a fallback.
     """
+    key = os.path.abspath(file_path)
+    
+    def fallback():
+        with _json_state_lock:
+            text = _last_good_json.get(key)
+            if text is not None:
+                _last_good_json.move_to_end(key)
+        if text is None:
+            return default, False
+        # Parse again so every caller gets its own copy
+        return json.loads(text), True
+    
     try:
         if not os.path.exists(file_path):
             logger.warning(f"File not found: {file_path}")
-            return default
-            
+            return default, False
+        
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with _json_state_lock:
+            failure = _json_failures.get(key)
+        if failure is not None and failure[0] == signature and time.monotonic() < failure[2]:
+            return fallback()
+        
         with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            text = f.read()
+        data = json.loads(text)
+        
+        with _json_state_lock:
+            _last_good_json[key] = text
+            _last_good_json.move_to_end(key)
+            while len(_last_good_json) > JSON_FALLBACK_LIMIT:
+                _last_good_json.popitem(last=False)
+            _json_failures.pop(key, None)
+        return data, False
     except json.JSONDecodeError as e:
-        logger.error(f"JSON parse error in {file_path}: {str(e)}")
-        log_error_to_file("JSONDecodeError", f"Failed to parse {file_path}: {str(e)}")
-        return default
+        failures = _record_json_failure(key, signature)
+        logger.error(f"JSON parse error in {file_path} (failure {failures}): {str(e)}")
+        log_error_to_file("JSONDecodeError", f"Failed to parse {file_path}: {str(e)}", key=key)
+        return fallback()
     except Exception as e:
         logger.error(f"Error loading {file_path}: {str(e)}", exc_info=True)
-        log_error_to_file("FileLoadError", f"Failed to load {file_path}: {str(e)}", get_traceback())
-        return default
+        log_error_to_file("FileLoadError", f"Failed to load {file_path}: {str(e)}", get_traceback(), key=key)
+        return fallback()
+
+def _record_json_failure(key, signature):
+    """Register a failed parse and schedule the next retry with exponential backoff."""
+    with _json_state_lock:
+        failure = _json_failures.get(key)
+        failures = failure[1] + 1 if failure is not None else 1
+        delay = min(JSON_RETRY_BACKOFF["initial"] * 2 ** (failures - 1), JSON_RETRY_BACKOFF["max"])
+        _json_failures[key] = (signature, failures, time.monotonic() + delay)
+        return failures
+
+def safe_load_json(file_path, default=None):
+    """
+    Safely load JSON file with error handling.
+    
+    While the file is malformed, its last known good version is returned
+    (see safe_load_json_with_status).
+    
+    Args:
+        file_path (str): Path to the JSON file.
+        default (any, optional): Default value to return if loading fails.
+        
+    Returns:
+        dict: The loaded JSON data or default value.
+    """
+    return safe_load_json_with_status(file_path, default)[0]
+        
+# Files are locked through a fixed set of lock files per directory, picked by
+# a hash of the file's path: unrelated files rarely wait for each other, and
+# locking doesn't leave a side file per document
+LOCK_STRIPES = 16
+LOCK_FILE_PATTERN = ".brainventure-{:02d}.lock"
+
+# Locks serializing writers within the process, keyed by lock file path
+_stripe_locks = {}
+_stripe_locks_guard = threading.Lock()
+# Lock files the current thread holds (locked_file is re-entrant)
+_held_locks = threading.local()
+
+# Permissions of newly created files; mkstemp creates 0600 files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Files written since the last fsync in "batch" mode
+_pending_fsync = set()
+_pending_fsync_lock = threading.Lock()
+_last_fsync = 0.0
+
+def _lock_path(file_path):
+    """Return the lock file guarding a file."""
+    file_path = os.path.abspath(file_path)
+    # crc32 rather than hash(), which differs between processes
+    stripe = zlib.crc32(file_path.encode("utf-8")) % LOCK_STRIPES
+    return os.path.join(os.path.dirname(file_path), LOCK_FILE_PATTERN.format(stripe))
+
+def _get_stripe_lock(lock_path):
+    """Return the process-wide lock of a lock file."""
+    with _stripe_locks_guard:
+        lock = _stripe_locks.get(lock_path)
+        if lock is None:
+            lock = _stripe_locks[lock_path] = threading.RLock()
+        return lock
+
+@contextmanager
+def locked_file(file_path):
+    """
+    Hold an exclusive advisory lock on a file while writing it.
+    
+    Each file maps to one of LOCK_STRIPES lock files in its directory:
+    threads are serialized with a lock per lock file, other processes with
+    fcntl.flock on it (where fcntl is available). Files sharing a stripe
+    also share the lock. The lock is re-entrant within a thread. The
+    directory must exist.
+    
+    Args:
+        file_path (str): Path of the file to lock.
+    """
+    lock_path = _lock_path(file_path)
+    with _get_stripe_lock(lock_path):
+        held = getattr(_held_locks, "paths", None)
+        if held is None:
+            held = _held_locks.paths = set()
+        if fcntl is None or lock_path in held:
+            yield
+            return
         
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            held.add(lock_path)
+            try:
+                yield
+            finally:
+                held.discard(lock_path)
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def _file_mode(file_path):
+    """Return the permission bits to give a rewritten file: its current ones, or the umask default."""
+    try:
+        return os.stat(file_path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+def _fsync_path(path):
+    """Flush a file or directory to disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def sync_pending_writes():
+    """
+    Flush files written in "batch" fsync mode to disk.
+    """
+    global _last_fsync
+    with _pending_fsync_lock:
+        paths = list(_pending_fsync)
+        _pending_fsync.clear()
+        _last_fsync = time.monotonic()
+    
+    for path in paths:
+        try:
+            _fsync_path(path)
+        except OSError as e:
+            logger.warning(f"Failed to fsync {path}: {str(e)}")
+
+atexit.register(sync_pending_writes)
+
+def _fsync_policy():
+    """Get the configured fsync policy ("always", "batch" or "never")."""
+    from config.app_config import STORAGE_CONFIG
+    
+    return STORAGE_CONFIG.get("fsync_policy", "always")
+
+def _schedule_fsync(file_path):
+    """
+    Register a file for the next batch fsync, flushing if the interval has passed.
+    Must be called after the file has been renamed into place.
+    """
+    from config.app_config import STORAGE_CONFIG
+    
+    with _pending_fsync_lock:
+        _pending_fsync.add(file_path)
+        if os.name == "posix":
+            _pending_fsync.add(os.path.dirname(os.path.abspath(file_path)))
+        due = time.monotonic() - _last_fsync >= STORAGE_CONFIG.get("fsync_batch_interval", 1.0)
+    if due:
+        sync_pending_writes()
+
+@timed
 def safe_save_json(data, file_path):
     """
     Safely save data to JSON file with error handling.
     
+    The file is replaced atomically: data is written to a temporary file in
+    the same directory, flushed according to STORAGE_CONFIG["fsync_policy"]
+    and renamed over the target, so readers never see a partial document.
+    Concurrent writers of the same file are serialized with locked_file, and
+    the file keeps its permissions (new files get the umask default).
+    
     Args:
         data (dict): Data to save.
         file_path (str): Path to save the JSON file.
@@ -167,14 +524,39 @@ def safe_save_json(data, file_path):
     Returns:
         bool: True if successful, False otherwise.
     """
+    tmp_path = None
     try:
+        # Serialize before taking the lock to keep the critical section short
+        content = json.dumps(data, ensure_ascii=False, indent=2)
+        
         # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with locked_file(file_path):
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+            os.chmod(tmp_path, _file_mode(file_path))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                policy = _fsync_policy()
+                if policy == "always":
+                    os.fsync(f.fileno())
+            
+            os.replace(tmp_path, file_path)
+            tmp_path = None
+            
+            # Persist the rename itself
+            if policy == "always" and os.name == "posix":
+                _fsync_path(directory)
+        if policy == "batch":
+            _schedule_fsync(file_path)
         return True
     except Exception as e:
         logger.error(f"Error saving to {file_path}: {str(e)}", exc_info=True)
-        log_error_to_file("FileSaveError", f"Failed to save to {file_path}: {str(e)}", get_traceback())
+        log_error_to_file("FileSaveError", f"Failed to save to {file_path}: {str(e)}", get_traceback(),
+                          key=os.path.abspath(file_path))
         return False
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,323 @@
+"""
+Append-only progress event log for the BrainVenture application.
+
+Progress changes (completed lessons, tests taken, achievements earned) are
+appended as single JSON lines to a per-user log instead of rewriting the
+whole user document. Events are folded into the user document on load; once
+enough events have accumulated, the folded document is saved as a snapshot
+and the log is compacted.
+
+Each event has a sequence number. The user document records the last folded
+sequence number in "event_seq", so events already contained in a snapshot
+are never applied twice. Appends and compaction hold the log file's lock
+(see utils.error_handler.locked_file) and take the
+last sequence number from the log file itself, so several processes can
+write the same user.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+from config.app_config import STORAGE_CONFIG
+from utils.logger import get_logger
+from utils.error_handler import locked_file
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# Application base directory, used to resolve relative storage paths
+BASE_PATH = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+
+EVENT_LESSON_COMPLETED = "lesson_completed"
+EVENT_TEST_TAKEN = "test_taken"
+EVENT_ACHIEVEMENT_EARNED = "achievement_earned"
+
+def _fold_lesson_completed(user_data, data):
+    completed = user_data.setdefault("progress", {}).setdefault("completed_lessons", [])
+    if data["lesson_id"] not in completed:
+        completed.append(data["lesson_id"])
+
+def _fold_test_taken(user_data, data):
+    progress = user_data.setdefault("progress", {})
+    progress.setdefault("tests_taken", []).append(dict(data))
+    if data.get("test_type") == "neuroleader_type":
+        progress["neuroleader_type"] = data.get("result")
+
+def _fold_achievement_earned(user_data, data):
+    achievements = user_data.setdefault("achievements", [])
+    if all(achievement.get("id") != data.get("id") for achievement in achievements):
+        achievements.append(dict(data))
+
+_FOLDERS = {
+    EVENT_LESSON_COMPLETED: _fold_lesson_completed,
+    EVENT_TEST_TAKEN: _fold_test_taken,
+    EVENT_ACHIEVEMENT_EARNED: _fold_achievement_earned,
+}
+
+def apply_event(user_data, event):
+    """
+    Fold a single event into a user document.
+
+    Events at or below the document's "event_seq" are skipped.
+
+    Args:
+        user_data (dict): User data to update in place.
+        event (dict): Event as returned by ProgressEventLog.append.
+
+    Returns:
+        bool: True if the event was applied, False otherwise.
+    """
+    if event["seq"] <= user_data.get("event_seq", 0):
+        return False
+
+    folder = _FOLDERS.get(event["type"])
+    if folder is None:
+        logger.warning(f"Skipping unknown progress event type: {event['type']}")
+    else:
+        folder(user_data, event["data"])
+        user_data.setdefault("progress", {})["last_activity"] = event["at"]
+
+    user_data["event_seq"] = event["seq"]
+    return True
+
+def apply_events(user_data, events):
+    """
+    Fold events into a user document.
+
+    Args:
+        user_data (dict): User data to update in place.
+        events (list): Events in sequence order.
+
+    Returns:
+        int: Number of events applied.
+    """
+    return sum(1 for event in events if apply_event(user_data, event))
+
+class ProgressEventLog:
+    """
+    Per-user JSON Lines logs of progress events.
+    """
+
+    def __init__(self, log_dir=None, compaction_threshold=None, retain_events=None):
+        """
+        Initialize the log.
+
+        Args:
+            log_dir (str, optional): Directory with the event logs.
+                Defaults to STORAGE_CONFIG["event_log_dir"].
+            compaction_threshold (int, optional): Number of events after which
+                a log should be compacted. Defaults to STORAGE_CONFIG["event_compaction_threshold"].
+            retain_events (int, optional): Number of already folded events kept
+                after compaction for the activity timeline. Defaults to STORAGE_CONFIG["event_log_retain"].
+        """
+        log_dir = log_dir or STORAGE_CONFIG["event_log_dir"]
+        self.log_dir = log_dir if os.path.isabs(log_dir) else os.path.join(BASE_PATH, log_dir)
+        self.compaction_threshold = compaction_threshold or STORAGE_CONFIG["event_compaction_threshold"]
+        self.retain_events = STORAGE_CONFIG["event_log_retain"] if retain_events is None else retain_events
+        self._lock = threading.Lock()
+        # Per-user number of lines in the log, as seen by this process
+        self._line_counts = {}
+
+    def _path(self, user_id):
+        """Return the file path of a user's event log."""
+        return os.path.join(self.log_dir, f"{user_id}.jsonl")
+
+    def read(self, user_id=None, path=None):
+        """
+        Read all events of a user.
+
+        Args:
+            user_id (str): User ID.
+            path (str, optional): Log file path to read instead of the user's.
+
+        Returns:
+            list: Events in sequence order.
+        """
+        path = path or self._path(user_id)
+        if not os.path.exists(path):
+            return []
+
+        events = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A crash during an append can leave a partial last line
+                    logger.warning(f"Skipping malformed event at {path}:{line_number}")
+        return events
+
+    def _ensure_state(self, user_id):
+        """Count the lines of a log on first use."""
+        if user_id not in self._line_counts:
+            self._line_counts[user_id] = len(self.read(user_id))
+
+    def _read_tail(self, path):
+        """
+        Get the last sequence number of a log file from its end.
+        
+        Must be called while holding the log's file lock.
+        
+        Args:
+            path (str): Log file path.
+            
+        Returns:
+            tuple: (last sequence number or 0, whether the file ends with a newline)
+        """
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return 0, True
+        
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return 0, True
+            # Events are small, so the last complete one is almost always in the final block
+            f.seek(max(0, size - 65536))
+            tail = f.read()
+            if size > len(tail):
+                tail = tail.split(b"\n", 1)[-1]
+            for line in reversed(tail.splitlines()):
+                try:
+                    return json.loads(line)["seq"], tail.endswith(b"\n")
+                except (ValueError, KeyError, TypeError):
+                    continue
+        
+        # No complete event in the last block: fall back to reading the whole log
+        events = self.read(path=path)
+        return (events[-1]["seq"] if events else 0), tail.endswith(b"\n")
+
+    def append(self, user_id, event_type, data, min_seq=0):
+        """
+        Append an event to a user's log.
+
+        Args:
+            user_id (str): User ID.
+            event_type (str): One of the EVENT_* constants.
+            data (dict): Event payload.
+            min_seq (int, optional): Sequence number the event must exceed,
+                usually the "event_seq" of the user's snapshot.
+
+        Returns:
+            dict: The appended event.
+        """
+        path = self._path(user_id)
+        os.makedirs(self.log_dir, exist_ok=True)
+        with self._lock, locked_file(path):
+            self._ensure_state(user_id)
+            last_seq, complete = self._read_tail(path)
+            event = {
+                "seq": max(last_seq, min_seq) + 1,
+                "type": event_type,
+                "at": datetime.now().isoformat(),
+                "data": data,
+            }
+
+            line = json.dumps(event, ensure_ascii=False) + "\n"
+            with open(path, "a", encoding="utf-8") as f:
+                # Terminate a partial line left by a crashed append
+                f.write(line if complete else "\n" + line)
+
+            self._line_counts[user_id] += 1
+            return event
+
+    def version(self, user_id):
+        """
+        Get a cheap token that changes whenever a user's log is written.
+
+        Args:
+            user_id (str): User ID.
+
+        Returns:
+            tuple: (mtime, size) of the log file, or None if there is no log.
+        """
+        try:
+            stat = os.stat(self._path(user_id))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def lock(self, user_id):
+        """
+        Lock a user's log while saving a snapshot of the user document.
+
+        Appends and compaction in other threads and processes wait until the
+        lock is released. Don't append or compact from the thread holding it.
+
+        Args:
+            user_id (str): User ID.
+
+        Returns:
+            The locked_file context manager of the log.
+        """
+        os.makedirs(self.log_dir, exist_ok=True)
+        return locked_file(self._path(user_id))
+
+    def needs_compaction(self, user_id):
+        """
+        Check whether a user's log has grown past the compaction threshold.
+
+        Args:
+            user_id (str): User ID.
+
+        Returns:
+            bool: True if the log should be compacted.
+        """
+        with self._lock:
+            self._ensure_state(user_id)
+            return self._line_counts[user_id] >= self.compaction_threshold + self.retain_events
+
+    def compact(self, user_id, snapshot_seq):
+        """
+        Drop events that are contained in a saved snapshot.
+
+        The newest retain_events folded events are kept for the activity
+        timeline (at least the last event, which carries the sequence number);
+        events newer than the snapshot are always kept.
+
+        Args:
+            user_id (str): User ID.
+            snapshot_seq (int): "event_seq" of the saved user document.
+
+        Returns:
+            int: Number of events removed.
+        """
+        path = self._path(user_id)
+        with self._lock, locked_file(path):
+            events = self.read(user_id)
+            folded = [event for event in events if event["seq"] <= snapshot_seq]
+            pending = [event for event in events if event["seq"] > snapshot_seq]
+            kept = (folded[-self.retain_events:] if self.retain_events else []) + pending
+            # The last event carries the sequence number for the next append
+            kept = kept or events[-1:]
+
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for event in kept:
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, path)
+
+            self._line_counts[user_id] = len(kept)
+            logger.info(f"Compacted event log for user {user_id}: removed {len(events) - len(kept)} events")
+            return len(events) - len(kept)
+
+_event_log = None
+_event_log_lock = threading.Lock()
+
+def get_progress_event_log():
+    """
+    Get the shared progress event log configured in STORAGE_CONFIG.
+
+    Returns:
+        ProgressEventLog: The event log.
+    """
+    global _event_log
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = ProgressEventLog()
+        return _event_log
@@ -7,13 +7,21 @@ import os
 import re
 import time
 import random
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import streamlit as st
+from streamlit.runtime.scriptrunner import RerunException, StopException
 from utils.logger import get_logger
-from utils.error_handler import safe_load_json, safe_save_json, handle_error, UserDataError
+from utils.error_handler import handle_error, UserDataError
+from utils.user_store import get_user_store
+from utils.user_session import get_user_session, release_user_session
+from utils.profiler import profiled
+from utils.metrics import get_metrics_registry
+from utils.event_log import get_progress_event_log, apply_event, apply_events, EVENT_ACHIEVEMENT_EARNED
 
 # Initialize logger
 logger = get_logger(__name__)
+metrics = get_metrics_registry()
 
 def format_time(seconds):
     """
@@ -185,7 +193,10 @@ def extract_keywords(text, max_keywords=5):
 @handle_error
 def save_user_data(user_data, user_id="default_user"):
     """
-    Save user data to file.
+    Save user data to the configured user store.
+    
+    Inside a user data transaction the document is only marked dirty and
+    written once when the transaction ends.
     
     Args:
         user_data (dict): User data to save.
@@ -198,29 +209,180 @@ def save_user_data(user_data, user_id="default_user"):
     if not user_data or not isinstance(user_data, dict):
         logger.warning("Invalid user data provided for saving")
         raise UserDataError("Invalid user data format")
-      # In a full implementation, this would be a database operation
-    # Get the absolute base path of the application
-    base_path = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-    user_file_path = os.path.join(base_path, "data", "user_files", f"{user_id}.json")
-    
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(user_file_path), exist_ok=True)
     
     # Update last modified timestamp
     user_data["updated_at"] = datetime.now().isoformat()
     
-    # Save the data using safe_save_json
-    if safe_save_json(user_data, user_file_path):
-        logger.info(f"User data saved successfully for user {user_id}")
+    # Keep the session cache in sync and defer the write inside a transaction
+    session = get_user_session(create=False)
+    if session is not None:
+        session.documents[user_id] = user_data
+        if session.in_transaction:
+            session.dirty.add(user_id)
+            return True
+    
+    return _write_user_data(user_data, user_id)
+
+def _write_user_data(user_data, user_id):
+    """
+    Write user data to the configured user store (JSON files or SQLite).
+    
+    The write holds the lock of the user's event log. Events appended since
+    the document was loaded are folded into it first, and the write is
+    refused if the stored document already contains events this one lacks:
+    they may have been compacted out of the log, so overwriting the stored
+    document would lose them. The stale document is then dropped from the
+    session cache, so the next load starts from the stored one.
+    """
+    store = get_user_store()
+    event_log = get_progress_event_log()
+    with event_log.lock(user_id):
+        stored = store.load(user_id)
+        stored_seq = stored.get("event_seq", 0) if stored else 0
+        if stored_seq > user_data.get("event_seq", 0):
+            metrics.increment("user_store_writes_total", result="conflict")
+            logger.warning(f"Not saving user data for user {user_id}: the stored document is newer "
+                           f"(event {stored_seq}, this one {user_data.get('event_seq', 0)})")
+            session = get_user_session(create=False)
+            if session is not None:
+                session.forget(user_id)
+            return False
+        
+        apply_events(user_data, event_log.read(user_id))
+        saved = store.save(user_id, user_data)
+        if saved:
+            _remember_version(user_data, user_id)
+    
+    if saved:
+        metrics.increment("user_store_writes_total", result="ok")
+        logger.info(f"User data saved successfully for user {user_id}", rate_limit=1)
         return True
     else:
+        metrics.increment("user_store_writes_total", result="error")
         logger.error(f"Failed to save user data for user {user_id}")
         return False
 
+def _document_version(user_id):
+    """Return the version of a user's stored document and event log, or None if unknown."""
+    stored = get_user_store().version(user_id)
+    if stored is None:
+        return None
+    return (stored, get_progress_event_log().version(user_id))
+
+def _remember_version(user_data, user_id):
+    """Record the stored version of a document cached in the current session."""
+    session = get_user_session(create=False)
+    if session is not None and session.documents.get(user_id) is user_data:
+        session.versions[user_id] = _document_version(user_id)
+        if session.in_transaction:
+            session.checked.add(user_id)
+
+def flush_user_data():
+    """
+    Write all dirty user documents of the current session to the user store.
+    
+    Returns:
+        bool: True if all writes succeeded, False otherwise.
+    """
+    session = get_user_session(create=False)
+    if session is None:
+        return True
+    
+    success = True
+    for user_id in list(session.dirty):
+        if _write_user_data(session.documents[user_id], user_id):
+            session.dirty.discard(user_id)
+        else:
+            success = False
+    return success
+
+@contextmanager
+def user_data_transaction(user_id="default_user"):
+    """
+    Load user data once and write it at most once for a group of changes.
+    
+    Saves made inside the block (including nested helpers such as
+    award_achievement) only mark the document dirty; it is flushed when the
+    outermost transaction ends normally or via st.rerun()/st.stop(). If the
+    block raises any other exception, the documents it used are dropped from
+    the session cache with their unsaved changes.
+    
+    Args:
+        user_id (str, optional): User ID. Defaults to "default_user".
+        
+    Yields:
+        dict: The user data.
+    """
+    session = get_user_session()
+    if not session.in_transaction:
+        session.checked.clear()
+    session.transaction_depth += 1
+    completed = False
+    try:
+        yield load_user_data(user_id)
+        completed = True
+    except (RerunException, StopException):
+        # st.rerun() and st.stop() end a block whose changes are complete
+        completed = True
+        raise
+    finally:
+        session.transaction_depth -= 1
+        if not session.in_transaction:
+            if completed:
+                flush_user_data()
+            else:
+                # Documents may have been changed in place without a save
+                for used_user_id in session.checked | session.dirty:
+                    if used_user_id in session.dirty:
+                        logger.warning(f"Discarding unsaved changes of user {used_user_id} after an error")
+                    session.forget(used_user_id)
+            release_user_session(session)
+
+def record_progress_event(user_id, event_type, data):
+    """
+    Record a progress change as an event instead of rewriting the user document.
+    
+    The event is appended to the user's event log and folded into the loaded
+    user data. When the log grows past the compaction threshold, the user
+    document is saved as a snapshot and the log is compacted.
+    
+    Args:
+        user_id (str): User ID.
+        event_type (str): One of the EVENT_* constants from utils.event_log.
+        data (dict): Event payload.
+        
+    Returns:
+        dict: The updated user data.
+    """
+    user_data = load_user_data(user_id)
+    event_log = get_progress_event_log()
+    
+    event_seq = user_data.get("event_seq", 0)
+    event = event_log.append(user_id, event_type, data, min_seq=event_seq)
+    if event["seq"] == event_seq + 1:
+        apply_event(user_data, event)
+    else:
+        # Another process appended events since this document was loaded
+        apply_events(user_data, event_log.read(user_id))
+    logger.log_user_activity(user_id, event_type, data)
+    
+    if event_log.needs_compaction(user_id):
+        # The snapshot must be on disk before folded events are dropped
+        user_data["updated_at"] = datetime.now().isoformat()
+        if _write_user_data(user_data, user_id):
+            event_log.compact(user_id, user_data["event_seq"])
+    
+    return user_data
+
+@profiled("user data load")
 @handle_error
 def load_user_data(user_id="default_user"):
     """
-    Load user data from file.
+    Load user data from the session cache or the configured user store.
+    
+    A cached document is reused while its stored version is unchanged; the
+    version is checked on every load outside transactions and once per
+    transaction, and not at all while the document has unsaved changes.
     
     Args:
         user_id (str, optional): User ID. Defaults to "default_user".
@@ -228,15 +390,31 @@ def load_user_data(user_id="default_user"):
     Returns:
         dict: User data or default user data if not found.
     """
-    # Get the absolute base path of the application
-    base_path = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-    user_file_path = os.path.join(base_path, "data", "user_files", f"{user_id}.json")
-    
-    # Use safe_load_json to load the user data
-    user_data = safe_load_json(user_file_path)
+    # Serve the document already loaded in this session, unless another session changed it
+    session = get_user_session(create=False)
+    version = None
+    if session is not None:
+        if user_id in session.dirty or (session.in_transaction and user_id in session.checked):
+            return session.documents[user_id]
+        version = _document_version(user_id)
+        if user_id in session.documents and version is not None and version == session.versions.get(user_id):
+            if session.in_transaction:
+                session.checked.add(user_id)
+            return session.documents[user_id]
+    
+    # Load the user data from the configured user store
+    user_data = get_user_store().load(user_id)
+    metrics.increment("user_store_reads_total", result="found" if user_data else "missing")
     
     if user_data:
-        logger.info(f"User data loaded successfully for user {user_id}")
+        # Fold progress events recorded since the last snapshot
+        apply_events(user_data, get_progress_event_log().read(user_id))
+        logger.info(f"User data loaded successfully for user {user_id}", rate_limit=1)
+        if session is not None:
+            session.documents[user_id] = user_data
+            session.versions[user_id] = version
+            if session.in_transaction:
+                session.checked.add(user_id)
         return user_data
     
     # Return default user data if file doesn't exist or there's an error
@@ -266,9 +444,7 @@ def load_user_data(user_id="default_user"):
         "achievements": []
     }
     
-    # Ensure the directory exists
-    os.makedirs(os.path.join("data", "user_files"), exist_ok=True)
-      # Save the default user data
+    # Save the default user data
     save_user_data(default_user, user_id)
     
     return default_user
@@ -315,12 +491,8 @@ def award_achievement(user_id, achievement_name, description, icon):
     if achievement_id not in existing_achievements:
         # Add the achievement
         achievement = generate_achievement(achievement_name, description, icon)
-        if "achievements" not in user_data:
-            user_data["achievements"] = []
-        user_data["achievements"].append(achievement)
-        
-        # Save the updated user data
-        return save_user_data(user_data, user_id)
+        record_progress_event(user_id, EVENT_ACHIEVEMENT_EARNED, achievement)
+        return True
     
     return False
 
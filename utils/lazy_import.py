@@ -0,0 +1,146 @@
+"""
+Lazy imports of heavy modules for the BrainVenture application.
+
+Pages and components bind pandas, numpy and plotly with lazy_import() at
+module level, so a rerun only pays for importing them when a code path
+actually uses them. After the first page has rendered, warm_up() preloads
+the heavy modules in a background thread so later visits find them in
+sys.modules (BRAINVENTURE_WARMUP=0 turns the warm-up off).
+"""
+
+import os
+import sys
+import time
+import importlib
+import threading
+
+# Modules preloaded by the background warm-up, in import order
+HEAVY_MODULES = ("numpy", "pandas", "plotly.graph_objects")
+
+WARMUP_ENABLED = os.environ.get("BRAINVENTURE_WARMUP", "1") == "1"
+
+_warm_up_lock = threading.Lock()
+_warm_up_thread = None
+
+class LazyModule:
+    """
+    Module proxy that imports the module on first attribute access.
+    """
+
+    def __init__(self, name):
+        """
+        Create the proxy without importing the module.
+
+        Args:
+            name (str): Absolute module name, e.g. "plotly.graph_objects".
+        """
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        """Import the module (once) and return it."""
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+def lazy_import(name):
+    """
+    Get a module that is imported on first use.
+
+    Modules that are already imported are returned directly; a module still
+    being imported (e.g. by the warm-up thread) is proxied, so its first use
+    waits for the import to finish.
+
+    Args:
+        name (str): Absolute module name.
+
+    Returns:
+        The module, or a LazyModule proxy for it.
+    """
+    module = sys.modules.get(name)
+    if module is not None and not _is_initializing(module):
+        return module
+    return LazyModule(name)
+
+def _is_initializing(module):
+    """Check whether a module in sys.modules is still being imported."""
+    return getattr(getattr(module, "__spec__", None), "_initializing", False)
+
+def is_loaded(module):
+    """
+    Check whether a module returned by lazy_import() has been imported.
+
+    Args:
+        module: Module or LazyModule.
+
+    Returns:
+        bool: True if the module is imported.
+    """
+    if isinstance(module, LazyModule):
+        if module.__dict__["_module"] is not None:
+            return True
+        loaded = sys.modules.get(module.__dict__["_name"])
+        return loaded is not None and not _is_initializing(loaded)
+    return True
+
+def _preload(names):
+    """Import modules one by one, skipping those that fail."""
+    from utils.metrics import get_metrics_registry
+
+    metrics = get_metrics_registry()
+    for name in names:
+        if name in sys.modules:
+            continue
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            metrics.increment("warmup_imports_total", module=name, result="error")
+            continue
+        metrics.increment("warmup_imports_total", module=name, result="ok")
+        metrics.observe("warmup_import_seconds", time.perf_counter() - start, module=name)
+
+def warm_up(names=HEAVY_MODULES):
+    """
+    Preload heavy modules in a background thread.
+
+    Only the first call starts a thread; it does nothing if the warm-up is
+    disabled or all modules are already imported.
+
+    Args:
+        names (tuple): Module names to import.
+
+    Returns:
+        threading.Thread: The warm-up thread, or None if none was started.
+    """
+    global _warm_up_thread
+
+    if not WARMUP_ENABLED or _warm_up_thread is not None:
+        return None
+    pending = [name for name in names if name not in sys.modules]
+    if not pending:
+        return None
+
+    with _warm_up_lock:
+        if _warm_up_thread is not None:
+            return None
+        _warm_up_thread = threading.Thread(
+            target=_preload, args=(pending,), name="brainventure-warmup", daemon=True
+        )
+        _warm_up_thread.start()
+    return _warm_up_thread
@@ -3,70 +3,537 @@ Logging utilities for the BrainVenture application.
 """
 
 import logging
+import logging.handlers
 import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import gzip
+import shutil
+import queue
+import atexit
+import copy
+import threading
 from datetime import datetime
 
-# Set up logging configuration
-class Logger:
+# Settings of the shared logging pipeline (kept here rather than in config to
+# avoid an import cycle: config imports utils, which imports this module)
+LOG_FORMAT = "[%(asctime)s] %(levelname)s [%(name)s.%(funcName)s:%(lineno)d] %(message)s"
+LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+LOG_ROTATION = {
+    # Roll the daily file over when it reaches this size (0 disables size rotation)
+    "max_bytes": 10 * 1024 * 1024,
+    # Number of compressed log files to keep
+    "backup_count": 14,
+}
+
+# "text" keeps the classic one-line format, "json" writes one JSON object per line
+LOG_OUTPUT_FORMAT = os.environ.get("BRAINVENTURE_LOG_FORMAT", "text")
+ACTIVITY_SINK = {
+    # SQLite database receiving Logger.log_user_activity records
+    "path": os.path.join(LOGS_DIR, "activity.db"),
+    # Records are written in batches: when batch_size are buffered or after flush_interval seconds
+    "batch_size": 100,
+    "flush_interval": 0.5,
+}
+
+# Rolled log files are compressed one at a time by a background worker
+_compression_queue = queue.Queue()
+_compression_worker = None
+_compression_lock = threading.Lock()
+
+def _compress_log_file(path, log_dir, prefix, backup_count):
+    """Gzip a rolled log file and remove the oldest compressed files."""
+    if not os.path.exists(path):
+        # Already compressed by another process started on the same directory
+        return
+    tmp_path = f"{path}.gz.{os.getpid()}.tmp"
+    try:
+        with open(path, "rb") as source, gzip.open(tmp_path, "wb") as target:
+            shutil.copyfileobj(source, target)
+        # Keep the log's modification time, which orders archives for pruning
+        shutil.copystat(path, tmp_path)
+        os.replace(tmp_path, f"{path}.gz")
+        os.remove(path)
+    except OSError as e:
+        # The worker runs behind the logging pipeline, so report directly
+        print(f"Error compressing log file {path}: {e}")
+        return
+    
+    archives = sorted(
+        (entry for entry in os.scandir(log_dir) if entry.name.startswith(prefix) and entry.name.endswith(".log.gz")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in archives[:max(0, len(archives) - backup_count)]:
+        os.remove(entry.path)
+
+def _compression_loop():
+    while True:
+        job = _compression_queue.get()
+        try:
+            _compress_log_file(*job)
+        finally:
+            _compression_queue.task_done()
+
+def _schedule_compression(path, log_dir, prefix, backup_count):
+    """Queue a rolled log file for compression."""
+    global _compression_worker
+    with _compression_lock:
+        if _compression_worker is None:
+            _compression_worker = threading.Thread(target=_compression_loop, name="log-compression", daemon=True)
+            _compression_worker.start()
+    _compression_queue.put((path, log_dir, prefix, backup_count))
+
+class RotatingLogFileHandler(logging.handlers.BaseRotatingHandler):
     """
-    Custom logger class for the BrainVenture application.
+    Daily log file (prefix_YYYYMMDD.log) that also rolls over at a maximum size.
+    
+    Rolled files are gzip-compressed by a background worker and only the newest
+    backup_count archives are kept, so a log write never waits for compression.
+    Files left uncompressed by an earlier run (the daily file of a previous day,
+    or rolled files whose compression was cut short) are queued when the
+    handler starts.
     """
     
-    def __init__(self, name="brainventure", log_level=logging.INFO, log_to_file=True):
+    def __init__(self, log_dir, prefix="brainventure", max_bytes=0, backup_count=14, encoding="utf-8"):
         """
-        Initialize the logger.
+        Initialize the handler.
         
         Args:
-            name (str): Name for the logger
-            log_level (int): Logging level (e.g., logging.INFO)
-            log_to_file (bool): Whether to log to a file
+            log_dir (str): Directory with the log files.
+            prefix (str): Log file name prefix.
+            max_bytes (int): Size at which the current file is rolled over (0 = no limit).
+            backup_count (int): Number of compressed files to keep.
+            encoding (str): File encoding.
         """
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(log_level)
+        os.makedirs(log_dir, exist_ok=True)
+        self.log_dir = log_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.day = datetime.now().strftime("%Y%m%d")
+        super().__init__(self._day_path(self.day), "a", encoding=encoding)
+        self._compress_leftovers()
+    
+    def _compress_leftovers(self):
+        """Queue uncompressed log files other than today's daily file for compression."""
+        pattern = re.compile(rf"^{re.escape(self.prefix)}_\d{{8}}(\.\d+)?\.log$")
+        current = os.path.basename(self.baseFilename)
+        for name in sorted(os.listdir(self.log_dir)):
+            if name != current and pattern.match(name):
+                _schedule_compression(os.path.join(self.log_dir, name), self.log_dir, self.prefix, self.backup_count)
+    
+    def _day_path(self, day):
+        return os.path.join(self.log_dir, f"{self.prefix}_{day}.log")
+    
+    def shouldRollover(self, record):
+        if datetime.now().strftime("%Y%m%d") != self.day:
+            return True
+        if self.max_bytes > 0 and self.stream is not None:
+            # Size is checked before formatting, so a file may exceed max_bytes by one record
+            return self.stream.tell() >= self.max_bytes
+        return False
+    
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
         
-        # Create formatter
-        formatter = logging.Formatter(
-            "[%(asctime)s] %(levelname)s [%(name)s.%(funcName)s:%(lineno)d] %(message)s"
+        today = datetime.now().strftime("%Y%m%d")
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            # Give the rolled file a unique name (prefix_YYYYMMDD.N.log)
+            pattern = re.compile(rf"^{re.escape(self.prefix)}_{self.day}\.(\d+)\.log(\.gz)?$")
+            numbers = [int(m.group(1)) for m in map(pattern.match, os.listdir(self.log_dir)) if m]
+            rolled = os.path.join(self.log_dir, f"{self.prefix}_{self.day}.{max(numbers, default=0) + 1}.log")
+            os.replace(self.baseFilename, rolled)
+            _schedule_compression(rolled, self.log_dir, self.prefix, self.backup_count)
+        
+        self.day = today
+        self.baseFilename = self._day_path(today)
+        self.stream = self._open()
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as JSON lines, including structured user activity and
+    application error data passed via extra=.
+    """
+    
+    STRUCTURED_FIELDS = ("user_activity", "app_error")
+    
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        for field in self.STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class PipelineQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the handlers behind the queue.
+    
+    The standard QueueHandler formats the record, folding the traceback into
+    the message, so JsonFormatter would never see the exception. Here only
+    the message arguments are merged and the traceback is kept in exc_text
+    (exc_info can't cross the queue to another process or thread safely).
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_exception_formatter = logging.Formatter()
+
+ACTIVITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_activity (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    action TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_user_activity_user ON user_activity (user_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_user_activity_action ON user_activity (action, timestamp);
+"""
+
+class ActivitySinkHandler(logging.Handler):
+    """
+    Batched writer of user activity records into a SQLite database.
+    
+    Only records logged with Logger.log_user_activity are accepted. They are
+    buffered and inserted in one transaction when batch_size records are
+    waiting or flush_interval seconds have passed.
+    """
+    
+    def __init__(self, db_path, batch_size=100, flush_interval=0.5):
+        """
+        Initialize the sink.
+        
+        Args:
+            db_path (str): Path of the SQLite database.
+            batch_size (int): Number of buffered records that triggers a write.
+            flush_interval (float): Maximum time in seconds a record stays buffered.
+        """
+        super().__init__()
+        self.addFilter(lambda record: hasattr(record, "user_activity"))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(ACTIVITY_SCHEMA)
+        
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="activity-sink", daemon=True)
+        self._flusher.start()
+    
+    def emit(self, record):
+        activity = record.user_activity
+        row = (
+            activity.get("user_id"),
+            activity.get("action"),
+            activity.get("timestamp"),
+            json.dumps(activity["details"], ensure_ascii=False, default=str) if "details" in activity else None,
         )
+        with self._buffer_lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+    
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return
+        
+        with self.lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO user_activity (user_id, action, timestamp, details) VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                print(f"Error writing user activity: {e}")
+    
+    def close(self):
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+        with self.lock:
+            self._conn.close()
+        super().close()
+
+def query_user_activity(user_id=None, action=None, since=None, limit=100, db_path=None):
+    """
+    Query recorded user activity, newest first.
+    
+    Records still buffered by the sink are not included.
+    
+    Args:
+        user_id (str, optional): Only activity of this user.
+        action (str, optional): Only this action.
+        since (str, optional): Only activity at or after this ISO timestamp.
+        limit (int): Maximum number of rows.
+        db_path (str, optional): Database path. Defaults to ACTIVITY_SINK["path"].
+        
+    Returns:
+        list: Activity dicts with user_id, action, timestamp and details.
+    """
+    db_path = db_path or ACTIVITY_SINK["path"]
+    if not os.path.exists(db_path):
+        return []
+    
+    conditions, params = [], []
+    for column, operator, value in (("user_id", "=", user_id), ("action", "=", action), ("timestamp", ">=", since)):
+        if value is not None:
+            conditions.append(f"{column} {operator} ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            f"SELECT user_id, action, timestamp, details FROM user_activity {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+    finally:
+        conn.close()
+    
+    return [
+        {"user_id": row[0], "action": row[1], "timestamp": row[2], "details": json.loads(row[3]) if row[3] else None}
+        for row in rows
+    ]
+
+def wait_for_log_compression():
+    """
+    Block until all rolled log files have been compressed.
+    """
+    _compression_queue.join()
+
+_pipeline_lock = threading.Lock()
+_queue_handler = None
+_listener = None
+
+def configure_logging(log_to_file=True):
+    """
+    Set up the shared logging pipeline once per process.
+    
+    Loggers only put records on a queue; a QueueListener thread formats them
+    and writes them to the console, the log file and the user activity sink,
+    so no disk I/O happens on the caller's thread.
+    
+    Args:
+        log_to_file (bool): Whether to log to a file.
+        
+    Returns:
+        logging.Handler: The queue handler shared by all application loggers.
+    """
+    global _queue_handler, _listener
+    
+    with _pipeline_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+        
+        # Create formatter
+        formatter = JsonFormatter() if LOG_OUTPUT_FORMAT == "json" else logging.Formatter(LOG_FORMAT)
         
         # Create console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        handlers = [console_handler]
         
         # Create file handler if enabled
         if log_to_file:
-            # Create logs directory if it doesn't exist
-            logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-            os.makedirs(logs_dir, exist_ok=True)
+            # Daily log file rotated by size and compressed in the background
+            file_handler = RotatingLogFileHandler(
+                LOGS_DIR,
+                max_bytes=LOG_ROTATION["max_bytes"],
+                backup_count=LOG_ROTATION["backup_count"],
+            )
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
             
-            # Create log file with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d")
-            log_file = os.path.join(logs_dir, f"brainventure_{timestamp}.log")
+            # Queryable store of user activity
+            handlers.append(ActivitySinkHandler(
+                ACTIVITY_SINK["path"],
+                batch_size=ACTIVITY_SINK["batch_size"],
+                flush_interval=ACTIVITY_SINK["flush_interval"],
+            ))
+        
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        
+        _queue_handler = PipelineQueueHandler(log_queue)
+        _queue_handler.brainventure_pipeline = True
+        return _queue_handler
+
+def shutdown_logging():
+    """
+    Write out all queued records, stop the logging thread and finish
+    compressing rolled log files.
+    """
+    global _listener
+    with _pipeline_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+    wait_for_log_compression()
+
+class RateLimiter:
+    """
+    Fixed one-second windows counting messages per key.
+    """
+    
+    def __init__(self, clock=time.monotonic):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            clock (callable): Time source in seconds.
+        """
+        self.clock = clock
+        self._windows = {}
+        self._lock = threading.Lock()
+    
+    def allow(self, key, limit):
+        """
+        Count a message and decide whether it may be logged.
+        
+        Args:
+            key (hashable): Rate limit key.
+            limit (int): Maximum number of messages per second.
             
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+        Returns:
+            tuple: (allowed, suppressed) where suppressed is the number of
+                messages dropped in the previous window, reported once with
+                the first message allowed after it.
+        """
+        now = self.clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= 1.0:
+                # [window start, messages logged, messages suppressed]
+                suppressed = window[2] if window is not None else 0
+                window = self._windows[key] = [now, 0, 0]
+            else:
+                suppressed = 0
+            
+            if window[1] >= limit:
+                window[2] += 1
+                return False, 0
+            
+            window[1] += 1
+            return True, suppressed
+
+_rate_limiter = RateLimiter()
+
+class Logger:
+    """
+    Custom logger class for the BrainVenture application.
+    """
     
-    def info(self, message, *args, **kwargs):
+    def __init__(self, name="brainventure", log_level=logging.INFO, log_to_file=True):
+        """
+        Initialize the logger.
+        
+        Args:
+            name (str): Name for the logger
+            log_level (int): Logging level (e.g., logging.INFO)
+            log_to_file (bool): Whether to log to a file (used when the shared
+                pipeline is configured by the first logger)
+        """
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(log_level)
+        
+        # Attach the shared queue handler exactly once per named logger,
+        # replacing handlers left by an earlier import of this module (e.g. a
+        # Streamlit module reload)
+        queue_handler = configure_logging(log_to_file)
+        for handler in list(self.logger.handlers):
+            if getattr(handler, "brainventure_pipeline", False) and handler is not queue_handler:
+                self.logger.removeHandler(handler)
+        if queue_handler not in self.logger.handlers:
+            self.logger.addHandler(queue_handler)
+    
+    def _log(self, level, message, args, kwargs, rate_limit, rate_key):
+        """
+        Log a message, optionally rate limited.
+        
+        Args:
+            level (int): Logging level.
+            message (str): Message to log.
+            args (tuple): Message arguments.
+            kwargs (dict): Keyword arguments for logging.Logger.log.
+            rate_limit (int): Maximum number of messages per second for the
+                rate key, or None for no limit.
+            rate_key (str): Rate limit key. Defaults to the call site.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        if rate_limit is not None:
+            if rate_key is None:
+                caller = sys._getframe(2)
+                rate_key = f"{caller.f_code.co_filename}:{caller.f_lineno}"
+            allowed, suppressed = _rate_limiter.allow((self.logger.name, rate_key), rate_limit)
+            if not allowed:
+                return
+            if suppressed:
+                self.logger.log(level, f"Suppressed {suppressed} messages from {rate_key} in the last second", stacklevel=3)
+        
+        kwargs.setdefault("stacklevel", 3)
+        self.logger.log(level, message, *args, **kwargs)
+    
+    def info(self, message, *args, rate_limit=None, rate_key=None, **kwargs):
         """Log an info message."""
-        self.logger.info(message, *args, **kwargs)
+        self._log(logging.INFO, message, args, kwargs, rate_limit, rate_key)
     
-    def warning(self, message, *args, **kwargs):
+    def warning(self, message, *args, rate_limit=None, rate_key=None, **kwargs):
         """Log a warning message."""
-        self.logger.warning(message, *args, **kwargs)
+        self._log(logging.WARNING, message, args, kwargs, rate_limit, rate_key)
     
-    def error(self, message, *args, **kwargs):
+    def error(self, message, *args, rate_limit=None, rate_key=None, **kwargs):
         """Log an error message."""
-        self.logger.error(message, *args, **kwargs)
+        self._log(logging.ERROR, message, args, kwargs, rate_limit, rate_key)
     
-    def debug(self, message, *args, **kwargs):
+    def debug(self, message, *args, rate_limit=None, rate_key=None, **kwargs):
         """Log a debug message."""
-        self.logger.debug(message, *args, **kwargs)
+        self._log(logging.DEBUG, message, args, kwargs, rate_limit, rate_key)
     
-    def critical(self, message, *args, **kwargs):
+    def critical(self, message, *args, rate_limit=None, rate_key=None, **kwargs):
         """Log a critical message."""
-        self.logger.critical(message, *args, **kwargs)
+        self._log(logging.CRITICAL, message, args, kwargs, rate_limit, rate_key)
     
     def log_user_activity(self, user_id, action, details=None):
         """
@@ -86,7 +553,7 @@ class Logger:
         if details:
             log_data["details"] = details
         
-        self.info(f"User Activity: {action}", extra={"user_activity": log_data})
+        self.info(f"User Activity: {action}", extra={"user_activity": log_data}, stacklevel=4)
     
     def log_error(self, error_type, error_message, details=None):
         """
@@ -106,17 +573,23 @@ class Logger:
         if details:
             log_data["details"] = details
         
-        self.error(f"Application Error: {error_type} - {error_message}", extra={"app_error": log_data})
+        self.error(f"Application Error: {error_type} - {error_message}", extra={"app_error": log_data}, stacklevel=4)
+
+# Registry of application loggers by name
+_loggers = {}
+_loggers_lock = threading.Lock()
 
 # Create a default logger instance
 default_logger = Logger()
+_loggers[default_logger.logger.name] = default_logger
 
 def get_logger(name=None):
     """
     Get the application logger instance.
     
     Args:
-        name (str, optional): Logger name. If provided, creates a new logger with the given name.
+        name (str, optional): Logger name. If provided, returns the logger registered
+                             under that name, creating it on first use.
                              If None, returns the default logger.
     
     Returns:
@@ -124,5 +597,9 @@ def get_logger(name=None):
     """
     if name is None:
         return default_logger
-    else:
-        return Logger(name=name)
+    
+    with _loggers_lock:
+        logger = _loggers.get(name)
+        if logger is None:
+            logger = _loggers[name] = Logger(name=name)
+        return logger
@@ -0,0 +1,321 @@
+"""
+In-process metrics registry for the BrainVenture application.
+
+Counters and latency histograms are kept in memory, keyed by metric name and
+labels. Recording is switched off by default (BRAINVENTURE_METRICS=1 enables
+it); when disabled, instrumented functions only pay for a flag check.
+
+With BRAINVENTURE_METRICS_PORT set, the metrics are served in the Prometheus
+text format on http://127.0.0.1:<port>/metrics by a background thread of the
+application process.
+"""
+
+import os
+import time
+import bisect
+import functools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Prefix of all exported metric names
+METRIC_PREFIX = "brainventure_"
+
+class Histogram:
+    """
+    Histogram with fixed bucket bounds.
+    """
+
+    __slots__ = ("bounds", "bucket_counts", "count", "total")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        """
+        Create an empty histogram.
+
+        Args:
+            bounds (tuple): Sorted upper bounds of the buckets; values above
+                the last bound fall into an overflow bucket.
+        """
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): Observed value.
+        """
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self):
+        """
+        Get the histogram data.
+
+        Returns:
+            dict: Bucket bounds and counts (non-cumulative, last one is the
+                overflow bucket), count and sum.
+        """
+        return {
+            "bounds": self.bounds,
+            "buckets": list(self.bucket_counts),
+            "count": self.count,
+            "sum": self.total,
+        }
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and histograms.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled (bool): Whether instrumented code records metrics.
+        """
+        self.enabled = enabled
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items())) if labels else ()
+
+    def increment(self, name, amount=1, **labels):
+        """
+        Increase a counter (ignored while the registry is disabled).
+
+        Args:
+            name (str): Metric name.
+            amount (int): Increment.
+            **labels: Metric labels.
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """
+        Add a value to a histogram (ignored while the registry is disabled).
+
+        Args:
+            name (str): Metric name.
+            value (float): Observed value.
+            **labels: Metric labels.
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_call(self, function, duration, error=None):
+        """
+        Record one call of an instrumented function.
+
+        Args:
+            function (str): Qualified function name.
+            duration (float): Call duration in seconds.
+            error (Exception, optional): Exception raised by the call.
+        """
+        self.increment("function_calls_total", function=function)
+        self.observe("function_latency_seconds", duration, function=function)
+        if error is not None:
+            self.increment("function_exceptions_total", function=function, exception=type(error).__name__)
+
+    def snapshot(self):
+        """
+        Get a copy of all metrics.
+
+        Returns:
+            dict: "counters" and "histograms", each a list of
+                (name, labels dict, value) tuples.
+        """
+        with self._lock:
+            counters = [(name, dict(labels), value) for (name, labels), value in self._counters.items()]
+            histograms = [(name, dict(labels), histogram.snapshot()) for (name, labels), histogram in self._histograms.items()]
+        return {"counters": counters, "histograms": histograms}
+
+    def reset(self):
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+_registry = MetricsRegistry(enabled=os.environ.get("BRAINVENTURE_METRICS", "0") == "1")
+
+def get_metrics_registry():
+    """
+    Get the shared metrics registry.
+
+    Returns:
+        MetricsRegistry: The registry.
+    """
+    return _registry
+
+def function_name(func):
+    """
+    Get the metric label of a function.
+
+    Args:
+        func (callable): The function.
+
+    Returns:
+        str: Module and qualified name, e.g. 'utils.helpers.load_user_data'.
+    """
+    return f"{func.__module__}.{func.__qualname__}"
+
+def timed(func):
+    """
+    Decorator recording calls, latency and exceptions of a function.
+
+    Args:
+        func: The function to decorate.
+
+    Returns:
+        The decorated function.
+    """
+    name = function_name(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _registry.enabled:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        error = None
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _registry.record_call(name, time.perf_counter() - start, error)
+    return wrapper
+
+def _format_labels(labels, extra=None):
+    """Format labels as {name="value",...}."""
+    items = list(labels.items()) + (list(extra.items()) if extra else [])
+    if not items:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for name, value in items
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+def render_prometheus(registry=None):
+    """
+    Render metrics in the Prometheus text exposition format.
+
+    Args:
+        registry (MetricsRegistry, optional): Registry to render. Defaults to the shared one.
+
+    Returns:
+        str: Metrics text.
+    """
+    snapshot = (registry or _registry).snapshot()
+    lines = []
+
+    counters = {}
+    for name, labels, value in snapshot["counters"]:
+        counters.setdefault(name, []).append((labels, value))
+    for name in sorted(counters):
+        lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+        for labels, value in counters[name]:
+            lines.append(f"{METRIC_PREFIX}{name}{_format_labels(labels)} {value}")
+
+    histograms = {}
+    for name, labels, data in snapshot["histograms"]:
+        histograms.setdefault(name, []).append((labels, data))
+    for name in sorted(histograms):
+        metric = METRIC_PREFIX + name
+        lines.append(f"# TYPE {metric} histogram")
+        for labels, data in histograms[name]:
+            cumulative = 0
+            for bound, count in zip(data["bounds"], data["buckets"]):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_format_labels(labels, {'le': bound})} {cumulative}")
+            lines.append(f"{metric}_bucket{_format_labels(labels, {'le': '+Inf'})} {data['count']}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {data['sum']}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {data['count']}")
+
+    return "\n".join(lines) + "\n"
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serve GET /metrics."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are not worth a log line each
+        pass
+
+_server = None
+_server_lock = threading.Lock()
+# Set when binding failed, so page reruns don't retry (and print the error) every time
+_server_failed = False
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Serve the metrics on a local port from a background thread.
+    Calling it again after the server has started, or after binding failed,
+    does nothing.
+
+    Args:
+        port (int): TCP port (0 picks a free one).
+        host (str): Interface to bind.
+
+    Returns:
+        ThreadingHTTPServer: The server, or None if the port is unavailable.
+    """
+    global _server, _server_failed
+    with _server_lock:
+        if _server is not None or _server_failed:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+        except OSError as e:
+            _server_failed = True
+            print(f"Could not start metrics server on {host}:{port}: {e}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
+
+def start_metrics_server_from_env():
+    """
+    Start the metrics server if BRAINVENTURE_METRICS_PORT is set (see run_app.py).
+
+    Returns:
+        ThreadingHTTPServer: The server, or None if not configured.
+    """
+    if _server is not None or _server_failed:
+        return _server
+    port = os.environ.get("BRAINVENTURE_METRICS_PORT")
+    if not port:
+        return None
+    return start_metrics_server(int(port))
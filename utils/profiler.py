@@ -0,0 +1,353 @@
+"""
+Per-rerun profiler for the BrainVenture application.
+
+In debug mode (st.session_state["debug_mode"], or the ?debug=1 query
+parameter when BRAINVENTURE_DEV=1) each page rerun records the wall time of its phases (page setup,
+CSS/JS injection, sidebar, content and user data loads, charts) and shows a
+waterfall with totals in the sidebar. Outside debug mode the phase markers
+only check a thread-local attribute.
+
+On request (BRAINVENTURE_PROFILE=1, or the ?profile=1 query parameter when
+BRAINVENTURE_DEV=1) whole page reruns are also captured with cProfile into
+the profiles directory. Query parameters are ignored otherwise, so visitors
+cannot switch these modes on.
+"""
+
+import os
+import re
+import time
+import pstats
+import cProfile
+import functools
+import threading
+from datetime import datetime
+from collections import namedtuple
+from contextlib import contextmanager
+
+import streamlit as st
+
+from utils.metrics import get_metrics_registry, start_metrics_server_from_env
+from utils.lazy_import import warm_up
+
+# Allows the ?debug=1 and ?profile=1 query parameters (development only)
+DEV_MODE = os.environ.get("BRAINVENTURE_DEV", "0") == "1"
+
+PROFILE_CAPTURE = {
+    "enabled": os.environ.get("BRAINVENTURE_PROFILE", "0") == "1",
+    "dir": os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles"),
+    # Number of captures (.prof + .collapsed.txt pairs) kept
+    "keep": int(os.environ.get("BRAINVENTURE_PROFILE_KEEP", "20")),
+}
+
+# Phase timing relative to the start of the rerun, in seconds
+Phase = namedtuple("Phase", ["name", "start", "duration", "depth"])
+
+# Streamlit runs each script rerun on its own thread
+_local = threading.local()
+
+# Only one cProfile profiler can be active per process (Python 3.12+ raises
+# ValueError for a second one), so concurrent reruns skip the capture
+_capture_lock = threading.Lock()
+
+metrics = get_metrics_registry()
+
+class RerunProfiler:
+    """
+    Wall-time phases of a single page rerun.
+    """
+
+    def __init__(self, page):
+        """
+        Start profiling a rerun.
+
+        Args:
+            page (str): Page name.
+        """
+        self.page = page
+        self.phases = []
+        self.depth = 0
+        self.started = time.perf_counter()
+        self.total = None
+
+    def finish(self):
+        """Stop the rerun clock."""
+        self.total = time.perf_counter() - self.started
+
+    def totals(self):
+        """
+        Sum the time of top-level phases by name.
+
+        Nested phases (e.g. a content load inside the sidebar) are counted in
+        their own total but not again in their parent's.
+
+        Returns:
+            list: (name, seconds, calls) sorted by time, including a
+                "rendering" entry for time outside recorded phases.
+        """
+        totals = {}
+        for phase in self.phases:
+            seconds, calls, nested = totals.get(phase.name, (0.0, 0, 0.0))
+            totals[phase.name] = (seconds + phase.duration, calls + 1, nested)
+
+        # Subtract nested phases from the phase that contains them
+        for phase in self.phases:
+            if phase.depth == 0:
+                continue
+            parent = self._parent(phase)
+            if parent is not None:
+                seconds, calls, nested = totals[parent.name]
+                totals[parent.name] = (seconds, calls, nested + phase.duration)
+
+        result = [(name, seconds - nested, calls) for name, (seconds, calls, nested) in totals.items()]
+        total = self.total if self.total is not None else time.perf_counter() - self.started
+        covered = sum(phase.duration for phase in self.phases if phase.depth == 0)
+        result.append(("rendering", max(0.0, total - covered), 1))
+        return sorted(result, key=lambda item: item[1], reverse=True)
+
+    def _parent(self, phase):
+        """Return the innermost phase that encloses a nested phase."""
+        for candidate in reversed(self.phases):
+            if (candidate.depth == phase.depth - 1 and candidate.start <= phase.start
+                    and candidate.start + candidate.duration >= phase.start + phase.duration):
+                return candidate
+        return None
+
+def get_active_profiler():
+    """
+    Get the profiler of the current rerun.
+
+    Returns:
+        RerunProfiler: The profiler, or None if the rerun is not profiled.
+    """
+    return getattr(_local, "profiler", None)
+
+@contextmanager
+def profile_phase(name):
+    """
+    Record a block as a phase of the current rerun.
+    Does nothing if the rerun is not profiled.
+
+    Args:
+        name (str): Phase name.
+    """
+    profiler = getattr(_local, "profiler", None)
+    if profiler is None:
+        yield
+        return
+
+    profiler.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        profiler.depth -= 1
+        profiler.phases.append(Phase(name, start - profiler.started, end - start, profiler.depth))
+
+def profiled(name):
+    """
+    Decorator recording every call of a function as a rerun phase.
+
+    Args:
+        name (str): Phase name.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "profiler", None) is None:
+                return func(*args, **kwargs)
+            with profile_phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def is_debug_mode():
+    """
+    Check whether debug mode is on for the current session.
+    With BRAINVENTURE_DEV=1, the ?debug=1 query parameter turns it on for the session.
+
+    Returns:
+        bool: True in debug mode.
+    """
+    if DEV_MODE and st.query_params.get("debug") == "1":
+        st.session_state["debug_mode"] = True
+    return st.session_state.get("debug_mode", False)
+
+def is_capture_requested():
+    """
+    Check whether page reruns should be captured with cProfile.
+
+    Returns:
+        bool: True if BRAINVENTURE_PROFILE=1, or BRAINVENTURE_DEV=1 and the
+            ?profile=1 query parameter is set.
+    """
+    return PROFILE_CAPTURE["enabled"] or (DEV_MODE and st.query_params.get("profile") == "1")
+
+def _frame_label(func):
+    """Format a pstats function key as 'module.py:function'."""
+    file_name, line, name = func
+    return name if file_name == "~" else f"{os.path.basename(file_name)}:{name}"
+
+def collapsed_stacks(stats):
+    """
+    Convert cProfile statistics to collapsed stacks for flame graph tools.
+
+    cProfile only keeps caller/callee pairs, so each function's own time is
+    attributed to the stack formed by following its most expensive caller.
+
+    Args:
+        stats (pstats.Stats): Profile statistics.
+
+    Returns:
+        list: Lines 'root;...;function microseconds'.
+    """
+    entries = stats.stats
+    lines = []
+    for func, (_, _, own_time, _, callers) in entries.items():
+        microseconds = int(own_time * 1_000_000)
+        if microseconds <= 0:
+            continue
+
+        stack = [func]
+        seen = {func}
+        while callers and len(stack) < 64:
+            # callers maps caller -> (primitive calls, calls, own time, cumulative time)
+            caller = max(callers, key=lambda key: callers[key][3])
+            if caller in seen:
+                break
+            stack.append(caller)
+            seen.add(caller)
+            callers = entries[caller][4] if caller in entries else None
+
+        lines.append(f"{';'.join(_frame_label(frame) for frame in reversed(stack))} {microseconds}")
+    return lines
+
+def save_profile_capture(profile, page):
+    """
+    Write a cProfile capture and prune old captures.
+
+    Args:
+        profile (cProfile.Profile): Finished profile.
+        page (str): Page name.
+
+    Returns:
+        str: Path of the written .prof file.
+    """
+    profiles_dir = PROFILE_CAPTURE["dir"]
+    os.makedirs(profiles_dir, exist_ok=True)
+
+    slug = re.sub(r"\W+", "_", page.lower()).strip("_") or "page"
+    base = os.path.join(profiles_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{slug}")
+    profile.dump_stats(f"{base}.prof")
+    with open(f"{base}.collapsed.txt", "w", encoding="utf-8") as f:
+        f.write("\n".join(collapsed_stacks(pstats.Stats(profile))) + "\n")
+
+    # File names start with the timestamp, so sorting them orders captures by age
+    captures = sorted(name[:-5] for name in os.listdir(profiles_dir) if name.endswith(".prof"))
+    for old in captures[:max(0, len(captures) - PROFILE_CAPTURE["keep"])]:
+        for suffix in (".prof", ".collapsed.txt"):
+            path = os.path.join(profiles_dir, old + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+    return f"{base}.prof"
+
+def profiled_page(page):
+    """
+    Decorator for a page's main() that profiles the rerun in debug mode and
+    shows the profiler panel in the sidebar. If requested, the rerun is also
+    captured with cProfile (see save_profile_capture), unless another rerun
+    of the process is being captured at the same time. The rerun duration is
+    recorded in the page_rerun_seconds metric. After the first rendered page
+    the heavy modules are preloaded in the background (see
+    utils.lazy_import.warm_up).
+
+    Args:
+        page (str): Page name.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(main):
+        @functools.wraps(main)
+        def wrapper(*args, **kwargs):
+            result = run(*args, **kwargs)
+            warm_up()
+            return result
+
+        def run(*args, **kwargs):
+            start_metrics_server_from_env()
+            debug = is_debug_mode()
+            capture = is_capture_requested()
+            if capture and not _capture_lock.acquire(blocking=False):
+                metrics.increment("profile_captures_skipped_total", page=page)
+                capture = False
+            if not debug and not capture:
+                if not metrics.enabled:
+                    return main(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return main(*args, **kwargs)
+                finally:
+                    metrics.observe("page_rerun_seconds", time.perf_counter() - start, page=page)
+
+            profiler = _local.profiler = RerunProfiler(page) if debug else None
+            profile = cProfile.Profile() if capture else None
+            start = time.perf_counter()
+            try:
+                if profile is not None:
+                    profile.enable()
+                result = main(*args, **kwargs)
+            finally:
+                metrics.observe("page_rerun_seconds", time.perf_counter() - start, page=page)
+                if profile is not None:
+                    profile.disable()
+                    try:
+                        # Also keep captures of reruns interrupted by st.rerun()
+                        save_profile_capture(profile, page)
+                    finally:
+                        _capture_lock.release()
+                _local.profiler = None
+                if profiler is not None:
+                    profiler.finish()
+            if profiler is not None:
+                render_profiler_panel(profiler)
+            return result
+        return wrapper
+    return decorator
+
+def render_profiler_panel(profiler):
+    """
+    Show the rerun waterfall and phase totals in the sidebar.
+
+    Args:
+        profiler (RerunProfiler): Finished profiler.
+    """
+    import plotly.graph_objects as go
+
+    with st.sidebar.expander(f"⏱️ Profiler: {profiler.total * 1000:.1f} ms", expanded=False):
+        phases = sorted(profiler.phases, key=lambda phase: phase.start)
+        if phases:
+            labels = [f"{'  ' * phase.depth}{phase.name} #{i + 1}" for i, phase in enumerate(phases)]
+            fig = go.Figure(go.Bar(
+                y=labels,
+                x=[phase.duration * 1000 for phase in phases],
+                base=[phase.start * 1000 for phase in phases],
+                orientation="h",
+                marker_color=["#3498db" if phase.depth == 0 else "#95a5a6" for phase in phases],
+            ))
+            fig.update_layout(
+                height=max(200, 24 * len(phases)),
+                margin=dict(l=0, r=0, t=10, b=0),
+                xaxis_title="ms",
+                yaxis=dict(autorange="reversed"),
+                showlegend=False,
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.markdown("\n".join(
+            f"- **{name}**: {seconds * 1000:.1f} ms" + (f" ({calls}×)" if calls > 1 else "")
+            for name, seconds, calls in profiler.totals()
+        ))
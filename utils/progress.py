@@ -0,0 +1,369 @@
+"""
+Course progress tracking for the BrainVenture application.
+
+Completed lessons are kept as a bitmap over the lesson index, so membership
+tests and per-block or per-module counts are cheap bit operations for every
+page (including the sidebar) and for cohort-level aggregation.
+"""
+
+import threading
+from collections import OrderedDict
+
+from config.course_index import get_lesson_index
+from utils.helpers import calculate_progress, load_user_data
+
+class CompletionBitmap:
+    """
+    Completed lessons of a user as a bitmap over lesson index ordinals.
+
+    Bit n is set if the lesson with ordinal n is completed, so membership is a
+    bit test and counts over a block or module are popcounts of a bit slice.
+    The whole course state serializes to (lesson count / 8) bytes.
+    """
+
+    __slots__ = ("lesson_index", "bits")
+
+    def __init__(self, lesson_index, bits=0):
+        """
+        Create the bitmap.
+
+        Args:
+            lesson_index (LessonIndex): Index of all course lessons.
+            bits (int, optional): Initial bits. Defaults to 0 (nothing completed).
+        """
+        self.lesson_index = lesson_index
+        self.bits = bits
+
+    @classmethod
+    def from_lessons(cls, lesson_index, lesson_ids):
+        """
+        Build a bitmap from the legacy list of completed lesson IDs.
+        Unknown IDs are ignored.
+
+        Args:
+            lesson_index (LessonIndex): Index of all course lessons.
+            lesson_ids (iterable): Completed lesson IDs.
+
+        Returns:
+            CompletionBitmap: The bitmap.
+        """
+        bits = 0
+        for lesson_id in lesson_ids:
+            ordinal = lesson_index.ordinal(lesson_id)
+            if ordinal is not None:
+                bits |= 1 << ordinal
+        return cls(lesson_index, bits)
+
+    @classmethod
+    def from_bytes(cls, lesson_index, data):
+        """
+        Restore a bitmap serialized with to_bytes.
+
+        Args:
+            lesson_index (LessonIndex): Index of all course lessons.
+            data (bytes): Serialized bitmap.
+
+        Returns:
+            CompletionBitmap: The bitmap.
+        """
+        return cls(lesson_index, int.from_bytes(data, "little"))
+
+    def to_bytes(self):
+        """
+        Serialize the bitmap.
+
+        Returns:
+            bytes: Little-endian bits, one byte per eight lessons.
+        """
+        return self.bits.to_bytes((len(self.lesson_index) + 7) // 8, "little")
+
+    def to_lessons(self):
+        """
+        Convert the bitmap to the legacy list of completed lesson IDs.
+
+        Returns:
+            list: Completed lesson IDs in course order.
+        """
+        return [lesson.id for lesson in self.lesson_index.lessons if self.bits >> lesson.ordinal & 1]
+
+    def add(self, lesson_id):
+        """
+        Mark a lesson as completed.
+
+        Args:
+            lesson_id (str): Lesson ID.
+
+        Returns:
+            bool: True if the lesson was newly completed, False otherwise.
+        """
+        ordinal = self.lesson_index.ordinal(lesson_id)
+        if ordinal is None or self.bits >> ordinal & 1:
+            return False
+        self.bits |= 1 << ordinal
+        return True
+
+    def __contains__(self, lesson_id):
+        ordinal = self.lesson_index.ordinal(lesson_id)
+        return ordinal is not None and bool(self.bits >> ordinal & 1)
+
+    def count(self, ordinals=None):
+        """
+        Count completed lessons.
+
+        Args:
+            ordinals (range, optional): Lesson ordinals to count, as returned by
+                LessonIndex.block_range or module_range. Defaults to the whole course.
+
+        Returns:
+            int: Number of completed lessons.
+        """
+        if ordinals is None:
+            return self.bits.bit_count()
+        return _slice_bits(self.bits, ordinals).bit_count()
+
+def _slice_bits(bits, ordinals):
+    """Return the bits of an ordinal range, shifted to start at bit 0."""
+    return (bits >> ordinals.start) & ((1 << len(ordinals)) - 1)
+
+def aggregate_completion(lesson_index, bitmaps):
+    """
+    Aggregate the progress of a cohort of users.
+
+    Args:
+        lesson_index (LessonIndex): Index of all course lessons.
+        bitmaps (iterable): CompletionBitmap or raw int bits per user.
+
+    Returns:
+        dict: Number of users, completions per lesson ordinal and average
+            progress per block (0-100).
+    """
+    users = 0
+    lesson_counts = [0] * len(lesson_index)
+    block_completed = [0] * len(lesson_index.blocks)
+
+    for bitmap in bitmaps:
+        bits = bitmap.bits if isinstance(bitmap, CompletionBitmap) else bitmap
+        users += 1
+        for block in lesson_index.blocks:
+            block_completed[block.index] += _slice_bits(bits, block.lessons).bit_count()
+        # Visit only set bits
+        while bits:
+            lowest = bits & -bits
+            lesson_counts[lowest.bit_length() - 1] += 1
+            bits ^= lowest
+
+    block_percent = [
+        calculate_progress(block_completed[block.index], users * len(block.lessons))
+        for block in lesson_index.blocks
+    ]
+    return {"users": users, "lesson_counts": lesson_counts, "block_percent": block_percent}
+
+class ProgressTracker:
+    """
+    Completed lessons of a single user.
+    """
+
+    def __init__(self, lesson_index, completed_lessons=()):
+        """
+        Build the tracker.
+
+        Args:
+            lesson_index (LessonIndex): Index of all course lessons.
+            completed_lessons (iterable): IDs of lessons the user has completed.
+        """
+        self.lesson_index = lesson_index
+        self.bitmap = CompletionBitmap(lesson_index)
+        # Ordinal of the first lesson that may still be incomplete
+        self._next_ordinal = 0
+        # Length of the user's completed_lessons list this tracker reflects
+        self.synced_length = 0
+
+        for lesson_id in completed_lessons:
+            self.mark_completed(lesson_id)
+            self.synced_length += 1
+
+    def mark_completed(self, lesson_id):
+        """
+        Mark a lesson as completed.
+
+        Args:
+            lesson_id (str): Lesson ID.
+
+        Returns:
+            bool: True if the lesson was newly completed, False otherwise.
+        """
+        if not self.bitmap.add(lesson_id):
+            return False
+
+        # Advance past the completed prefix of the course
+        bits = self.bitmap.bits
+        while self._next_ordinal < len(self.lesson_index) and bits >> self._next_ordinal & 1:
+            self._next_ordinal += 1
+        return True
+
+    def is_completed(self, lesson_id):
+        """
+        Check whether a lesson is completed.
+
+        Args:
+            lesson_id (str): Lesson ID.
+
+        Returns:
+            bool: True if completed.
+        """
+        return lesson_id in self.bitmap
+
+    @property
+    def completed_count(self):
+        """Number of completed lessons."""
+        return self.bitmap.count()
+
+    @property
+    def total_count(self):
+        """Number of lessons in the course."""
+        return len(self.lesson_index)
+
+    def overall_percent(self):
+        """
+        Get overall course progress.
+
+        Returns:
+            float: Progress percentage (0-100).
+        """
+        return calculate_progress(self.completed_count, self.total_count)
+
+    def block_counts(self, block_index):
+        """
+        Get completed and total lesson counts for a block.
+
+        Args:
+            block_index (int): Zero-based block index.
+
+        Returns:
+            tuple: (completed, total)
+        """
+        ordinals = self.lesson_index.block_range(block_index)
+        return self.bitmap.count(ordinals), len(ordinals)
+
+    def block_percent(self, block_index):
+        """
+        Get progress for a block.
+
+        Args:
+            block_index (int): Zero-based block index.
+
+        Returns:
+            float: Progress percentage (0-100).
+        """
+        return calculate_progress(*self.block_counts(block_index))
+
+    def module_counts(self, block_index, module_index):
+        """
+        Get completed and total lesson counts for a module.
+
+        Args:
+            block_index (int): Zero-based block index.
+            module_index (int): Zero-based module index within the block.
+
+        Returns:
+            tuple: (completed, total)
+        """
+        ordinals = self.lesson_index.module_range(block_index, module_index)
+        return self.bitmap.count(ordinals), len(ordinals)
+
+    def module_percent(self, block_index, module_index):
+        """
+        Get progress for a module.
+
+        Args:
+            block_index (int): Zero-based block index.
+            module_index (int): Zero-based module index within the block.
+
+        Returns:
+            float: Progress percentage (0-100).
+        """
+        return calculate_progress(*self.module_counts(block_index, module_index))
+
+    def next_lesson(self):
+        """
+        Get the first lesson the user has not completed yet.
+
+        Returns:
+            Lesson: The next lesson, or None if the course is finished.
+        """
+        lessons = self.lesson_index.lessons
+        if self._next_ordinal < len(lessons):
+            return lessons[self._next_ordinal]
+        return None
+
+# Number of users whose tracker is kept, least recently used evicted first
+TRACKER_CACHE_LIMIT = 1024
+
+_trackers = OrderedDict()
+_trackers_lock = threading.Lock()
+
+def get_progress_tracker(user_id="default_user", user_data=None):
+    """
+    Get the shared progress tracker for a user.
+
+    Trackers are built once per user and course version and kept for the
+    TRACKER_CACHE_LIMIT most recently used users. If user data is passed and
+    its completed lessons don't match the tracker, it is rebuilt.
+
+    Args:
+        user_id (str, optional): User ID. Defaults to "default_user".
+        user_data (dict, optional): Already loaded user data.
+
+    Returns:
+        ProgressTracker: The user's tracker.
+    """
+    lesson_index = get_lesson_index()
+
+    with _trackers_lock:
+        tracker = _trackers.get(user_id)
+        if tracker is not None:
+            _trackers.move_to_end(user_id)
+
+    if tracker is not None and tracker.lesson_index is lesson_index:
+        if user_data is None:
+            return tracker
+        completed = user_data.get("progress", {}).get("completed_lessons", [])
+        if len(completed) == tracker.synced_length:
+            return tracker
+
+    if user_data is None:
+        user_data = load_user_data(user_id) or {}
+
+    completed = user_data.get("progress", {}).get("completed_lessons", [])
+    tracker = ProgressTracker(lesson_index, completed)
+    with _trackers_lock:
+        _trackers[user_id] = tracker
+        _trackers.move_to_end(user_id)
+        while len(_trackers) > TRACKER_CACHE_LIMIT:
+            _trackers.popitem(last=False)
+    return tracker
+
+def record_lesson_completed(user_data, lesson_id, user_id="default_user"):
+    """
+    Add a lesson to the user's completed lessons and update their tracker.
+    The caller is responsible for saving the user data.
+
+    Args:
+        user_data (dict): User data to update.
+        lesson_id (str): Lesson ID.
+        user_id (str, optional): User ID. Defaults to "default_user".
+
+    Returns:
+        bool: True if the lesson was newly completed, False otherwise.
+    """
+    progress = user_data.setdefault("progress", {})
+    completed = progress.setdefault("completed_lessons", [])
+    tracker = get_progress_tracker(user_id, user_data)
+
+    if lesson_id not in tracker.lesson_index or tracker.is_completed(lesson_id):
+        return False
+
+    completed.append(lesson_id)
+    tracker.mark_completed(lesson_id)
+    tracker.synced_length += 1
+    return True
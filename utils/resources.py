@@ -0,0 +1,91 @@
+"""
+Resource search and sorting for the BrainVenture application.
+
+The Resources page lists articles, books, research papers and tools from the
+blog data. Filtering is kept free of Streamlit calls so it can be tested and
+benchmarked on its own.
+"""
+
+# Category option that disables category filtering
+ALL_CATEGORIES = "Wszystkie"
+
+# Searched text fields and sort keys of each resource kind. List fields
+# (e.g. research authors) are searched as space-joined text.
+RESOURCE_FILTERS = {
+    "articles": {
+        "search_fields": ("title", "summary"),
+        "sort": {
+            "Najnowsze": (lambda item: item.get("published_date", ""), True),
+            "Najpopularniejsze": (lambda item: item.get("views", 0), True),
+            "Alfabetycznie": (lambda item: item.get("title", ""), False),
+        },
+    },
+    "books": {
+        "search_fields": ("title", "author", "summary"),
+        "sort": {
+            "Najnowsze": (lambda item: item.get("published_year", 0), True),
+            "Najpopularniejsze": (lambda item: item.get("rating", 0), True),
+            "Alfabetycznie": (lambda item: item.get("title", ""), False),
+        },
+    },
+    "research": {
+        "search_fields": ("title", "authors", "summary"),
+        "sort": {
+            "Najnowsze": (lambda item: item.get("published_date", ""), True),
+            # Research papers have no view counts, so popularity falls back to recency
+            "Najpopularniejsze": (lambda item: item.get("published_date", ""), True),
+            "Alfabetycznie": (lambda item: item.get("title", ""), False),
+        },
+    },
+    "tools": {
+        "search_fields": ("title", "description"),
+        "sort": {
+            # Tools have no date, so recency falls back to rating
+            "Najnowsze": (lambda item: item.get("rating", 0), True),
+            "Najpopularniejsze": (lambda item: item.get("rating", 0), True),
+            "Alfabetycznie": (lambda item: item.get("title", ""), False),
+        },
+    },
+}
+
+def _matches(item, needle, search_fields):
+    """Check whether a lowercase search term occurs in a resource's text fields or tags."""
+    for field in search_fields:
+        value = item.get(field, "")
+        if isinstance(value, list):
+            value = " ".join(value)
+        if needle in value.lower():
+            return True
+    return any(needle in tag.lower() for tag in item.get("tags", []))
+
+def filter_resources(items, kind, search_term="", category=ALL_CATEGORIES, sort_by="Najnowsze"):
+    """
+    Filter and sort resources of one kind.
+
+    Args:
+        items (list): Resource dictionaries.
+        kind (str): Resource kind, a key of RESOURCE_FILTERS.
+        search_term (str): Case-insensitive term searched in text fields and tags.
+        category (str): Category to keep, or ALL_CATEGORIES.
+        sort_by (str): Sorting method ("Najnowsze", "Najpopularniejsze" or "Alfabetycznie").
+
+    Returns:
+        list: Matching resources in display order.
+
+    Raises:
+        KeyError: If the resource kind is unknown.
+    """
+    config = RESOURCE_FILTERS[kind]
+
+    if search_term:
+        needle = search_term.lower()
+        items = [item for item in items if _matches(item, needle, config["search_fields"])]
+
+    if category != ALL_CATEGORIES:
+        items = [item for item in items if item.get("category") == category]
+
+    sort = config["sort"].get(sort_by)
+    if sort is not None:
+        key, reverse = sort
+        items = sorted(items, key=key, reverse=reverse)
+    return list(items)
@@ -6,7 +6,9 @@ import streamlit as st
 import random
 import os
 from config.app_config import APP_CONFIG
+from utils.profiler import profiled
 
+@profiled("setup_page")
 def setup_page(page_title=None, page_icon=None, layout="centered", initial_sidebar_state="auto"):
     """
     Configure the Streamlit page settings.
@@ -49,6 +51,7 @@ def setup_page(page_title=None, page_icon=None, layout="centered", initial_sideb
     # Apply JavaScript
     apply_custom_js()
 
+@profiled("js")
 def apply_custom_js():
     """Apply custom JavaScript to the Streamlit app."""
     # Include external JS file if it exists
@@ -59,6 +62,7 @@ def apply_custom_js():
             html = f'<script>{js_content}</script>'
             st.markdown(html, unsafe_allow_html=True)
 
+@profiled("css")
 def apply_custom_css():
     """Apply custom CSS to the Streamlit app."""
     # Include external CSS file if it exists
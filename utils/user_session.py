@@ -0,0 +1,106 @@
+"""
+Session-scoped user data cache for the BrainVenture application.
+
+Each Streamlit session loads a user document once and reuses it across
+reruns for as long as the stored document and event log are unchanged
+(checked with a cheap version token on each load, and once per
+transaction). Inside a user data transaction, saves only mark the document
+dirty and it is written to the user store once when the transaction ends.
+"""
+
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+SESSION_KEY = "_user_data_session"
+
+# Used until there is authentication, and outside Streamlit sessions
+DEFAULT_USER_ID = "default_user"
+
+# Fallback session for transactions running outside a Streamlit script (e.g. tools, tests)
+_local = threading.local()
+
+class UserDataSession:
+    """
+    Cache of user documents with dirty tracking.
+    """
+
+    def __init__(self):
+        """Initialize an empty session cache."""
+        self.documents = {}
+        # Version of the stored data each cached document was loaded from
+        self.versions = {}
+        # Documents already checked against the store in the current transaction
+        self.checked = set()
+        self.dirty = set()
+        self.transaction_depth = 0
+
+    def forget(self, user_id):
+        """
+        Drop a cached document, including unsaved changes.
+
+        Args:
+            user_id (str): User ID.
+        """
+        self.documents.pop(user_id, None)
+        self.versions.pop(user_id, None)
+        self.checked.discard(user_id)
+        self.dirty.discard(user_id)
+
+    @property
+    def in_transaction(self):
+        """Whether saves are currently deferred."""
+        return self.transaction_depth > 0
+
+def get_user_session(create=True):
+    """
+    Get the user data session of the current Streamlit session.
+
+    Outside a Streamlit script run there is no session cache, except for the
+    duration of a user data transaction.
+
+    Args:
+        create (bool): Create a session outside Streamlit if none is active.
+
+    Returns:
+        UserDataSession: The session, or None if caching is not available.
+    """
+    if get_script_run_ctx(suppress_warning=True) is None:
+        session = getattr(_local, "session", None)
+        if session is None and create:
+            session = UserDataSession()
+            _local.session = session
+        return session
+
+    session = st.session_state.get(SESSION_KEY)
+    if session is None:
+        session = UserDataSession()
+        st.session_state[SESSION_KEY] = session
+    return session
+
+def release_user_session(session):
+    """
+    Drop a fallback session once its outermost transaction has finished.
+
+    Args:
+        session (UserDataSession): The session to release.
+    """
+    if getattr(_local, "session", None) is session and not session.in_transaction:
+        _local.session = None
+
+def get_current_user_id():
+    """
+    Get the ID of the current session's user.
+
+    There is no authentication yet, so the ID comes from the session's "user"
+    entry (set by the sidebar, or up front by the load tester for its
+    virtual users).
+
+    Returns:
+        str: The user ID, DEFAULT_USER_ID if none is set.
+    """
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return DEFAULT_USER_ID
+    user = st.session_state.get("user")
+    return user.get("id", DEFAULT_USER_ID) if user else DEFAULT_USER_ID
@@ -0,0 +1,436 @@
+"""
+User data storage backends for the BrainVenture application.
+
+Both backends store the same user document (profile, progress, preferences,
+achievements) behind the UserStore interface:
+- JsonUserStore keeps one JSON file per user (local development).
+- SQLiteUserStore keeps users in a shared SQLite database (WAL mode).
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+from config.app_config import APP_PATHS, STORAGE_CONFIG
+from utils.logger import get_logger
+from utils.error_handler import safe_load_json, safe_save_json
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# Application base directory, used to resolve relative storage paths
+BASE_PATH = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+
+class UserStore:
+    """
+    Interface for user data storage backends.
+    """
+
+    def load(self, user_id):
+        """
+        Load a user document.
+
+        Args:
+            user_id (str): User ID.
+
+        Returns:
+            dict: User data, or None if the user doesn't exist.
+        """
+        raise NotImplementedError
+
+    def save(self, user_id, user_data):
+        """
+        Save a user document.
+
+        Args:
+            user_id (str): User ID.
+            user_data (dict): User data.
+
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        raise NotImplementedError
+
+    def version(self, user_id):
+        """
+        Get a cheap token that changes whenever a user document is saved.
+
+        Args:
+            user_id (str): User ID.
+
+        Returns:
+            A comparable token, or None if the store can't tell (cached
+            copies of the document are then always reloaded).
+        """
+        return None
+
+    def list_users(self):
+        """
+        List stored user IDs.
+
+        Returns:
+            list: User IDs.
+        """
+        raise NotImplementedError
+
+class JsonUserStore(UserStore):
+    """
+    User store keeping one JSON document per user.
+    """
+
+    def __init__(self, user_files_dir=None):
+        """
+        Initialize the store.
+
+        Args:
+            user_files_dir (str, optional): Directory with user files.
+                Defaults to APP_PATHS["user_files_dir"] in the application directory.
+        """
+        self.user_files_dir = user_files_dir or os.path.join(BASE_PATH, APP_PATHS["user_files_dir"])
+
+    def _path(self, user_id):
+        """Return the file path of a user document."""
+        return os.path.join(self.user_files_dir, f"{user_id}.json")
+
+    def load(self, user_id):
+        return safe_load_json(self._path(user_id))
+
+    def save(self, user_id, user_data):
+        return safe_save_json(user_data, self._path(user_id))
+
+    def version(self, user_id):
+        try:
+            stat = os.stat(self._path(user_id))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def list_users(self):
+        if not os.path.isdir(self.user_files_dir):
+            return []
+        return sorted(
+            file_name[:-5] for file_name in os.listdir(self.user_files_dir)
+            if file_name.endswith(".json")
+        )
+
+# Schema for the SQLite backend; keys not covered by columns are kept in "extra" JSON
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    updated_at TEXT,
+    display_name TEXT,
+    email TEXT,
+    bio TEXT,
+    avatar TEXT,
+    preferences TEXT,
+    profile_extra TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS progress (
+    user_id TEXT PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
+    neuroleader_type TEXT,
+    last_activity TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS completed_lessons (
+    user_id TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    lesson_id TEXT NOT NULL,
+    PRIMARY KEY (user_id, seq)
+);
+CREATE TABLE IF NOT EXISTS tests_taken (
+    user_id TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    test_type TEXT,
+    result TEXT,
+    date TEXT,
+    extra TEXT,
+    PRIMARY KEY (user_id, seq)
+);
+CREATE TABLE IF NOT EXISTS achievements (
+    user_id TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    achievement_id TEXT,
+    name TEXT,
+    description TEXT,
+    icon TEXT,
+    earned_at TEXT,
+    PRIMARY KEY (user_id, seq)
+);
+"""
+
+# Statements are module constants so sqlite3's per-connection statement cache reuses them
+_SELECT_USER = "SELECT created_at, updated_at, display_name, email, bio, avatar, preferences, profile_extra, extra FROM users WHERE user_id = ?"
+_SELECT_VERSION = "SELECT updated_at FROM users WHERE user_id = ?"
+_SELECT_PROGRESS = "SELECT neuroleader_type, last_activity, extra FROM progress WHERE user_id = ?"
+_UPSERT_USER = """
+INSERT INTO users (user_id, created_at, updated_at, display_name, email, bio, avatar, preferences, profile_extra, extra)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    created_at = excluded.created_at, updated_at = excluded.updated_at,
+    display_name = excluded.display_name, email = excluded.email, bio = excluded.bio,
+    avatar = excluded.avatar, preferences = excluded.preferences,
+    profile_extra = excluded.profile_extra, extra = excluded.extra
+"""
+_UPSERT_PROGRESS = """
+INSERT INTO progress (user_id, neuroleader_type, last_activity, extra) VALUES (?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    neuroleader_type = excluded.neuroleader_type, last_activity = excluded.last_activity, extra = excluded.extra
+"""
+_LIST_USERS = "SELECT user_id FROM users ORDER BY user_id"
+
+# Child tables holding list fields: (table, value columns, document keys)
+_LIST_TABLES = {
+    "completed_lessons": ("completed_lessons", ("lesson_id",), None),
+    "tests_taken": ("tests_taken", ("test_type", "result", "date", "extra"), ("test_type", "result", "date")),
+    "achievements": (
+        "achievements",
+        ("achievement_id", "name", "description", "icon", "earned_at"),
+        ("id", "name", "description", "icon", "earned_at"),
+    ),
+}
+
+_USER_KEYS = {"user_id", "created_at", "updated_at", "profile", "progress", "preferences", "achievements"}
+_PROFILE_KEYS = {"display_name", "email", "bio", "avatar"}
+_PROGRESS_KEYS = {"completed_lessons", "tests_taken", "neuroleader_type", "last_activity"}
+
+def _dumps(value):
+    """Serialize a value for a JSON column."""
+    return json.dumps(value, ensure_ascii=False) if value else None
+
+def _loads(value):
+    """Deserialize a JSON column."""
+    return json.loads(value) if value else {}
+
+def _extra(mapping, known_keys):
+    """Return the entries of a mapping not covered by known columns."""
+    return {k: v for k, v in mapping.items() if k not in known_keys}
+
+class SQLiteUserStore(UserStore):
+    """
+    User store backed by a SQLite database.
+
+    Uses WAL mode so readers don't block the writer, and one connection
+    per thread since sqlite3 connections can't be shared between threads.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the store and create the schema if needed.
+
+        Args:
+            db_path (str, optional): Database path. Defaults to STORAGE_CONFIG["sqlite_path"].
+        """
+        db_path = db_path or STORAGE_CONFIG["sqlite_path"]
+        if db_path != ":memory:" and not os.path.isabs(db_path):
+            db_path = os.path.join(BASE_PATH, db_path)
+        self.db_path = db_path
+        self._local = threading.local()
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+    def _connection(self):
+        """Return the connection of the current thread, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the connection of the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def load(self, user_id):
+        conn = self._connection()
+        row = conn.execute(_SELECT_USER, (user_id,)).fetchone()
+        if row is None:
+            return None
+
+        created_at, updated_at, display_name, email, bio, avatar, preferences, profile_extra, extra = row
+        user_data = {
+            "user_id": user_id,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "profile": {
+                "display_name": display_name,
+                "email": email,
+                "bio": bio,
+                "avatar": avatar,
+                **_loads(profile_extra),
+            },
+        }
+
+        progress = {"completed_lessons": [], "last_activity": None, "tests_taken": [], "neuroleader_type": None}
+        progress_row = conn.execute(_SELECT_PROGRESS, (user_id,)).fetchone()
+        if progress_row:
+            progress["neuroleader_type"], progress["last_activity"], progress_extra = progress_row
+            progress.update(_loads(progress_extra))
+
+        progress["completed_lessons"] = [row[0] for row in self._select_list(conn, "completed_lessons", user_id)]
+        progress["tests_taken"] = [
+            {"test_type": test_type, "result": result, "date": date, **_loads(test_extra)}
+            for test_type, result, date, test_extra in self._select_list(conn, "tests_taken", user_id)
+        ]
+        user_data["progress"] = progress
+        user_data["preferences"] = _loads(preferences)
+
+        _, _, keys = _LIST_TABLES["achievements"]
+        user_data["achievements"] = [
+            dict(zip(keys, row)) for row in self._select_list(conn, "achievements", user_id)
+        ]
+
+        user_data.update(_loads(extra))
+        return user_data
+
+    def _select_list(self, conn, name, user_id):
+        """Select the rows of a list table in document order."""
+        table, columns, _ = _LIST_TABLES[name]
+        sql = f"SELECT {', '.join(columns)} FROM {table} WHERE user_id = ? ORDER BY seq"
+        return conn.execute(sql, (user_id,)).fetchall()
+
+    def _sync_list(self, conn, name, user_id, rows):
+        """
+        Write a list field, touching only rows after the unchanged prefix.
+        Appending to a history costs one insert regardless of its length.
+        """
+        table, columns, _ = _LIST_TABLES[name]
+        stored = self._select_list(conn, name, user_id)
+
+        prefix = 0
+        for old, new in zip(stored, rows):
+            if tuple(old) != tuple(new):
+                break
+            prefix += 1
+
+        if prefix < len(stored):
+            conn.execute(f"DELETE FROM {table} WHERE user_id = ? AND seq >= ?", (user_id, prefix))
+        if prefix < len(rows):
+            placeholders = ", ".join("?" for _ in columns)
+            conn.executemany(
+                f"INSERT INTO {table} (user_id, seq, {', '.join(columns)}) VALUES (?, ?, {placeholders})",
+                [(user_id, seq, *row) for seq, row in enumerate(rows[prefix:], start=prefix)],
+            )
+
+    def save(self, user_id, user_data):
+        profile = user_data.get("profile") or {}
+        progress = user_data.get("progress") or {}
+
+        conn = self._connection()
+        try:
+            with conn:
+                conn.execute(_UPSERT_USER, (
+                    user_id,
+                    user_data.get("created_at"),
+                    user_data.get("updated_at"),
+                    profile.get("display_name"),
+                    profile.get("email"),
+                    profile.get("bio"),
+                    profile.get("avatar"),
+                    _dumps(user_data.get("preferences")),
+                    _dumps(_extra(profile, _PROFILE_KEYS)),
+                    _dumps(_extra(user_data, _USER_KEYS)),
+                ))
+                conn.execute(_UPSERT_PROGRESS, (
+                    user_id,
+                    progress.get("neuroleader_type"),
+                    progress.get("last_activity"),
+                    _dumps(_extra(progress, _PROGRESS_KEYS)),
+                ))
+                self._sync_list(conn, "completed_lessons", user_id, [
+                    (lesson_id,) for lesson_id in progress.get("completed_lessons", [])
+                ])
+                self._sync_list(conn, "tests_taken", user_id, [
+                    (t.get("test_type"), t.get("result"), t.get("date"),
+                     _dumps(_extra(t, {"test_type", "result", "date"})))
+                    for t in progress.get("tests_taken", [])
+                ])
+                self._sync_list(conn, "achievements", user_id, [
+                    (a.get("id"), a.get("name"), a.get("description"), a.get("icon"), a.get("earned_at"))
+                    for a in user_data.get("achievements", [])
+                ])
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error saving user {user_id} to SQLite: {str(e)}", exc_info=True)
+            return False
+
+    def version(self, user_id):
+        # Every save path sets a new "updated_at"
+        row = self._connection().execute(_SELECT_VERSION, (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def list_users(self):
+        return [row[0] for row in self._connection().execute(_LIST_USERS)]
+
+def create_user_store(backend=None):
+    """
+    Create a user store for the given backend.
+
+    Args:
+        backend (str, optional): "json" or "sqlite". Defaults to STORAGE_CONFIG["user_store_backend"].
+
+    Returns:
+        UserStore: The user store.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = backend or STORAGE_CONFIG["user_store_backend"]
+    if backend == "json":
+        return JsonUserStore()
+    if backend == "sqlite":
+        return SQLiteUserStore()
+    raise ValueError(f"Unknown user store backend: {backend}")
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_user_store():
+    """
+    Get the shared user store configured in STORAGE_CONFIG.
+
+    Returns:
+        UserStore: The user store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = create_user_store()
+        return _store
+
+def migrate_json_to_sqlite(user_files_dir=None, db_path=None):
+    """
+    Import all JSON user files into a SQLite user store.
+
+    Args:
+        user_files_dir (str, optional): Directory with JSON user files.
+        db_path (str, optional): Target database path.
+
+    Returns:
+        tuple: (number of migrated users, list of user IDs that failed)
+    """
+    source = JsonUserStore(user_files_dir)
+    target = SQLiteUserStore(db_path)
+
+    migrated = 0
+    failed = []
+    for user_id in source.list_users():
+        user_data = source.load(user_id)
+        if not user_data or not target.save(user_id, user_data):
+            failed.append(user_id)
+            continue
+        migrated += 1
+
+    target.close()
+    return migrated, failed